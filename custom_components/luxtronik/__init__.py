@@ -2,30 +2,62 @@
 # region Imports
 
 from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_PORT, EVENT_HOMEASSISTANT_STOP
-from homeassistant.core import Event, HomeAssistant
+from homeassistant.core import Event, HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.entity import DeviceInfo, EntityDescription
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.typing import ConfigType
 from luxtronik import LOGGER as LuxLogger
 
 from .const import (
+    ATTR_CONFIG_ENTRY_ID,
     ATTR_PARAMETER,
+    ATTR_PARAMETERS,
     ATTR_VALUE,
+    CONF_CONNECT_TIMEOUT,
+    CONF_CONNECTION_POOL_SIZE,
+    CONF_ENTITY_PREFIX,
+    CONF_HA_SENSOR_ELECTRICAL_POWER,
     CONF_LOCK_TIMEOUT,
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_MIN_UPDATE_INTERVAL,
+    CONF_READ_TIMEOUT,
+    CONF_RETRIES,
     CONF_SAFE,
+    CONF_SCHEDULER,
     CONF_UPDATE_IMMEDIATELY_AFTER_WRITE,
+    CONF_WRITE_TIMEOUT,
+    DATA_YAML_ENTRY,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_CONNECTION_POOL_SIZE,
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_RETRIES,
+    DEFAULT_WRITE_TIMEOUT,
     DOMAIN,
     LOGGER,
     PLATFORMS,
     SERVICE_WRITE,
+    SERVICE_WRITE_MANY,
+    SERVICE_WRITE_MANY_SCHEMA,
     SERVICE_WRITE_SCHEMA,
+    SNAPSHOT_SAVE_INTERVAL,
 )
-from .helpers.helper import get_sensor_text
+from .coordinator import LuxtronikCoordinator
+from .helpers.helper import async_load_translations, get_sensor_text
 from .helpers.lux_helper import get_manufacturer_firmware_url_by_model
+from .history import history_size
+from .luxtronik_client import LuxtronikRequestPolicy
 from .luxtronik_device import LuxtronikDevice
+from .scheduler import LuxtronikPollScheduler
+from .snapshot_store import LuxtronikSnapshotStore
 
 # endregion Imports
 
@@ -41,6 +73,29 @@ class LuxtronikEntityDescription(EntityDescription):
     luxtronik_key: str = ""
 
 
+@dataclass
+class LuxtronikEntryData:
+    """State of one heatpump, stored in hass.data[DOMAIN] by config entry id."""
+
+    luxtronik: LuxtronikDevice
+    coordinator: LuxtronikCoordinator
+    data: dict[str, Any]
+    conf: dict[str, Any]
+    device_info: DeviceInfo | None = None
+    device_info_domestic_water: DeviceInfo | None = None
+    device_info_heating: DeviceInfo | None = None
+    device_info_cooling: DeviceInfo | None = None
+    snapshot_store: LuxtronikSnapshotStore | None = None
+
+
+def get_entry_data(hass: HomeAssistant, entry_id: str | None = None) -> LuxtronikEntryData | None:
+    """Return the heatpump of a config entry, without id the yaml or first one."""
+    entries: dict[str, LuxtronikEntryData] = hass.data.get(DOMAIN, {})
+    if entry_id is not None:
+        return entries.get(entry_id)
+    return entries.get(DATA_YAML_ENTRY) or next(iter(entries.values()), None)
+
+
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Set up from config entry."""
     hass.data.setdefault(DOMAIN, {})
@@ -53,44 +108,98 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
     )
     config_entry.async_on_unload(config_entry.add_update_listener(async_reload_entry))
 
-    setup_internal(hass, config_entry.data, config_entry.options)
-
-    luxtronik = hass.data[DOMAIN]
+    await async_load_translations(hass)
+    entry_data = setup_internal(
+        hass, config_entry.entry_id, config_entry.data, config_entry.options
+    )
+    luxtronik = entry_data.luxtronik
+    store = entry_data.snapshot_store = LuxtronikSnapshotStore(hass, config_entry.entry_id)
+    # All device facts below are derived from the last snapshot or the initial fetch.
+    frames = await store.async_load()
+    warm_start = frames is not None and luxtronik.load_snapshot(frames)
+    if not warm_start:
+        try:
+            await entry_data.coordinator.async_config_entry_first_refresh()
+        except Exception:
+            await _async_remove_entry_data(hass, config_entry.entry_id)
+            raise
+        await store.async_save(luxtronik.snapshot())
+    setup_device_infos(hass, entry_data)
 
     await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
+    if warm_start:
+        # The entities came up from the snapshot, the live values follow.
+        config_entry.async_create_background_task(
+            hass, entry_data.coordinator.async_refresh(), f"{DOMAIN} refresh {luxtronik.host}"
+        )
+
+    async def save_snapshot(_now=None) -> None:
+        """Save the raw values of this heatpump."""
+        await store.async_save(luxtronik.snapshot())
 
-    def logout_luxtronik(event: Event) -> None:
+    async def logout_luxtronik(event: Event) -> None:
         """Close connections to this heatpump."""
-        luxtronik.disconnect()
+        await save_snapshot()
+        await luxtronik.async_disconnect()
 
+    config_entry.async_on_unload(
+        async_track_time_interval(hass, save_snapshot, SNAPSHOT_SAVE_INTERVAL)
+    )
     config_entry.async_on_unload(
         hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, logout_luxtronik)
     )
-    await hass.async_add_executor_job(setup_hass_services, hass, config_entry)
+    async_setup_hass_services(hass)
     return True
 
 
-def setup_hass_services(hass: HomeAssistant, config_entry: ConfigEntry):
-    """Home Assistant services."""
+def _get_service_entry_data(hass: HomeAssistant, service: ServiceCall) -> LuxtronikEntryData:
+    entry_data = get_entry_data(hass, service.data.get(ATTR_CONFIG_ENTRY_ID))
+    if entry_data is None:
+        raise HomeAssistantError(
+            f"No Luxtronik heatpump {service.data.get(ATTR_CONFIG_ENTRY_ID, '')}"
+        )
+    return entry_data
+
+
+@callback
+def async_setup_hass_services(hass: HomeAssistant):
+    """Home Assistant services, shared by all heatpumps."""
+    if hass.services.has_service(DOMAIN, SERVICE_WRITE):
+        return
 
-    def write_parameter(service):
+    async def write_parameter(service: ServiceCall):
         """Write a parameter to the Luxtronik heatpump."""
         parameter = service.data.get(ATTR_PARAMETER)
         value = service.data.get(ATTR_VALUE)
-        luxtronik = hass.data[DOMAIN]
-        update_immediately_after_write = config_entry.data[
+        entry_data = _get_service_entry_data(hass, service)
+        update_immediately_after_write = entry_data.data[
             CONF_UPDATE_IMMEDIATELY_AFTER_WRITE
         ]
-        luxtronik.write(
+        await entry_data.coordinator.async_write(
             parameter,
             value,
             use_debounce=True,
             update_immediately_after_write=update_immediately_after_write,
         )
 
-    hass.services.register(
+    async def write_parameters(service: ServiceCall):
+        """Write several parameters to the Luxtronik heatpump in one batch."""
+        parameters = service.data.get(ATTR_PARAMETERS)
+        entry_data = _get_service_entry_data(hass, service)
+        await entry_data.coordinator.async_write_batch(
+            parameters,
+            update_immediately_after_write=True,
+        )
+
+    hass.services.async_register(
         DOMAIN, SERVICE_WRITE, write_parameter, schema=SERVICE_WRITE_SCHEMA
     )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_WRITE_MANY,
+        write_parameters,
+        schema=SERVICE_WRITE_MANY_SCHEMA,
+    )
 
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
@@ -99,15 +208,24 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         # Setup via UI. No need to continue yaml-based setup
         return True
     conf = config[DOMAIN]
-    return setup_internal(hass, conf, conf)
+    hass.data.setdefault(DOMAIN, {})
+    await async_load_translations(hass)
+    entry_data = setup_internal(hass, DATA_YAML_ENTRY, conf, conf)
+    await entry_data.coordinator.async_refresh()
+    if not entry_data.coordinator.last_update_success:
+        await _async_remove_entry_data(hass, DATA_YAML_ENTRY)
+        return False
+    setup_device_infos(hass, entry_data)
+    return True
 
 
-def setup_internal(hass, data, conf):
-    """Set up the Luxtronik component."""
+def setup_internal(hass, entry_id: str, data, conf) -> LuxtronikEntryData:
+    """Set up a Luxtronik heatpump without any I/O."""
     host = data[CONF_HOST]
     port = data[CONF_PORT]
     safe = data[CONF_SAFE]
     lock_timeout = data[CONF_LOCK_TIMEOUT]
+    pool_size = data.get(CONF_CONNECTION_POOL_SIZE, DEFAULT_CONNECTION_POOL_SIZE)
     if CONF_UPDATE_IMMEDIATELY_AFTER_WRITE not in data:
         data[CONF_UPDATE_IMMEDIATELY_AFTER_WRITE] = True
     # update_immediately_after_write = data[CONF_UPDATE_IMMEDIATELY_AFTER_WRITE]
@@ -115,6 +233,56 @@ def setup_internal(hass, data, conf):
     # LOGGER.info("setup_internal use_legacy_sensor_ids: '%s'",
     #             use_legacy_sensor_ids)
 
+    scheduler: LuxtronikPollScheduler = hass.data.setdefault(
+        f"{DOMAIN}_{CONF_SCHEDULER}", LuxtronikPollScheduler()
+    )
+    scheduler.register()
+    policy = LuxtronikRequestPolicy(
+        conf.get(CONF_CONNECT_TIMEOUT, data.get(CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT)),
+        conf.get(CONF_READ_TIMEOUT, data.get(CONF_READ_TIMEOUT, DEFAULT_READ_TIMEOUT)),
+        conf.get(CONF_WRITE_TIMEOUT, data.get(CONF_WRITE_TIMEOUT, DEFAULT_WRITE_TIMEOUT)),
+        conf.get(CONF_RETRIES, data.get(CONF_RETRIES, DEFAULT_RETRIES)),
+    )
+    min_update_interval = _get_update_interval(
+        data, conf, CONF_MIN_UPDATE_INTERVAL, DEFAULT_MIN_UPDATE_INTERVAL
+    )
+    luxtronik = LuxtronikDevice(
+        host, port, safe, lock_timeout, pool_size, policy, history_size(min_update_interval)
+    )
+    coordinator = LuxtronikCoordinator(
+        hass,
+        luxtronik,
+        scheduler,
+        data.get(CONF_ENTITY_PREFIX, DOMAIN),
+        min_update_interval,
+        _get_update_interval(data, conf, CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL),
+        conf.get(CONF_HA_SENSOR_ELECTRICAL_POWER, data.get(CONF_HA_SENSOR_ELECTRICAL_POWER)),
+    )
+
+    entry_data = LuxtronikEntryData(luxtronik, coordinator, data, conf)
+    hass.data[DOMAIN][entry_id] = entry_data
+    return entry_data
+
+
+def _get_update_interval(data, conf, key: str, default: int) -> timedelta:
+    """Return an update interval option, set in the options or the data."""
+    return timedelta(seconds=conf.get(key, data.get(key, default)))
+
+
+async def _async_remove_entry_data(hass: HomeAssistant, entry_id: str) -> None:
+    """Forget a heatpump and close its connections."""
+    entry_data: LuxtronikEntryData | None = hass.data[DOMAIN].pop(entry_id, None)
+    if entry_data is None:
+        return
+    await entry_data.luxtronik.async_disconnect()
+    scheduler: LuxtronikPollScheduler = hass.data[f"{DOMAIN}_{CONF_SCHEDULER}"]
+    if scheduler.unregister() == 0:
+        hass.data.pop(f"{DOMAIN}_{CONF_SCHEDULER}")
+
+
+def setup_device_infos(hass: HomeAssistant, entry_data: LuxtronikEntryData) -> None:
+    """Create the DeviceInfos from the values of the initial fetch."""
+    luxtronik = entry_data.luxtronik
     # Build Sensor names with local language:
     lang = hass.config.language
     text_domestic_water = get_sensor_text(lang, "domestic_water")
@@ -122,17 +290,10 @@ def setup_internal(hass, data, conf):
     text_heatpump = get_sensor_text(lang, "heatpump")
     text_cooling = get_sensor_text(lang, "cooling")
 
-    luxtronik = LuxtronikDevice(host, port, safe, lock_timeout)
-    luxtronik.read()
-
-    hass.data[DOMAIN] = luxtronik
-    hass.data[f"{DOMAIN}_conf"] = conf
-
-    # Create DeviceInfos:
-    hass.data[f"{DOMAIN}_DeviceInfo"] = build_device_info(
-        luxtronik, text_heatpump, data[CONF_HOST]
+    entry_data.device_info = build_device_info(
+        luxtronik, text_heatpump, entry_data.data[CONF_HOST]
     )
-    hass.data[f"{DOMAIN}_DeviceInfo_Domestic_Water"] = DeviceInfo(
+    entry_data.device_info_domestic_water = DeviceInfo(
         identifiers={(DOMAIN, f"{luxtronik.unique_id}_domestic_water")},
         configuration_url="https://www.heatpump24.com/",
         name=text_domestic_water,
@@ -144,7 +305,7 @@ def setup_internal(hass, data, conf):
         connections=None,
         via_device=None,
     )
-    hass.data[f"{DOMAIN}_DeviceInfo_Heating"] = DeviceInfo(
+    entry_data.device_info_heating = DeviceInfo(
         identifiers={(DOMAIN, f"{luxtronik.unique_id}_heating")},
         configuration_url=get_manufacturer_firmware_url_by_model(luxtronik.model),
         name=text_heating,
@@ -156,7 +317,7 @@ def setup_internal(hass, data, conf):
         connections=None,
         via_device=None,
     )
-    hass.data[f"{DOMAIN}_DeviceInfo_Cooling"] = (
+    entry_data.device_info_cooling = (
         DeviceInfo(
             identifiers={(DOMAIN, f"{luxtronik.unique_id}_cooling")},
             configuration_url=get_manufacturer_firmware_url_by_model(luxtronik.model),
@@ -172,35 +333,34 @@ def setup_internal(hass, data, conf):
         if luxtronik.detect_cooling_present()
         else None
     )
-    return True
 
 
 async def async_reload_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
     """Reload the HACS config entry."""
     LOGGER.info("async_reload_entry '%s'", config_entry)
-    await async_unload_entry(hass, config_entry)
-    await async_setup_entry(hass, config_entry)
+    # Runs the async_on_unload callbacks, e.g. stops saving the old snapshot.
+    await hass.config_entries.async_reload(config_entry.entry_id)
 
 
 async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Unloading the Luxtronik platforms."""
-    LOGGER.info("async_unload_entry '%s' - %s", config_entry, hass.data[DOMAIN])
-    luxtronik = hass.data[DOMAIN]
-    if luxtronik is None:
+    LOGGER.info("async_unload_entry '%s'", config_entry)
+    if get_entry_data(hass, config_entry.entry_id) is None:
         return True
 
     unload_ok = False
     try:
-        await hass.async_add_executor_job(luxtronik.disconnect)
-
-        await hass.services.async_remove(DOMAIN, SERVICE_WRITE)
-
         unload_ok = await hass.config_entries.async_unload_platforms(
             config_entry, PLATFORMS
         )
         if unload_ok:
-            hass.data[DOMAIN] = None
-            hass.data.pop(DOMAIN)
+            entry_data = get_entry_data(hass, config_entry.entry_id)
+            if entry_data.snapshot_store is not None:
+                await entry_data.snapshot_store.async_save(entry_data.luxtronik.snapshot())
+            await _async_remove_entry_data(hass, config_entry.entry_id)
+            if not hass.data[DOMAIN]:
+                hass.services.async_remove(DOMAIN, SERVICE_WRITE)
+                hass.services.async_remove(DOMAIN, SERVICE_WRITE_MANY)
 
     except Exception as e:
         LOGGER.critical("Remove service!", e, exc_info=True)
@@ -208,6 +368,11 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Delete the snapshot of a removed heatpump."""
+    await LuxtronikSnapshotStore(hass, config_entry.entry_id).async_remove()
+
+
 def build_device_info(
     luxtronik: LuxtronikDevice, name: str, ip_host: str
 ) -> DeviceInfo:
@@ -245,7 +410,7 @@ async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
 
     if config_entry.version == 1:
         new = {**config_entry.data}
-        luxtronik = LuxtronikDevice.connect(new[CONF_HOST], new[CONF_PORT])
+        luxtronik = await LuxtronikDevice.async_connect(new[CONF_HOST], new[CONF_PORT])
 
         _delete_legacy_devices(hass, config_entry, luxtronik.unique_id)
         config_entry.unique_id = luxtronik.unique_id
@@ -10,15 +10,18 @@ from homeassistant.components.binary_sensor import (BinarySensorDeviceClass,
 from homeassistant.components.sensor import ENTITY_ID_FORMAT
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (CONF_FRIENDLY_NAME, CONF_ICON, CONF_ID, CONF_SENSORS)
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.typing import ConfigType
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import slugify
 
+from . import get_entry_data
 from .const import (ATTR_EXTRA_STATE_ATTRIBUTE_LUXTRONIK_KEY,
-                    CONF_CALCULATIONS, CONF_GROUP, CONF_INVERT_STATE,
+                    CONF_CALCULATIONS, CONF_GROUP,
+                    CONF_INVERT_STATE,
                     CONF_PARAMETERS, CONF_VISIBILITIES,
                     DEFAULT_DEVICE_CLASS, DEVICE_CLASSES,
                     DOMAIN, LOGGER,
@@ -26,9 +29,9 @@ from .const import (ATTR_EXTRA_STATE_ATTRIBUTE_LUXTRONIK_KEY,
                     LUX_BINARY_SENSOR_CIRCULATION_PUMP_HEATING,
                     LUX_BINARY_SENSOR_DOMESTIC_WATER_RECIRCULATION_PUMP,
                     LUX_BINARY_SENSOR_EVU_UNLOCKED,
-                    LUX_BINARY_SENSOR_SOLAR_PUMP)
+                    LUX_BINARY_SENSOR_SOLAR_PUMP, LUX_SENSOR_COMPRESSOR)
+from .coordinator import LuxtronikCoordinator
 from .helpers.helper import get_sensor_text
-from .luxtronik_device import LuxtronikDevice
 
 # endregion Imports
 
@@ -69,13 +72,15 @@ async def async_setup_platform(
         config,
         discovery_info,
     )
-    luxtronik: LuxtronikDevice = hass.data.get(DOMAIN)
-    if not luxtronik:
+    entry_data = get_entry_data(hass)
+    if not entry_data:
         LOGGER.warning("binary_sensor.async_setup_platform no luxtronik!")
         return False
+    luxtronik = entry_data.luxtronik
+    coordinator = entry_data.coordinator
 
     # use_legacy_sensor_ids = hass.data[f"{DOMAIN}_{CONF_USE_LEGACY_SENSOR_IDS}"]
-    deviceInfo = hass.data[f"{DOMAIN}_DeviceInfo"]
+    deviceInfo = entry_data.device_info
 
     sensors = config.get(CONF_SENSORS)
     entities = []
@@ -103,7 +108,7 @@ async def async_setup_platform(
                 )
                 entities += [
                     LuxtronikBinarySensor(
-                        luxtronik,
+                        coordinator,
                         deviceInfo=deviceInfo,
                         sensor_key=f"{group}.{sensor_id}",
                         unique_id=sensor_id,
@@ -136,12 +141,14 @@ async def async_setup_entry(
     LOGGER.info(
         f"{DOMAIN}.binary_sensor.async_setup_entry ConfigType: %s", config_entry
     )
-    luxtronik: LuxtronikDevice = hass.data.get(DOMAIN)
-    if not luxtronik:
+    entry_data = get_entry_data(hass, config_entry.entry_id)
+    if not entry_data:
         LOGGER.warning("binary_sensor.async_setup_entry no luxtronik!")
         return False
+    luxtronik = entry_data.luxtronik
+    coordinator = entry_data.coordinator
 
-    deviceInfo = hass.data[f"{DOMAIN}_DeviceInfo"]
+    deviceInfo = entry_data.device_info
 
     # region: Build Sensor names with local language:
     lang = hass.config.language
@@ -159,7 +166,7 @@ async def async_setup_entry(
 
     entities = [
         LuxtronikBinarySensor(
-            luxtronik=luxtronik,
+            coordinator=coordinator,
             deviceInfo=deviceInfo,
             sensor_key=LUX_BINARY_SENSOR_EVU_UNLOCKED,
             unique_id="evu_unlocked",
@@ -168,9 +175,9 @@ async def async_setup_entry(
             device_class=BinarySensorDeviceClass.LOCK,
         ),
         LuxtronikBinarySensor(
-            luxtronik=luxtronik,
+            coordinator=coordinator,
             deviceInfo=deviceInfo,
-            sensor_key='calculations.ID_WEB_VD1out',
+            sensor_key=LUX_SENSOR_COMPRESSOR,
             unique_id="compressor",
             name=text_compressor,
             icon="mdi:arrow-collapse-all",
@@ -179,7 +186,7 @@ async def async_setup_entry(
         # Soleumwälzpumpe
         # Umwälzpumpe Ventilator, Brunnen- oder Sole
         LuxtronikBinarySensor(
-            luxtronik=luxtronik,
+            coordinator=coordinator,
             deviceInfo=deviceInfo,
             sensor_key='calculations.ID_WEB_VBOout',
             unique_id="pump_flow",
@@ -188,7 +195,7 @@ async def async_setup_entry(
             device_class=BinarySensorDeviceClass.RUNNING,
         ),
         LuxtronikBinarySensor(
-            luxtronik=luxtronik,
+            coordinator=coordinator,
             deviceInfo=deviceInfo,
             sensor_key='calculations.ID_WEB_LIN_VDH_out',
             unique_id="compressor_heater",
@@ -197,7 +204,7 @@ async def async_setup_entry(
             device_class=BinarySensorDeviceClass.RUNNING,
         ),
         LuxtronikBinarySensor(
-            luxtronik=luxtronik,
+            coordinator=coordinator,
             deviceInfo=deviceInfo,
             sensor_key='calculations.ID_WEB_AVout',
             unique_id="defrost_valve",
@@ -207,7 +214,7 @@ async def async_setup_entry(
             device_class=BinarySensorDeviceClass.OPENING,
         ),
         LuxtronikBinarySensor(
-            luxtronik=luxtronik,
+            coordinator=coordinator,
             deviceInfo=deviceInfo,
             sensor_key='calculations.ID_WEB_ZW1out',
             unique_id="additional_heat_generator",
@@ -216,7 +223,7 @@ async def async_setup_entry(
             device_class=BinarySensorDeviceClass.RUNNING,
         ),
         LuxtronikBinarySensor(
-            luxtronik=luxtronik,
+            coordinator=coordinator,
             deviceInfo=deviceInfo,
             sensor_key='calculations.ID_WEB_ZW2SSTout',
             unique_id="disturbance_output",
@@ -235,11 +242,11 @@ async def async_setup_entry(
         # calculations.ID_WEB_MZ2out Mischer 2 zu
     ]
 
-    deviceInfoHeating = hass.data[f"{DOMAIN}_DeviceInfo_Heating"]
+    deviceInfoHeating = entry_data.device_info_heating
     if deviceInfoHeating is not None:
         entities += [
             LuxtronikBinarySensor(
-                luxtronik=luxtronik,
+                coordinator=coordinator,
                 deviceInfo=deviceInfoHeating,
                 sensor_key=LUX_BINARY_SENSOR_CIRCULATION_PUMP_HEATING,
                 unique_id="circulation_pump_heating",
@@ -248,7 +255,7 @@ async def async_setup_entry(
                 device_class=BinarySensorDeviceClass.RUNNING,
             ),
             LuxtronikBinarySensor(
-                luxtronik=luxtronik,
+                coordinator=coordinator,
                 deviceInfo=deviceInfoHeating,
                 sensor_key=LUX_BINARY_SENSOR_ADDITIONAL_CIRCULATION_PUMP,
                 unique_id="additional_circulation_pump",
@@ -258,7 +265,7 @@ async def async_setup_entry(
             ),
         ]
 
-    deviceInfoDomesticWater = hass.data[f"{DOMAIN}_DeviceInfo_Domestic_Water"]
+    deviceInfoDomesticWater = entry_data.device_info_domestic_water
     if deviceInfoDomesticWater is not None:
         if luxtronik.has_domestic_water_circulation_pump:
             circulation_pump_unique_id = 'domestic_water_circulation_pump'
@@ -268,7 +275,7 @@ async def async_setup_entry(
             text_domestic_water_circulation_pump = get_sensor_text(lang, "domestic_water_charging_pump")
         entities += [
             LuxtronikBinarySensor(
-                luxtronik=luxtronik,
+                coordinator=coordinator,
                 deviceInfo=deviceInfoDomesticWater,
                 sensor_key=LUX_BINARY_SENSOR_DOMESTIC_WATER_RECIRCULATION_PUMP,
                 unique_id="domestic_water_recirculation_pump",
@@ -277,7 +284,7 @@ async def async_setup_entry(
                 device_class=BinarySensorDeviceClass.RUNNING,
             ),
             LuxtronikBinarySensor(
-                luxtronik=luxtronik,
+                coordinator=coordinator,
                 deviceInfo=deviceInfoDomesticWater,
                 sensor_key='calculations.ID_WEB_ZIPout',
                 unique_id=circulation_pump_unique_id,
@@ -291,7 +298,7 @@ async def async_setup_entry(
             text_solar_pump = get_sensor_text(lang, "solar_pump")
             entities += [
                 LuxtronikBinarySensor(
-                    luxtronik=luxtronik,
+                    coordinator=coordinator,
                     deviceInfo=deviceInfoDomesticWater,
                     sensor_key=LUX_BINARY_SENSOR_SOLAR_PUMP,
                     unique_id="solar_pump",
@@ -301,12 +308,12 @@ async def async_setup_entry(
                 ),
             ]
 
-    deviceInfoCooling = hass.data[f"{DOMAIN}_DeviceInfo_Cooling"]
+    deviceInfoCooling = entry_data.device_info_cooling
     if deviceInfoCooling is not None:
         text_approval_cooling = get_sensor_text(lang, "approval_cooling")
         entities += [
             LuxtronikBinarySensor(
-                luxtronik=luxtronik,
+                coordinator=coordinator,
                 deviceInfo=deviceInfoCooling,
                 sensor_key="calculations.ID_WEB_FreigabKuehl",
                 unique_id="approval_cooling",
@@ -320,14 +327,14 @@ async def async_setup_entry(
 # endregion Setup
 
 
-class LuxtronikBinarySensor(BinarySensorEntity, RestoreEntity):
+class LuxtronikBinarySensor(CoordinatorEntity[LuxtronikCoordinator], BinarySensorEntity, RestoreEntity):
     """Representation of a Luxtronik binary sensor."""
 
     _on_state: str = True
 
     def __init__(
         self,
-        luxtronik: LuxtronikDevice,
+        coordinator: LuxtronikCoordinator,
         deviceInfo: DeviceInfo,
         sensor_key: str,
         unique_id: str,
@@ -342,12 +349,12 @@ class LuxtronikBinarySensor(BinarySensorEntity, RestoreEntity):
         **kwargs: Any,
     ) -> None:
         """Initialize a new Luxtronik binary sensor."""
-        # super().__init__(*args)
-        # self.hass = hass
-        self._luxtronik = luxtronik
+        super().__init__(coordinator)
+        self._luxtronik = coordinator.luxtronik
 
         self._sensor_key = sensor_key
-        self.entity_id = ENTITY_ID_FORMAT.format(f"{DOMAIN}_{unique_id}")
+        self._sensor_handle = self._luxtronik.register_key(sensor_key)
+        self.entity_id = ENTITY_ID_FORMAT.format(f"{coordinator.entity_prefix}_{unique_id}")
         self._attr_unique_id = self.entity_id
         self._attr_device_info = deviceInfo
         self._attr_name = name
@@ -359,10 +366,16 @@ class LuxtronikBinarySensor(BinarySensorEntity, RestoreEntity):
         self._attr_entity_registry_enabled_default = entity_registry_enabled_default
         self._attr_extra_state_attributes = {ATTR_EXTRA_STATE_ATTRIBUTE_LUXTRONIK_KEY: sensor_key}
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if self.coordinator.has_changed([self._sensor_handle]):
+            super()._handle_coordinator_update()
+
     @property
     def is_on(self):
         """Return true if binary sensor is on."""
-        value = self._luxtronik.get_value(self._sensor_key) == self._on_state
+        value = self._luxtronik.get_value(self._sensor_handle) == self._on_state
         return not value if self._invert else value
 
     @property
@@ -373,7 +386,3 @@ class LuxtronikBinarySensor(BinarySensorEntity, RestoreEntity):
         if self._attr_icon is None:
             super().icon
         return self._attr_icon
-
-    def update(self):
-        """Get the latest status and use it to update our sensor state."""
-        self._luxtronik.update()
@@ -14,8 +14,9 @@ from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.typing import ConfigType
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from . import LuxtronikDevice
+from . import get_entry_data
 from .const import (CONF_CALCULATIONS, CONF_CONTROL_MODE_HOME_ASSISTANT,
                     CONF_HA_SENSOR_INDOOR_TEMPERATURE,
                     CONF_PARAMETERS,
@@ -35,6 +36,7 @@ from .const import (CONF_CALCULATIONS, CONF_CONTROL_MODE_HOME_ASSISTANT,
                     LUX_STATUS_HEATING, LUX_STATUS_HEATING_EXTERNAL_SOURCE,
                     LUX_STATUS_SWIMMING_POOL_SOLAR,
                     PRESET_SECOND_HEATSOURCE, LuxMode)
+from .coordinator import LuxtronikCoordinator
 from .helpers.helper import get_sensor_text
 
 # endregion Imports
@@ -66,39 +68,40 @@ async def async_setup_entry(
     ha_sensor_indoor_temperature = config_entry.options.get(
         CONF_HA_SENSOR_INDOOR_TEMPERATURE)
 
-    luxtronik: LuxtronikDevice = hass.data.get(DOMAIN)
-    if not luxtronik:
+    entry_data = get_entry_data(hass, config_entry.entry_id)
+    if not entry_data:
         LOGGER.warning("climate.async_setup_platform no luxtronik!")
         return False
+    coordinator = entry_data.coordinator
 
     # Build Sensor names with local language:
     lang = hass.config.language
     entities = []
 
-    deviceInfoHeating = hass.data[f"{DOMAIN}_DeviceInfo_Heating"]
+    deviceInfoHeating = entry_data.device_info_heating
     if deviceInfoHeating is not None:
         text_heating = get_sensor_text(lang, 'heating')
         entities += [
             LuxtronikHeatingThermostat(
-                luxtronik, deviceInfoHeating, name=text_heating, control_mode_home_assistant=control_mode_home_assistant,
+                coordinator, deviceInfoHeating, name=text_heating, control_mode_home_assistant=control_mode_home_assistant,
                 current_temperature_sensor=ha_sensor_indoor_temperature)
         ]
 
-    deviceInfoDomesticWater = hass.data[f"{DOMAIN}_DeviceInfo_Domestic_Water"]
+    deviceInfoDomesticWater = entry_data.device_info_domestic_water
     if deviceInfoDomesticWater is not None:
         text_domestic_water = get_sensor_text(lang, 'domestic_water')
         entities += [
             LuxtronikDomesticWaterThermostat(
-                luxtronik, deviceInfoDomesticWater, name=text_domestic_water, control_mode_home_assistant=control_mode_home_assistant,
+                coordinator, deviceInfoDomesticWater, name=text_domestic_water, control_mode_home_assistant=control_mode_home_assistant,
                 current_temperature_sensor=LUX_SENSOR_DOMESTIC_WATER_CURRENT_TEMPERATURE)
         ]
 
-    deviceInfoCooling = hass.data[f"{DOMAIN}_DeviceInfo_Cooling"]
+    deviceInfoCooling = entry_data.device_info_cooling
     if deviceInfoCooling is not None:
         text_cooling = get_sensor_text(lang, 'cooling')
         entities += [
             LuxtronikCoolingThermostat(
-                luxtronik, deviceInfoCooling, name=text_cooling, control_mode_home_assistant=control_mode_home_assistant,
+                coordinator, deviceInfoCooling, name=text_cooling, control_mode_home_assistant=control_mode_home_assistant,
                 current_temperature_sensor=LUX_SENSOR_OUTDOOR_TEMPERATURE)
         ]
 
@@ -106,7 +109,7 @@ async def async_setup_entry(
 # endregion Setup
 
 
-class LuxtronikThermostat(ClimateEntity, RestoreEntity):
+class LuxtronikThermostat(CoordinatorEntity[LuxtronikCoordinator], ClimateEntity, RestoreEntity):
     """Representation of a Luxtronik Thermostat device."""
     # region Properties / Init
     _active = False
@@ -126,6 +129,7 @@ class LuxtronikThermostat(ClimateEntity, RestoreEntity):
 
     _status_sensor: Final = LUX_SENSOR_STATUS
     _target_temperature_sensor: str = None
+    _heater_sensor: str = None
 
     _heat_status = [LUX_STATUS_HEATING, LUX_STATUS_DOMESTIC_WATER, LUX_STATUS_COOLING]
 
@@ -135,14 +139,18 @@ class LuxtronikThermostat(ClimateEntity, RestoreEntity):
     _last_lux_mode: LuxMode = None
     _last_hvac_action = None
 
-    def __init__(self, luxtronik: LuxtronikDevice, deviceInfo: DeviceInfo, name: str, control_mode_home_assistant: bool, current_temperature_sensor: str):
-        self._luxtronik = luxtronik
+    def __init__(self, coordinator: LuxtronikCoordinator, deviceInfo: DeviceInfo, name: str, control_mode_home_assistant: bool, current_temperature_sensor: str):
+        super().__init__(coordinator)
+        self._luxtronik = coordinator.luxtronik
         self._attr_device_info = deviceInfo
         self._attr_name = name
         self._control_mode_home_assistant = control_mode_home_assistant
         self._current_temperature_sensor = current_temperature_sensor
+        for key in [self._status_sensor, self._target_temperature_sensor,
+                    self._heater_sensor, current_temperature_sensor]:
+            self._luxtronik.register_key(key)
         self.entity_id = ENTITY_ID_FORMAT.format(
-            f"{DOMAIN}_{self._attr_unique_id}")
+            f"{coordinator.entity_prefix}_{self._attr_unique_id}")
     # endregion Properties / Init
 
     # region Temperatures
@@ -187,17 +195,17 @@ class LuxtronikThermostat(ClimateEntity, RestoreEntity):
         except ValueError as ex:
             LOGGER.error("Unable to update from sensor: %s", ex)
 
-    def set_temperature(self, **kwargs: Any) -> None:
+    async def async_set_temperature(self, **kwargs: Any) -> None:
         """Set new target temperature."""
         changed = False
         self._attr_target_temperature = kwargs[ATTR_TEMPERATURE]
         if self._target_temperature_sensor is not None:
-            self._luxtronik.write(self._target_temperature_sensor.split('.')[1],
-                                  self._attr_target_temperature, use_debounce=False,
-                                  update_immediately_after_write=True)
+            await self.coordinator.async_write(self._target_temperature_sensor.split('.')[1],
+                                               self._attr_target_temperature, use_debounce=False,
+                                               update_immediately_after_write=True)
             changed = True
         if changed:
-            self.schedule_update_ha_state(force_refresh=True)
+            self.async_write_ha_state()
     # endregion Temperatures
 
     def _is_heating_on(self) -> bool:
@@ -254,7 +262,7 @@ class LuxtronikThermostat(ClimateEntity, RestoreEntity):
         self._attr_hvac_mode = self.__get_hvac_mode(self.hvac_action)
         return self._attr_hvac_mode
 
-    def set_hvac_mode(self, hvac_mode: HVACMode) -> None:
+    async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set new operation mode."""
         if self._attr_hvac_mode == hvac_mode:
             return
@@ -262,10 +270,10 @@ class LuxtronikThermostat(ClimateEntity, RestoreEntity):
                     self._attr_unique_id, hvac_mode)
         self._attr_hvac_mode = hvac_mode
         self._last_lux_mode = self.__get_luxmode(hvac_mode, self.preset_mode)
-        self._luxtronik.write(self._heater_sensor.split('.')[1],
-                              self._last_lux_mode.value, use_debounce=False,
-                              update_immediately_after_write=True)
-        self.schedule_update_ha_state(force_refresh=True)
+        await self.coordinator.async_write(self._heater_sensor.split('.')[1],
+                                           self._last_lux_mode.value, use_debounce=False,
+                                           update_immediately_after_write=True)
+        self.async_write_ha_state()
 
     def __get_hvac_mode(self, hvac_action):
         luxmode = LuxMode[self._luxtronik.get_value(
@@ -310,15 +318,15 @@ class LuxtronikThermostat(ClimateEntity, RestoreEntity):
             return PRESET_AWAY
         return PRESET_NONE
 
-    def set_preset_mode(self, preset_mode: str) -> None:
+    async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set preset mode."""
         self._attr_preset_mode = preset_mode
         self._last_lux_mode = self.__get_luxmode(self.hvac_mode, preset_mode)
-        self._luxtronik.write(self._heater_sensor.split('.')[1],
-                              self._last_lux_mode.value,
-                              use_debounce=False,
-                              update_immediately_after_write=True)
-        self.schedule_update_ha_state(force_refresh=True)
+        await self.coordinator.async_write(self._heater_sensor.split('.')[1],
+                                           self._last_lux_mode.value,
+                                           use_debounce=False,
+                                           update_immediately_after_write=True)
+        self.async_write_ha_state()
 
     # region Helper
     def __is_luxtronik_sensor(self, sensor: str) -> bool:
@@ -12,15 +12,21 @@ from homeassistant.data_entry_flow import FlowResult
 
 from .const import (
     CONF_CONTROL_MODE_HOME_ASSISTANT,
+    CONF_ENTITY_PREFIX,
+    CONF_HA_SENSOR_ELECTRICAL_POWER,
     CONF_HA_SENSOR_INDOOR_TEMPERATURE,
     CONF_LOCK_TIMEOUT,
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_MIN_UPDATE_INTERVAL,
     CONF_SAFE,
     CONF_UPDATE_IMMEDIATELY_AFTER_WRITE,
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    DEFAULT_MIN_UPDATE_INTERVAL,
     DEFAULT_PORT,
     DOMAIN,
     LOGGER,
 )
-from .helpers.lux_helper import discover
+from .helpers.lux_helper import async_discover, get_discovered
 from .luxtronik_device import LuxtronikDevice
 
 # endregion Imports
@@ -57,21 +63,40 @@ class LuxtronikFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             discovery_info.ip,
         )
         # Validate dhcp result with socket broadcast:
-        broadcast_discover_ip, broadcast_discover_port = discover()
-        if broadcast_discover_ip != discovery_info.ip:
-            return None
-
-        luxtronik = LuxtronikDevice.connect(broadcast_discover_ip, broadcast_discover_port)
-        await self.async_set_unique_id(luxtronik.unique_id)
-        self._abort_if_unique_id_configured()
-
+        responders = dict(await async_discover())
+        if discovery_info.ip not in responders:
+            return self.async_abort(reason="not_luxtronik")
+        broadcast_discover_port = responders[discovery_info.ip]
         self._discovery_host = discovery_info.ip
         self._discovery_port = (
             DEFAULT_PORT if broadcast_discover_port is None else broadcast_discover_port
         )
+
+        luxtronik = await LuxtronikDevice.async_connect(self._discovery_host, self._discovery_port)
+        await self.async_set_unique_id(luxtronik.unique_id)
+        self._abort_if_unique_id_configured()
+
         self._discovery_schema = self._get_schema()
         return await self.async_step_user()
 
+    @callback
+    def _async_suggest_discovered(self) -> None:
+        """Suggest the first discovered heatpump which is not configured yet.
+
+        Only cached answers are used, the form doesn't wait for the broadcast.
+        Without any a discovery is started for the next time the form opens.
+        """
+        discovered = get_discovered()
+        if not discovered:
+            self.hass.async_create_background_task(async_discover(), f"{DOMAIN} discovery")
+            return
+        configured = {entry.data.get(CONF_HOST) for entry in self._async_current_entries()}
+        for host, port in discovered:
+            if host not in configured:
+                self._discovery_host = host
+                self._discovery_port = DEFAULT_PORT if port is None else port
+                return
+
     async def _show_setup_form(
         self, errors: dict[str, str] | None = None
     ) -> FlowResult:
@@ -87,6 +112,8 @@ class LuxtronikFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
     ) -> FlowResult:
         """Handle a flow initiated by the user."""
         if user_input is None:
+            if self._discovery_host is None:
+                self._async_suggest_discovered()
             return await self._show_setup_form(user_input)
 
         data = {
@@ -104,10 +131,13 @@ class LuxtronikFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         }
         self._async_abort_entries_match(data)
 
-        luxtronik = LuxtronikDevice.connect(user_input[CONF_HOST], user_input[CONF_PORT])
+        luxtronik = await LuxtronikDevice.async_connect(user_input[CONF_HOST], user_input[CONF_PORT])
 
         await self.async_set_unique_id(luxtronik.unique_id)
         self._abort_if_unique_id_configured()
+        if self._async_current_entries():
+            # Keep the entity ids of the first heatpump, further ones get their own.
+            data[CONF_ENTITY_PREFIX] = f"{DOMAIN}_{luxtronik.unique_id}"
         return self.async_create_entry(title=f"{luxtronik.manufacturer} {luxtronik.model} {luxtronik.serial_number}", data=data)
 
     @staticmethod
@@ -143,6 +173,18 @@ class LuxtronikOptionsFlowHandler(config_entries.OptionsFlow):
                     CONF_HA_SENSOR_INDOOR_TEMPERATURE,
                     default=self._get_value(CONF_HA_SENSOR_INDOOR_TEMPERATURE, f"sensor.{self._sensor_prefix}_room_temperature"),
                 ): str,
+                vol.Optional(
+                    CONF_HA_SENSOR_ELECTRICAL_POWER,
+                    default=self._get_value(CONF_HA_SENSOR_ELECTRICAL_POWER, ""),
+                ): str,
+                vol.Optional(
+                    CONF_MIN_UPDATE_INTERVAL,
+                    default=self._get_value(CONF_MIN_UPDATE_INTERVAL, DEFAULT_MIN_UPDATE_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Optional(
+                    CONF_MAX_UPDATE_INTERVAL,
+                    default=self._get_value(CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
             }
         )
 
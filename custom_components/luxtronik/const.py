@@ -3,7 +3,7 @@
 import logging
 from dataclasses import dataclass
 from datetime import timedelta
-from enum import Enum
+from enum import Enum, IntEnum
 from typing import Final
 
 import homeassistant.helpers.config_validation as cv
@@ -36,18 +36,59 @@ PLATFORMS: list[str] = [
 CONF_SAFE: Final = "safe"
 CONF_LOCK_TIMEOUT: Final = "lock_timeout"
 CONF_UPDATE_IMMEDIATELY_AFTER_WRITE: Final = "update_immediately_after_write"
+CONF_CONNECTION_POOL_SIZE: Final = "connection_pool_size"
+CONF_MIN_UPDATE_INTERVAL: Final = "min_update_interval"
+CONF_MAX_UPDATE_INTERVAL: Final = "max_update_interval"
+CONF_CONNECT_TIMEOUT: Final = "connect_timeout"
+CONF_READ_TIMEOUT: Final = "read_timeout"
+CONF_WRITE_TIMEOUT: Final = "write_timeout"
+CONF_RETRIES: Final = "retries"
 
 CONF_PARAMETERS: Final = "parameters"
 CONF_CALCULATIONS: Final = "calculations"
 CONF_VISIBILITIES: Final = "visibilities"
+# Calculations holding the firmware version string (one character each).
+LUX_CALCULATIONS_VERSION_RANGE: Final = range(81, 91)
+LUX_CALCULATIONS_VERSION_LENGTH: Final = 9
+
+
+class LuxGroup(IntEnum):
+    """Luxtronik value tables, named like the key prefixes."""
+
+    parameters = 0
+    calculations = 1
+    visibilities = 2
+
 
 CONF_COORDINATOR: Final = "coordinator"
+CONF_SCHEDULER: Final = "scheduler"
+# Prefix of the entity ids, heatpumps added after the first one get their own.
+CONF_ENTITY_PREFIX: Final = "entity_prefix"
+# hass.data[DOMAIN] key of the heatpump configured in configuration.yaml.
+DATA_YAML_ENTRY: Final = "yaml"
 
 CONF_CONTROL_MODE_HOME_ASSISTANT: Final = "control_mode_home_assistant"
 CONF_HA_SENSOR_INDOOR_TEMPERATURE: Final = "ha_sensor_indoor_temperature"
+CONF_HA_SENSOR_ELECTRICAL_POWER: Final = "ha_sensor_electrical_power"
 CONF_LANGUAGE_SENSOR_NAMES: Final = "language_sensor_names"
 
 DEFAULT_PORT: Final = 8889
+# Broadcast discovery, the heatpumps answer on the port the request was sent to.
+LUX_DISCOVERY_PORTS: Final = (4444, 47808)
+# AIT magic broadcast packet and the start of the answers.
+DISCOVERY_REQUEST: Final = b"2000;111;1;\x00"
+DISCOVERY_RESPONSE_PREFIX: Final = "2500;111;"
+DISCOVERY_TIMEOUT: Final = timedelta(seconds=2)
+DISCOVERY_CACHE_TIME: Final = timedelta(minutes=1)
+DEFAULT_CONNECTION_POOL_SIZE: Final = 1
+# Seconds between polls while the heatpump changes state and while it is idle.
+DEFAULT_MIN_UPDATE_INTERVAL: Final = 5
+DEFAULT_MAX_UPDATE_INTERVAL: Final = 60
+# Seconds a connect, read or write may take and retries of a failed request.
+DEFAULT_CONNECT_TIMEOUT: Final = 5
+DEFAULT_READ_TIMEOUT: Final = 10
+DEFAULT_WRITE_TIMEOUT: Final = 10
+DEFAULT_RETRIES: Final = 2
 
 CONFIG_SCHEMA = vol.Schema(
     {
@@ -60,6 +101,25 @@ CONFIG_SCHEMA = vol.Schema(
                 vol.Optional(
                     CONF_UPDATE_IMMEDIATELY_AFTER_WRITE, default=False
                 ): cv.boolean,
+                vol.Optional(
+                    CONF_CONNECTION_POOL_SIZE, default=DEFAULT_CONNECTION_POOL_SIZE
+                ): vol.All(cv.positive_int, vol.Range(max=4)),
+                vol.Optional(
+                    CONF_MIN_UPDATE_INTERVAL, default=DEFAULT_MIN_UPDATE_INTERVAL
+                ): cv.positive_int,
+                vol.Optional(
+                    CONF_MAX_UPDATE_INTERVAL, default=DEFAULT_MAX_UPDATE_INTERVAL
+                ): cv.positive_int,
+                vol.Optional(
+                    CONF_CONNECT_TIMEOUT, default=DEFAULT_CONNECT_TIMEOUT
+                ): cv.positive_float,
+                vol.Optional(CONF_READ_TIMEOUT, default=DEFAULT_READ_TIMEOUT): cv.positive_float,
+                vol.Optional(
+                    CONF_WRITE_TIMEOUT, default=DEFAULT_WRITE_TIMEOUT
+                ): cv.positive_float,
+                vol.Optional(CONF_RETRIES, default=DEFAULT_RETRIES): vol.All(
+                    vol.Coerce(int), vol.Range(min=0, max=5)
+                ),
             }
         )
     },
@@ -69,14 +129,32 @@ CONFIG_SCHEMA = vol.Schema(
 SERVICE_WRITE: Final = "write"
 ATTR_PARAMETER: Final = "parameter"
 ATTR_VALUE: Final = "value"
+ATTR_WRITTEN_VALUE: Final = "written_value"
+ATTR_READ_VALUE: Final = "read_value"
+# Fired when a written parameter is read back with another value.
+EVENT_WRITE_MISMATCH: Final = f"{DOMAIN}_write_mismatch"
+ATTR_CONFIG_ENTRY_ID: Final = "config_entry_id"
 
 SERVICE_WRITE_SCHEMA = vol.Schema(
     {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
         vol.Required(ATTR_PARAMETER): cv.string,
         vol.Required(ATTR_VALUE): vol.Any(cv.Number, cv.string),
     }
 )
 
+SERVICE_WRITE_MANY: Final = "write_many"
+ATTR_PARAMETERS: Final = "parameters"
+
+SERVICE_WRITE_MANY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_PARAMETERS): vol.All(
+            {cv.string: vol.Any(cv.Number, cv.string)}, vol.Length(min=1)
+        ),
+    }
+)
+
 LANG_EN: Final = "en"
 LANG_DE: Final = "de"
 LANG_DEFAULT: Final = LANG_EN
@@ -100,6 +178,59 @@ ATTR_EXTRA_STATE_ATTRIBUTE_LAST_THERMAL_DESINFECTION: Final = "Last thermal desi
 
 
 MIN_TIME_BETWEEN_UPDATES: Final = timedelta(seconds=10)
+# Poll with the min interval for this long after a write or a compressor start/stop.
+FAST_POLL_DURATION: Final = timedelta(minutes=2)
+# Writes of a parameter are sent after it was not changed for this delay.
+WRITE_DEBOUNCE_DELAY: Final = timedelta(seconds=3)
+# Delay between a write and reading back the values.
+WRITE_CONFIRM_DELAY: Final = timedelta(seconds=3)
+# Calculations are read on every poll, parameters and visibilities rarely change.
+READ_INTERVAL_CALCULATIONS: Final = timedelta(seconds=0)
+READ_INTERVAL_PARAMETERS: Final = timedelta(minutes=5)
+READ_INTERVAL_VISIBILITIES: Final = timedelta(hours=1)
+# Groups no entity is registered for are only refreshed this often.
+READ_INTERVAL_UNSUBSCRIBED: Final = timedelta(hours=1)
+LUX_SENSOR_FLOW_TEMPERATURE: Final = "calculations.ID_WEB_Temperatur_TVL"
+LUX_SENSOR_RETURN_TEMPERATURE: Final = "calculations.ID_WEB_Temperatur_TRL"
+LUX_SENSOR_FLOW_HEATING: Final = "calculations.ID_WEB_WMZ_Durchfluss"
+LUX_SENSOR_FLOW_HEAT_SOURCE: Final = "calculations.ID_WEB_Durchfluss_WQ"
+LUX_SENSOR_HEAT_SOURCE_INPUT: Final = "calculations.ID_WEB_Temperatur_TWE"
+LUX_SENSOR_HEAT_SOURCE_OUTPUT: Final = "calculations.ID_WEB_Temperatur_TWA"
+LUX_SENSOR_HEAT_OUTPUT: Final = "calculations.Heat_Output"
+# Inputs of LuxtronikThermalEngine, the first one gives the sample times.
+THERMAL_KEYS: Final = [
+    LUX_SENSOR_FLOW_TEMPERATURE,
+    LUX_SENSOR_RETURN_TEMPERATURE,
+    LUX_SENSOR_FLOW_HEATING,
+    LUX_SENSOR_FLOW_HEAT_SOURCE,
+    LUX_SENSOR_HEAT_SOURCE_INPUT,
+    LUX_SENSOR_HEAT_SOURCE_OUTPUT,
+    LUX_SENSOR_HEAT_OUTPUT,
+]
+HISTORY_KEYS: Final = [
+    *THERMAL_KEYS,
+    "calculations.ID_WEB_VD1out",
+]
+# Windows of the thermal power and COP sensors.
+THERMAL_WINDOWS: Final = {
+    "1min": timedelta(minutes=1),
+    "15min": timedelta(minutes=15),
+    "1h": timedelta(hours=1),
+}
+# Snapshots kept by LuxtronikHistory, the longest window at the default min
+# update interval. See history_size for other intervals.
+HISTORY_SIZE: Final = (
+    max(THERMAL_WINDOWS.values()) // timedelta(seconds=DEFAULT_MIN_UPDATE_INTERVAL) + 1
+)
+# J/(kg K), a litre of water or brine is taken as a kg.
+HEAT_CAPACITY_WATER: Final = 4186
+# No COP below this electrical power in W, e.g. while the compressor is off.
+COP_MIN_ELECTRICAL_POWER: Final = 100
+# The raw values are saved this often for a fast start, and on stop/unload.
+SNAPSHOT_SAVE_INTERVAL: Final = timedelta(minutes=15)
+# Heatpumps polled at the same time and the gap between their poll starts.
+MAX_CONCURRENT_POLLS: Final = 2
+POLL_STAGGER: Final = timedelta(milliseconds=500)
 
 PRESET_AUTO: Final = 'automatic'
 PRESET_SECOND_HEATSOURCE: Final = "second_heatsource"
@@ -185,7 +316,10 @@ ICON_OFF = "mdi:circle-outline"
 # region Luxtronik Sensor ids
 LUX_SENSOR_STATUS: Final = "calculations.ID_WEB_WP_BZ_akt"
 LUX_SENSOR_STATUS1: Final = "calculations.ID_WEB_HauptMenuStatus_Zeile1"
+LUX_SENSOR_STATUS2: Final = "calculations.ID_WEB_HauptMenuStatus_Zeile2"
 LUX_SENSOR_STATUS3: Final = "calculations.ID_WEB_HauptMenuStatus_Zeile3"
+LUX_SENSOR_STATUS_TIME: Final = "calculations.ID_WEB_HauptMenuStatus_Zeit"
+LUX_SENSOR_COMPRESSOR: Final = "calculations.ID_WEB_VD1out"
 
 LUX_SENSOR_REMOTE_MAINTENANCE: Final = "parameters.ID_Einst_Fernwartung_akt"
 LUX_SENSOR_PUMP_OPTIMIZATION: Final = "parameters.ID_Einst_Popt_akt"
@@ -0,0 +1,222 @@
+"""Update coordinator for Luxtronik."""
+# region Imports
+import asyncio
+from datetime import timedelta
+import time
+from typing import Any, Iterable
+
+from homeassistant.const import (
+    ATTR_UNIT_OF_MEASUREMENT,
+    CONF_HOST,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+    UnitOfPower,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .const import (
+    ATTR_PARAMETER,
+    ATTR_READ_VALUE,
+    ATTR_WRITTEN_VALUE,
+    CONF_PARAMETERS,
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    DOMAIN,
+    EVENT_WRITE_MISMATCH,
+    LOGGER,
+    LUX_SENSOR_COMPRESSOR,
+    LUX_SENSOR_STATUS,
+    THERMAL_WINDOWS,
+    LuxGroup,
+)
+from .history import LuxtronikHistory, history_size
+from .luxtronik_buffer import LuxtronikKey
+from .luxtronik_device import LuxtronikDevice
+from .scheduler import LuxtronikPollInterval, LuxtronikPollScheduler
+from .thermal import ELECTRICAL_POWER, LuxtronikThermalEngine, ThermalSummary
+from .write_queue import LuxtronikWriteQueue
+
+# endregion Imports
+
+
+class LuxtronikCoordinator(DataUpdateCoordinator[set[tuple[LuxGroup, int]] | None]):
+    """Fetch the heatpump data once per interval for all entities.
+
+    Every poll and every read back after a confirmed write notifies all
+    entities once, none of them reads or refreshes on its own. The data is
+    the set of (group, index) values changed by the last poll, None if every
+    entity has to write its state.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        luxtronik: LuxtronikDevice,
+        scheduler: LuxtronikPollScheduler | None = None,
+        entity_prefix: str = DOMAIN,
+        min_update_interval: timedelta = timedelta(seconds=DEFAULT_MIN_UPDATE_INTERVAL),
+        max_update_interval: timedelta = timedelta(seconds=DEFAULT_MAX_UPDATE_INTERVAL),
+        electrical_power_sensor: str | None = None,
+    ) -> None:
+        """Initialize the coordinator, the scheduler is shared by all heatpumps.
+
+        electrical_power_sensor is an optional Home Assistant power sensor
+        metering the heatpump, used for the COP instead of the energy balance.
+        """
+        self.poll_interval = LuxtronikPollInterval(min_update_interval, max_update_interval)
+        super().__init__(
+            hass,
+            LOGGER,
+            name=f"{DOMAIN} {luxtronik.host}",
+            update_interval=self.poll_interval.default_interval,
+        )
+        self.luxtronik = luxtronik
+        self.entity_prefix = entity_prefix
+        self._scheduler = scheduler or LuxtronikPollScheduler()
+        self.write_queue = LuxtronikWriteQueue(
+            hass, luxtronik, self.async_read_back, self._async_notify
+        )
+        self._last_update_success_notified = True
+        self._electrical_power_sensor = electrical_power_sensor or None
+        self._electrical_power = (
+            LuxtronikHistory([ELECTRICAL_POWER], history_size(min_update_interval))
+            if self._electrical_power_sensor
+            else None
+        )
+        self._thermal_engine = LuxtronikThermalEngine(luxtronik.history, self._electrical_power)
+        self.thermal: dict[str, ThermalSummary] = {}
+
+    async def _async_update_data(self) -> set[tuple[LuxGroup, int]] | None:
+        """Read all values from the heatpump."""
+        try:
+            async with self._scheduler.async_poll_slot():
+                await self.luxtronik.async_read()
+        except (OSError, asyncio.IncompleteReadError, TimeoutError) as err:
+            # Back off while the circuit breaker is open, the entities are unavailable.
+            retry_in = timedelta(seconds=self.luxtronik.circuit_breaker.retry_in)
+            self.update_interval = max(self.poll_interval.default_interval, retry_in)
+            raise UpdateFailed(f"Error communicating with Luxtronik: {err}") from err
+        self._fire_write_mismatches()
+        now = time.time()
+        if self._electrical_power is not None:
+            self._electrical_power.record(now, [self._get_electrical_power()])
+        self.thermal = self._thermal_engine.compute(THERMAL_WINDOWS, now)
+        self.update_interval = self.poll_interval.next_interval(
+            self.luxtronik.get_value(LUX_SENSOR_STATUS),
+            self.luxtronik.get_value(LUX_SENSOR_COMPRESSOR),
+        )
+        return self.luxtronik.pop_changes()
+
+    def _get_electrical_power(self) -> float | None:
+        """Return the power of the external meter in W."""
+        state = self.hass.states.get(self._electrical_power_sensor)
+        if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return None
+        try:
+            value = float(state.state)
+        except ValueError:
+            return None
+        if state.attributes.get(ATTR_UNIT_OF_MEASUREMENT) == UnitOfPower.KILO_WATT:
+            value *= 1000
+        return value
+
+    async def async_write(
+        self,
+        parameter: str,
+        value: Any,
+        use_debounce: bool = True,
+        update_immediately_after_write: bool = False,
+    ) -> None:
+        """Write a parameter, debounced writes wait until it was not changed for a while.
+
+        The entities show the new value at once, until it is read back.
+        """
+        if not use_debounce:
+            await self.async_write_batch({parameter: value}, update_immediately_after_write)
+            return
+        self._async_fast_poll()
+        self._async_notify(self.luxtronik.set_optimistic({parameter: value}))
+        self.write_queue.async_queue(parameter, value, update_immediately_after_write)
+
+    async def async_write_batch(
+        self, parameters: dict[str, Any], update_immediately_after_write: bool = False
+    ) -> None:
+        """Write several parameters in one transaction with a single read back."""
+        self._async_fast_poll()
+        self._async_notify(self.luxtronik.set_optimistic(parameters))
+        await self.write_queue.async_write(parameters, update_immediately_after_write)
+
+    async def async_read_back(self) -> None:
+        """Read only the parameters to confirm or roll back the written values."""
+        try:
+            async with self._scheduler.async_poll_slot():
+                await self.luxtronik.async_read([CONF_PARAMETERS])
+        except (OSError, asyncio.IncompleteReadError, TimeoutError) as err:
+            # The parameters are read on the next poll.
+            LOGGER.warning("Couldn't read back luxtronik parameters: %s", err)
+            return
+        self._fire_write_mismatches()
+        self._async_notify(self.luxtronik.pop_changes())
+
+    @callback
+    def _async_fast_poll(self) -> None:
+        """Poll with the min interval for a while, starting with the next poll."""
+        self.poll_interval.fast_poll()
+        # The refresh scheduled while idle may be up to the max interval away.
+        min_interval = self.poll_interval.min_interval
+        if self._unsub_refresh is not None and self.update_interval > min_interval:
+            self.update_interval = min_interval
+            self._schedule_refresh()
+
+    @callback
+    def _async_notify(self, changes: set[tuple[LuxGroup, int]] | None) -> None:
+        """Update the listeners of changed values between polls."""
+        if changes is not None and not changes:
+            return
+        self.data = changes
+        self.async_update_listeners()
+
+    def _fire_write_mismatches(self) -> None:
+        for mismatch in self.luxtronik.pop_write_mismatches():
+            LOGGER.warning(
+                "Luxtronik parameter %s was written as %s but read back as %s",
+                mismatch.parameter,
+                mismatch.written,
+                mismatch.read,
+            )
+            self.hass.bus.async_fire(
+                EVENT_WRITE_MISMATCH,
+                {
+                    CONF_HOST: self.luxtronik.host,
+                    ATTR_PARAMETER: mismatch.parameter,
+                    ATTR_WRITTEN_VALUE: mismatch.written,
+                    ATTR_READ_VALUE: mismatch.read,
+                },
+            )
+
+    async def async_shutdown(self) -> None:
+        """Cancel pending writes and refreshes."""
+        self.write_queue.async_shutdown()
+        await super().async_shutdown()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all listeners, all of them if the availability changed."""
+        if self.last_update_success != self._last_update_success_notified:
+            self._last_update_success_notified = self.last_update_success
+            self.data = None
+        super().async_update_listeners()
+
+    def has_changed(self, keys: Iterable[LuxtronikKey | None]) -> bool:
+        """Return True if one of the keys changed on the last poll."""
+        changes = self.data
+        if changes is None:
+            return True
+        for key in keys:
+            if key is None:
+                continue
+            for index in range(key.index, key.index + key.width):
+                if (key.group, index) in changes:
+                    return True
+        return False
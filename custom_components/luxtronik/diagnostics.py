@@ -8,11 +8,12 @@ from async_timeout import timeout
 from getmac import get_mac_address
 from homeassistant.components.diagnostics import async_redact_data
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import (CONF_HOST, CONF_PASSWORD, CONF_PORT,
-                                 CONF_USERNAME)
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import device_registry
-from luxtronik import Luxtronik as Lux
+
+from . import get_entry_data
+from .const import LuxGroup
 
 TO_REDACT = {CONF_USERNAME, CONF_PASSWORD}
 
@@ -20,10 +21,8 @@ TO_REDACT = {CONF_USERNAME, CONF_PASSWORD}
 async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, entry: ConfigEntry
 ) -> dict:
-    """Return diagnostics for a config entry."""
+    """Return diagnostics for a config entry, with the values of the last poll."""
     data: dict = entry.data
-    client = Lux(data[CONF_HOST], data[CONF_PORT], True)
-    client.read()
 
     mac = ""
     async with timeout(10):
@@ -34,12 +33,13 @@ async def async_get_config_entry_diagnostics(
     if "data" not in entry_data:
         entry_data["data"] = {}
     entry_data["data"]["mac"] = mac
-    diag_data = {
-        "entry": entry_data,
-        "parameters": _dump_items(client.parameters.parameters),
-        "calculations": _dump_items(client.calculations.calculations),
-        "visibilities": _dump_items(client.visibilities.visibilities),
-    }
+    diag_data = {"entry": entry_data}
+    luxtronik_data = get_entry_data(hass, entry.entry_id)
+    if luxtronik_data is not None:
+        luxtronik = luxtronik_data.luxtronik
+        for group in LuxGroup:
+            diag_data[group.name] = _dump_items(luxtronik.dump(group))
+        diag_data["metrics"] = luxtronik.metrics.as_dict()
     return diag_data
 
 
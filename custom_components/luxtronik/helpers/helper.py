@@ -1,14 +1,18 @@
 """Main help module."""
+import functools
 import json
 import os.path
+import sys
+
+from homeassistant.core import HomeAssistant
 
 from ..const import LANG_DEFAULT, LANGUAGES_SENSOR_NAMES, LOGGER
 
-__content_locale__ = None
-__content_default__ = None
+TRANSLATION_TEXTS = "texts"
+TRANSLATION_PLATFORMS = (TRANSLATION_TEXTS, "sensor")
 
-__content_sensor_locale__ = None
-__content_sensor_default__ = None
+# platform -> language -> lookup key -> text, the default language is merged in.
+__translations__: dict[str, dict[str, dict]] = {}
 
 
 def _load_lang_from_file(fname: str, log_warning=True):
@@ -18,12 +22,61 @@ def _load_lang_from_file(fname: str, log_warning=True):
         if log_warning:
             LOGGER.warning("_load_lang_from_file - file not found %s", fname)
         return {}
-    f = open(fname)
-    data = json.loads(f.read())
-    f.close
-    return data
+    with open(fname, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _flatten_translation(platform: str, content: dict) -> dict:
+    """Return the texts of a translation file keyed by interned lookup keys."""
+    if platform == TRANSLATION_TEXTS:
+        return {sys.intern(key): text for key, text in content.items()}
+    return {
+        (sys.intern(key), sys.intern(value)): text
+        for key, values in content.get("state", {}).items()
+        for value, text in values.items()
+    }
+
+
+def _load_translation(platform: str) -> dict[str, dict]:
+    """Load the translations of a platform for all languages."""
+    default = _flatten_translation(
+        platform, _load_lang_from_file(f"../translations/{platform}.{LANG_DEFAULT}.json")
+    )
+    translation = {LANG_DEFAULT: default}
+    for lang in LANGUAGES_SENSOR_NAMES:
+        if lang == LANG_DEFAULT:
+            continue
+        content = _load_lang_from_file(
+            f"../translations/{platform}.{lang}.json", log_warning=False
+        )
+        translation[lang] = {**default, **_flatten_translation(platform, content)}
+    return translation
+
+
+def _get_translation(platform: str, lang: str) -> dict:
+    try:
+        translation = __translations__[platform]
+    except KeyError:
+        # Not preloaded by async_load_translations.
+        translation = __translations__[platform] = _load_translation(platform)
+    return translation[_normalize_lang(lang)]
 
 
+def load_translations() -> None:
+    """Load all translations."""
+    for platform in TRANSLATION_PLATFORMS:
+        if platform not in __translations__:
+            __translations__[platform] = _load_translation(platform)
+
+
+async def async_load_translations(hass: HomeAssistant) -> None:
+    """Load all translations once without blocking the event loop."""
+    if all(platform in __translations__ for platform in TRANSLATION_PLATFORMS):
+        return
+    await hass.async_add_executor_job(load_translations)
+
+
+@functools.cache
 def _normalize_lang(lang: str) -> str:
     if lang is None:
         return LANG_DEFAULT
@@ -37,53 +90,21 @@ def _normalize_lang(lang: str) -> str:
 
 def get_sensor_text(lang: str, key: str) -> str:
     """Get a sensor text."""
-    global __content_locale__
-    global __content_default__
-    lang = _normalize_lang(lang)
-    if __content_locale__ is None and lang is not None and lang != LANG_DEFAULT:
-        __content_locale__ = _load_lang_from_file(f"../translations/texts.{lang}.json")
-    if __content_default__ is None:
-        __content_default__ = _load_lang_from_file(
-            f"../translations/texts.{LANG_DEFAULT}.json"
-        )
-    if lang != LANG_DEFAULT and __content_locale__ is not None and key in __content_locale__:
-        return __content_locale__[key]
-    if key in __content_default__:
-        return __content_default__[key]
-    LOGGER.warning("get_sensor_text key %s not found in %s", key, __content_default__)
-    return key.replace("_", " ").title()
+    try:
+        return _get_translation(TRANSLATION_TEXTS, lang)[key]
+    except KeyError:
+        LOGGER.warning("get_sensor_text key %s not found", key)
+        return key.replace("_", " ").title()
 
 
 def get_sensor_value_text(
     lang: str, key: str, value: str, platform="sensor"
 ) -> str:
     """Get a sensor value text."""
-    global __content_sensor_locale__
-    global __content_sensor_default__
-    if __content_sensor_default__ is None:
-        __content_sensor_default__ = _load_lang_from_file(
-            f"../translations/{platform}.{LANG_DEFAULT}.json", log_warning=True
+    try:
+        return _get_translation(platform, lang)[(key, value)]
+    except KeyError:
+        LOGGER.warning(
+            "get_sensor_value_text key %s / value %s not found", key, value
         )
-    lang = _normalize_lang(lang)
-    if __content_sensor_locale__ is None and lang != LANG_DEFAULT:
-        __content_sensor_locale__ = _load_lang_from_file(
-            f"../translations/{platform}.{lang}.json", log_warning=False
-        )
-    content = (
-        __content_sensor_default__
-        if lang == LANG_DEFAULT
-        else __content_sensor_locale__
-    )
-    if (
-        "state" in content
-        and key in content["state"]
-        and value in content["state"][key]
-    ):
-        return content["state"][key][value]
-    LOGGER.warning(
-        "get_sensor_value_text key %s / value %s not found in %s",
-        key,
-        value,
-        content,
-    )
-    return key.replace("_", " ").title()
+        return key.replace("_", " ").title()
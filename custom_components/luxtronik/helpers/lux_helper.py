@@ -1,53 +1,94 @@
 """Helper for luxtronik heatpump module."""
-import socket
+import asyncio
+from datetime import timedelta
+import time
 
-from ..const import LOGGER, LUX_MODELS_AlphaInnotec, LUX_MODELS_Novelan, LUX_MODELS_Other
+from ..const import (DISCOVERY_CACHE_TIME, DISCOVERY_REQUEST,
+                     DISCOVERY_RESPONSE_PREFIX, DISCOVERY_TIMEOUT, LOGGER,
+                     LUX_DISCOVERY_PORTS, LUX_MODELS_AlphaInnotec,
+                     LUX_MODELS_Novelan, LUX_MODELS_Other)
 
 
-def discover():
-    """Broadcast discovery for luxtronik heatpumps."""
+# Discovery answers as (ip, port), cached for DISCOVERY_CACHE_TIME.
+__discovered__: tuple[float, list[tuple[str, int | None]]] | None = None
+_discovery_lock = asyncio.Lock()
 
-    for p in (4444, 47808):
-        LOGGER.debug(f"Send discovery packets to port {p}")
-        server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
-        server.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-        server.bind(("", p))
-        server.settimeout(2)
 
-        # send AIT magic broadcast packet
-        data = "2000;111;1;\x00"
-        server.sendto(data.encode(), ("<broadcast>", p))
-        LOGGER.debug(f'Sending broadcast request "{data.encode()}"')
+class _DiscoveryProtocol(asyncio.DatagramProtocol):
+    """Collect the answers to the discovery broadcast on one port."""
 
-        while True:
-            try:
-                res, con = server.recvfrom(1024)
-                res = res.decode("ascii", errors="ignore")
-                # if we receive what we just sent, continue
-                if res == data:
-                    continue
-                ip = con[0]
-                # if the response starts with the magic nonsense
-                if res.startswith("2500;111;"):
-                    res = res.split(";")
-                    LOGGER.debug(f'Received answer from {ip} "{res}"')
-                    try:
-                        port = int(res[2])
-                    except ValueError:
-                        LOGGER.debug(
-                            "Response did not contain a valid port number, an old Luxtronic software version might be the reason."
-                        )
-                        port = None
-                    return (ip, port)
-                # if not, continue
-                else:
-                    LOGGER.debug(
-                        f"Received answer, but with wrong magic bytes, from {ip} skip this one"
+    def __init__(self, responders: dict[str, int | None]) -> None:
+        """Initialize the protocol, the answers are added to responders."""
+        self._responders = responders
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        res = data.decode("ascii", errors="ignore")
+        # if we receive what we just sent, continue
+        if data == DISCOVERY_REQUEST:
+            return
+        ip = addr[0]
+        if not res.startswith(DISCOVERY_RESPONSE_PREFIX):
+            LOGGER.debug("Received answer, but with wrong magic bytes, from %s skip this one", ip)
+            return
+        LOGGER.debug('Received answer from %s "%s"', ip, res)
+        try:
+            port = int(res.split(";")[2])
+        except (IndexError, ValueError):
+            LOGGER.debug(
+                "Response did not contain a valid port number, an old Luxtronic software version might be the reason."
+            )
+            port = None
+        if self._responders.get(ip) is None:
+            self._responders[ip] = port
+
+
+def get_discovered() -> list[tuple[str, int | None]]:
+    """Return the cached answers of the last discovery without broadcasting."""
+    if (
+        __discovered__ is None
+        or time.monotonic() - __discovered__[0] >= DISCOVERY_CACHE_TIME.total_seconds()
+    ):
+        return []
+    return __discovered__[1]
+
+
+async def async_discover(
+    timeout: timedelta = DISCOVERY_TIMEOUT,
+) -> list[tuple[str, int | None]]:
+    """Broadcast discovery for luxtronik heatpumps, return all (ip, port) answering.
+
+    Both discovery ports are probed at the same time. The answers are cached
+    for a while, so several config flows share one broadcast.
+    """
+    global __discovered__  # pylint: disable=global-statement
+    async with _discovery_lock:
+        if discovered := get_discovered():
+            return discovered
+        loop = asyncio.get_running_loop()
+        responders: dict[str, int | None] = {}
+        transports = []
+        try:
+            for port in LUX_DISCOVERY_PORTS:
+                try:
+                    transport, _ = await loop.create_datagram_endpoint(
+                        lambda: _DiscoveryProtocol(responders),
+                        local_addr=("0.0.0.0", port),
+                        allow_broadcast=True,
                     )
+                except OSError as err:
+                    LOGGER.debug("Couldn't listen for discovery answers on port %s: %s", port, err)
                     continue
-            # if the timeout triggers, go on an use the other broadcast port
-            except socket.timeout:
-                break
+                transports.append(transport)
+                LOGGER.debug("Send discovery packets to port %s", port)
+                transport.sendto(DISCOVERY_REQUEST, ("255.255.255.255", port))
+            if transports:
+                await asyncio.sleep(timeout.total_seconds())
+        finally:
+            for transport in transports:
+                transport.close()
+        # Nothing is cached without an answer, a heatpump may come up any time.
+        __discovered__ = (time.monotonic(), list(responders.items())) if responders else None
+        return list(responders.items())
 
 
 def get_manufacturer_by_model(model: str) -> str:
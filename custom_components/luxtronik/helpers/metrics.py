@@ -0,0 +1,84 @@
+"""Rolling metrics of the Luxtronik communication."""
+# region Imports
+from array import array
+from contextlib import contextmanager
+import time
+from typing import Final, Iterator
+
+# endregion Imports
+
+METRICS_WINDOW: Final = 100
+
+METRIC_CONNECT_TIME: Final = "connect_time"
+METRIC_READ_TIME: Final = "read_time"
+METRIC_DECODE_TIME: Final = "decode_time"
+METRIC_LOCK_WAIT_TIME: Final = "lock_wait_time"
+METRIC_BYTES_RECEIVED: Final = "bytes_received"
+METRIC_WRITE_TIME: Final = "write_time"
+
+
+class RollingHistogram:
+    """Keep the last samples of a value in a ring buffer."""
+
+    def __init__(self, size: int = METRICS_WINDOW) -> None:
+        """Initialize an empty histogram."""
+        self._samples = array("d", bytes(8 * size))
+        self._size = size
+        self.count = 0
+        self.last: float | None = None
+
+    def record(self, value: float) -> None:
+        """Add a sample, replacing the oldest one if the window is full."""
+        self._samples[self.count % self._size] = value
+        self.count += 1
+        self.last = value
+
+    def as_dict(self) -> dict:
+        """Return a summary of the window."""
+        window = sorted(self._samples[: min(self.count, self._size)])
+        if not window:
+            return {"count": self.count}
+        return {
+            "count": self.count,
+            "last": self.last,
+            "mean": sum(window) / len(window),
+            "min": window[0],
+            "p50": window[len(window) // 2],
+            "p95": window[min(len(window) - 1, int(len(window) * 0.95))],
+            "max": window[-1],
+        }
+
+
+class LuxtronikMetrics:
+    """Histograms of connect, read, decode, lock wait and write times."""
+
+    def __init__(self) -> None:
+        """Initialize all histograms."""
+        self.histograms = {
+            name: RollingHistogram()
+            for name in (
+                METRIC_CONNECT_TIME,
+                METRIC_READ_TIME,
+                METRIC_DECODE_TIME,
+                METRIC_LOCK_WAIT_TIME,
+                METRIC_BYTES_RECEIVED,
+                METRIC_WRITE_TIME,
+            )
+        }
+
+    def record(self, name: str, value: float) -> None:
+        """Add a sample to a histogram."""
+        self.histograms[name].record(value)
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Record the run time of the block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.histograms[name].record(time.perf_counter() - start)
+
+    def as_dict(self) -> dict:
+        """Return a summary of all histograms."""
+        return {name: histogram.as_dict() for name, histogram in self.histograms.items()}
@@ -0,0 +1,108 @@
+"""Rolling in-memory history of Luxtronik calculations."""
+# region Imports
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+from datetime import timedelta
+import math
+import time
+
+from .const import HISTORY_SIZE, THERMAL_WINDOWS
+
+# endregion Imports
+
+
+class LuxtronikHistory:
+    """Ring buffer of the last snapshots of some values with windowed queries.
+
+    Every key has a fixed size array('d'), missing values are stored as NaN
+    and skipped by the queries. Windows end now and reach back the given
+    duration, without a duration the whole buffer is used.
+    """
+
+    def __init__(self, keys: Sequence[str], size: int = HISTORY_SIZE) -> None:
+        """Initialize the buffer for the keys."""
+        self.keys = tuple(keys)
+        self.size = size
+        self._times = array("d", bytes(8 * size))
+        self._values = {key: array("d", bytes(8 * size)) for key in self.keys}
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of snapshots."""
+        return self._count
+
+    def record(self, timestamp: float, values: Sequence[float | bool | None]) -> None:
+        """Store a snapshot, values in the order of the keys."""
+        index = self._next
+        self._times[index] = timestamp
+        for key, value in zip(self.keys, values):
+            self._values[key][index] = math.nan if value is None else float(value)
+        self._next = (index + 1) % self.size
+        self._count = min(self._count + 1, self.size)
+
+    def window(
+        self, key: str, duration: timedelta | None = None, now: float | None = None
+    ) -> tuple[array, array]:
+        """Return the timestamps and values of a key in chronological order."""
+        times = self._chronological(self._times)
+        values = self._chronological(self._values[key])
+        if duration is not None:
+            now = time.time() if now is None else now
+            start = bisect_left(times, now - duration.total_seconds())
+            times, values = times[start:], values[start:]
+        return times, values
+
+    def mean(self, key: str, duration: timedelta | None = None, now: float | None = None) -> float | None:
+        """Return the mean of a key."""
+        values = _valid(self.window(key, duration, now)[1])
+        return math.fsum(values) / len(values) if values else None
+
+    def min(self, key: str, duration: timedelta | None = None, now: float | None = None) -> float | None:
+        """Return the minimum of a key."""
+        values = _valid(self.window(key, duration, now)[1])
+        return min(values) if values else None
+
+    def max(self, key: str, duration: timedelta | None = None, now: float | None = None) -> float | None:
+        """Return the maximum of a key."""
+        values = _valid(self.window(key, duration, now)[1])
+        return max(values) if values else None
+
+    def slope(self, key: str, duration: timedelta | None = None, now: float | None = None) -> float | None:
+        """Return the least squares slope of a key per hour."""
+        times, values = self.window(key, duration, now)
+        points = [(t, v) for t, v in zip(times, values) if not math.isnan(v)]
+        if len(points) < 2:
+            return None
+        mean_t = math.fsum(t for t, _ in points) / len(points)
+        mean_v = math.fsum(v for _, v in points) / len(points)
+        variance = math.fsum((t - mean_t) ** 2 for t, _ in points)
+        if variance == 0:
+            return None
+        covariance = math.fsum((t - mean_t) * (v - mean_v) for t, v in points)
+        return covariance / variance * 3600
+
+    def on_time(self, key: str, duration: timedelta | None = None, now: float | None = None) -> timedelta:
+        """Return how long a key was true, a value holds until the next snapshot."""
+        times, values = self.window(key, duration, now)
+        seconds = math.fsum(
+            times[index + 1] - times[index]
+            for index in range(len(times) - 1)
+            if values[index] and not math.isnan(values[index])
+        )
+        return timedelta(seconds=seconds)
+
+    def _chronological(self, values: array) -> array:
+        if self._count < self.size:
+            return values[:self._count]
+        return values[self._next:] + values[:self._next]
+
+
+def history_size(min_update_interval: timedelta) -> int:
+    """Return the snapshots covering the longest thermal window at a poll interval."""
+    return max(THERMAL_WINDOWS.values()) // min_update_interval + 1
+
+
+def _valid(values: array) -> list[float]:
+    return [value for value in values if not math.isnan(value)]
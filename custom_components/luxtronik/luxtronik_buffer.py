@@ -0,0 +1,77 @@
+"""Preallocated raw value buffers for the Luxtronik tables."""
+# region Imports
+from array import array
+import sys
+from typing import Any, NamedTuple
+
+from .const import LuxGroup
+
+# endregion Imports
+
+
+class LuxtronikKey(NamedTuple):
+    """A luxtronik key resolved to its table position."""
+
+    group: LuxGroup
+    index: int
+    # Datatype object of the luxtronik library holding the converted value.
+    sensor: Any
+    # Number of raw values making up the value (the version string uses several).
+    width: int = 1
+
+
+class LuxtronikRawTable:
+    """Raw values of one table as read from the heatpump.
+
+    The frame is copied into one of two reused arrays and only byteswapped,
+    typed conversion happens on access. The other array keeps the previous
+    frame to detect changed values.
+    """
+
+    def __init__(self, typecode: str) -> None:
+        """Initialize an empty table of big-endian values of typecode."""
+        self.values = array(typecode)
+        self._previous = array(typecode)
+        # Generation each index was last converted from, 0 = never.
+        self.decoded = array("q")
+        self.generation = 0
+
+    def load(self, frame: bytes) -> list[int] | None:
+        """Replace the values with a big-endian frame from the heatpump.
+
+        Return the indices which changed, None if the table size changed.
+        """
+        typecode = self.values.typecode
+        itemsize = self.values.itemsize
+        resized = len(self.values) * itemsize != len(frame)
+        if resized:
+            self._previous = array(typecode, bytes(len(frame)))
+            self.decoded = array("q", bytes(len(self._previous) * self.decoded.itemsize))
+        buffer = self._previous
+        memoryview(buffer).cast("B")[:] = frame
+        if itemsize > 1 and sys.byteorder == "little":
+            buffer.byteswap()
+        self._previous, self.values = self.values, buffer
+        self.generation += 1
+        if resized:
+            self._previous = array(typecode, buffer)
+            return None
+        if buffer == self._previous:
+            return []
+        return [
+            index
+            for index, (value, previous) in enumerate(zip(buffer, self._previous))
+            if value != previous
+        ]
+
+    def frame(self) -> bytes:
+        """Return the values as the big-endian frame they were loaded from."""
+        if self.values.itemsize > 1 and sys.byteorder == "little":
+            values = array(self.values.typecode, self.values)
+            values.byteswap()
+            return values.tobytes()
+        return self.values.tobytes()
+
+    def __len__(self) -> int:
+        """Return the number of values."""
+        return len(self.values)
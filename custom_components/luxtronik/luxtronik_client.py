@@ -0,0 +1,346 @@
+"""Asyncio client for the Luxtronik socket protocol."""
+# region Imports
+import asyncio
+from contextlib import asynccontextmanager
+import random
+import socket
+import struct
+import time
+from typing import AsyncIterator, Final, Iterable, NamedTuple
+
+from .const import (
+    CONF_CALCULATIONS,
+    CONF_PARAMETERS,
+    CONF_VISIBILITIES,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_RETRIES,
+    DEFAULT_WRITE_TIMEOUT,
+    LOGGER,
+)
+from .helpers.metrics import (
+    METRIC_BYTES_RECEIVED,
+    METRIC_CONNECT_TIME,
+    METRIC_READ_TIME,
+    METRIC_WRITE_TIME,
+    LuxtronikMetrics,
+)
+
+# endregion Imports
+
+# region Constants
+LUX_CMD_WRITE_PARAMETER: Final = 3002
+LUX_CMD_READ_PARAMETERS: Final = 3003
+LUX_CMD_READ_CALCULATIONS: Final = 3004
+LUX_CMD_READ_VISIBILITIES: Final = 3005
+LUX_READ_GROUPS: Final = (CONF_PARAMETERS, CONF_CALCULATIONS, CONF_VISIBILITIES)
+
+# The controller silently drops sockets that stay idle for too long.
+CONNECTION_MAX_IDLE_SEC: Final = 60
+# Delay before the first retry of a failed request, doubled for each further one.
+RETRY_DELAY_SEC: Final = 0.2
+# Delays are spread by +-50% so several clients don't retry in lockstep.
+RETRY_JITTER: Final = 0.5
+# Failed requests in a row which open the circuit breaker.
+BREAKER_FAILURE_THRESHOLD: Final = 3
+BREAKER_OPEN_MIN_SEC: Final = 10
+BREAKER_OPEN_MAX_SEC: Final = 300
+# endregion Constants
+
+
+class LuxtronikUnavailableError(ConnectionError):
+    """The circuit breaker is open, no request was sent."""
+
+
+class LuxtronikRequestPolicy(NamedTuple):
+    """Timeouts in seconds per operation and the retries of a failed request."""
+
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT
+    read_timeout: float = DEFAULT_READ_TIMEOUT
+    write_timeout: float = DEFAULT_WRITE_TIMEOUT
+    retries: int = DEFAULT_RETRIES
+
+
+class LuxtronikCircuitBreaker:
+    """Fail fast while the heatpump is down instead of waiting for timeouts.
+
+    Opens after some failed requests in a row. While it is open no request is
+    sent. Afterwards it is half open, exactly one request is let through to
+    probe the heatpump and the others fail fast until the probe succeeded or
+    failed. Every failed probe doubles the open time up to the max.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        open_min_sec: float = BREAKER_OPEN_MIN_SEC,
+        open_max_sec: float = BREAKER_OPEN_MAX_SEC,
+    ) -> None:
+        """Initialize a closed breaker."""
+        self._failure_threshold = failure_threshold
+        self._open_min_sec = open_min_sec
+        self._open_max_sec = open_max_sec
+        self._failures = 0
+        self._open_sec = 0.0
+        self._open_until = 0.0
+        self._probing = False
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds until requests are sent again, 0 if closed."""
+        return max(self._open_until - time.monotonic(), 0.0)
+
+    def check(self) -> bool:
+        """Raise LuxtronikUnavailableError while the breaker is open.
+
+        Return True if the request is the probe of the half open breaker.
+        """
+        if self._failures < self._failure_threshold:
+            return False
+        if (retry_in := self.retry_in) > 0:
+            raise LuxtronikUnavailableError(
+                f"Luxtronik heatpump unavailable, next attempt in {retry_in:.0f}s"
+            )
+        if self._probing:
+            raise LuxtronikUnavailableError(
+                "Luxtronik heatpump unavailable, waiting for the probe request"
+            )
+        self._probing = True
+        return True
+
+    def cancel_probe(self) -> None:
+        """Let the next request probe, the probe was cancelled without a result."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        """Close the breaker."""
+        self._failures = 0
+        self._open_sec = 0.0
+        self._open_until = 0.0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a failed request and open the breaker at the threshold."""
+        self._failures += 1
+        if self._failures < self._failure_threshold or self.retry_in > 0:
+            # Still closed, or already open by another failed request.
+            return
+        self._probing = False
+        self._open_sec = min(max(self._open_sec * 2, self._open_min_sec), self._open_max_sec)
+        self._open_until = time.monotonic() + _jitter(self._open_sec)
+        LOGGER.warning(
+            "Luxtronik heatpump unavailable after %d failed requests, retrying in %.0fs",
+            self._failures,
+            self._open_sec,
+        )
+
+
+def _jitter(seconds: float) -> float:
+    return seconds * random.uniform(1 - RETRY_JITTER, 1 + RETRY_JITTER)
+
+
+class LuxtronikConnection:
+    """One persistent socket to the heatpump."""
+
+    def __init__(self, host: str, port: int) -> None:
+        """Initialize the connection."""
+        self._host = host
+        self._port = port
+        self.reader: asyncio.StreamReader = None
+        self.writer: asyncio.StreamWriter = None
+        self.last_used: float = 0
+
+    @property
+    def is_connected(self) -> bool:
+        """Return True if the socket is open and was used recently."""
+        return (
+            self.writer is not None
+            and not self.writer.is_closing()
+            and not self.reader.at_eof()
+            and time.monotonic() - self.last_used < CONNECTION_MAX_IDLE_SEC
+        )
+
+    async def async_connect(self) -> None:
+        """Open the socket to the heatpump."""
+        self.reader, self.writer = await asyncio.open_connection(self._host, self._port)
+        sock = self.writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        self.last_used = time.monotonic()
+        LOGGER.debug("Connected to Luxtronik heatpump %s:%s", self._host, self._port)
+
+    async def async_close(self) -> None:
+        """Close the socket to the heatpump."""
+        writer = self.writer
+        self.reader = None
+        self.writer = None
+        if writer is None:
+            return
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        LOGGER.debug(
+            "Disconnected from Luxtronik heatpump %s:%s", self._host, self._port
+        )
+
+
+class LuxtronikAsyncClient:
+    """Speak the Luxtronik 2.x TCP protocol with asyncio streams."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        policy: LuxtronikRequestPolicy = LuxtronikRequestPolicy(),
+        pool_size: int = 1,
+        metrics: LuxtronikMetrics | None = None,
+    ) -> None:
+        """Initialize the client."""
+        self._host = host
+        self._port = port
+        self._policy = policy
+        self.metrics = metrics or LuxtronikMetrics()
+        self.breaker = LuxtronikCircuitBreaker()
+        self._connections = [LuxtronikConnection(host, port) for _ in range(pool_size)]
+        self._pool: asyncio.Queue[LuxtronikConnection] = asyncio.Queue()
+        for connection in self._connections:
+            self._pool.put_nowait(connection)
+
+    async def async_disconnect(self) -> None:
+        """Close all pooled sockets to the heatpump."""
+        for connection in self._connections:
+            await connection.async_close()
+
+    async def async_read(
+        self, groups: Iterable[str] = LUX_READ_GROUPS
+    ) -> dict[str, bytes]:
+        """Read the raw big-endian frames of the given groups."""
+        frames = await self._async_request(
+            METRIC_READ_TIME, self._policy.read_timeout, self._read_groups, list(groups)
+        )
+        self.metrics.record(
+            METRIC_BYTES_RECEIVED, sum(len(frame) for frame in frames.values())
+        )
+        return frames
+
+    async def async_write(self, queue: dict[int, int]) -> None:
+        """Write all queued parameters (index -> raw value) to the heatpump."""
+        await self._async_request(
+            METRIC_WRITE_TIME, self._policy.write_timeout, self._write_parameters, queue
+        )
+
+    async def _async_request(self, metric: str, timeout_sec: float, request, *args):
+        """Send a request, retried with growing jittered delays.
+
+        A kept alive socket which went stale is replaced by the retry, too.
+        Writes are safe to retry as they set absolute values. The metric
+        records the time of the successful attempt only, without the
+        connect, failed attempts and delays.
+        """
+        probe = self.breaker.check()
+        try:
+            return await self._async_attempts(metric, timeout_sec, request, *args)
+        except asyncio.CancelledError:
+            if probe:
+                self.breaker.cancel_probe()
+            raise
+
+    async def _async_attempts(self, metric: str, timeout_sec: float, request, *args):
+        attempt = 0
+        while True:
+            try:
+                async with self._connection() as connection:
+                    start = time.perf_counter()
+                    async with asyncio.timeout(timeout_sec):
+                        result = await request(connection, *args)
+                    self.metrics.record(metric, time.perf_counter() - start)
+            except (OSError, asyncio.IncompleteReadError, TimeoutError) as err:
+                if attempt >= self._policy.retries:
+                    self.breaker.record_failure()
+                    raise
+                delay = _jitter(RETRY_DELAY_SEC * 2**attempt)
+                attempt += 1
+                LOGGER.debug(
+                    "Luxtronik request failed (%s), retry %d in %.1fs", err, attempt, delay
+                )
+                await asyncio.sleep(delay)
+                continue
+            self.breaker.record_success()
+            return result
+
+    @asynccontextmanager
+    async def _connection(self) -> AsyncIterator[LuxtronikConnection]:
+        connection = await self._pool.get()
+        try:
+            if not connection.is_connected:
+                await connection.async_close()
+                await self._async_connect(connection)
+            yield connection
+            connection.last_used = time.monotonic()
+        except BaseException:
+            await connection.async_close()
+            raise
+        finally:
+            self._pool.put_nowait(connection)
+
+    async def _async_connect(self, connection: LuxtronikConnection) -> None:
+        with self.metrics.timer(METRIC_CONNECT_TIME):
+            async with asyncio.timeout(self._policy.connect_timeout):
+                await connection.async_connect()
+
+    async def _read_groups(
+        self, connection: LuxtronikConnection, groups: list[str]
+    ) -> dict[str, bytes]:
+        readers = {
+            CONF_PARAMETERS: self._read_parameters,
+            CONF_CALCULATIONS: self._read_calculations,
+            CONF_VISIBILITIES: self._read_visibilities,
+        }
+        return {group: await readers[group](connection) for group in groups}
+
+    async def _write_parameters(
+        self, connection: LuxtronikConnection, queue: dict[int, int]
+    ) -> None:
+        for index, value in queue.items():
+            if not isinstance(index, int) or not isinstance(value, int):
+                LOGGER.warning("Parameter id '%s' or value '%s' invalid!", index, value)
+                continue
+            LOGGER.info("Parameter '%d' set to '%s'", index, value)
+            connection.writer.write(
+                struct.pack(">iii", LUX_CMD_WRITE_PARAMETER, index, value)
+            )
+            await connection.writer.drain()
+            cmd, val = struct.unpack(">ii", await connection.reader.readexactly(8))
+            LOGGER.debug("Command %s value %s", cmd, val)
+
+    async def _send_command(self, connection: LuxtronikConnection, cmd: int) -> None:
+        connection.writer.write(struct.pack(">ii", cmd, 0))
+        await connection.writer.drain()
+        (echo,) = struct.unpack(">i", await connection.reader.readexactly(4))
+        if echo != cmd:
+            raise ConnectionError(f"Unexpected Luxtronik response {echo} for {cmd}")
+
+    async def _read_int(self, connection: LuxtronikConnection) -> int:
+        return struct.unpack(">i", await connection.reader.readexactly(4))[0]
+
+    async def _read_parameters(self, connection: LuxtronikConnection) -> bytes:
+        await self._send_command(connection, LUX_CMD_READ_PARAMETERS)
+        length = await self._read_int(connection)
+        LOGGER.debug("Read %d parameters", length)
+        return await connection.reader.readexactly(4 * length)
+
+    async def _read_calculations(self, connection: LuxtronikConnection) -> bytes:
+        await self._send_command(connection, LUX_CMD_READ_CALCULATIONS)
+        stat = await self._read_int(connection)
+        LOGGER.debug("Stat %s", stat)
+        length = await self._read_int(connection)
+        LOGGER.debug("Read %d calculations", length)
+        return await connection.reader.readexactly(4 * length)
+
+    async def _read_visibilities(self, connection: LuxtronikConnection) -> bytes:
+        await self._send_command(connection, LUX_CMD_READ_VISIBILITIES)
+        length = await self._read_int(connection)
+        LOGGER.debug("Read %d visibilities", length)
+        return await connection.reader.readexactly(length)
@@ -1,84 +1,252 @@
 """Luxtronik device."""
 # region Imports
+import asyncio
+import copy
 import re
-import threading
 import time
+from typing import Any, Final, Iterable, NamedTuple
 
-from homeassistant.util import Throttle
-from luxtronik import Luxtronik as Lux
+from luxtronik.calculations import Calculations
+from luxtronik.datatypes import Unknown
+from luxtronik.parameters import Parameters
+from luxtronik.visibilities import Visibilities
 
 from .const import (
     CONF_CALCULATIONS,
     CONF_PARAMETERS,
-    CONF_VISIBILITIES,
+    HISTORY_KEYS,
+    HISTORY_SIZE,
     LOGGER,
+    LUX_CALCULATIONS_VERSION_LENGTH,
+    LUX_CALCULATIONS_VERSION_RANGE,
     LUX_DETECT_SOLAR_SENSOR,
     LUX_MK_SENSORS,
+    LuxGroup,
     LuxMkTypes,
-    MIN_TIME_BETWEEN_UPDATES,
 )
-from .helpers.debounce import debounce
 from .helpers.lux_helper import get_manufacturer_by_model
+from .helpers.metrics import METRIC_DECODE_TIME, METRIC_LOCK_WAIT_TIME, LuxtronikMetrics
+from .history import LuxtronikHistory
+from .luxtronik_buffer import LuxtronikKey, LuxtronikRawTable
+from .luxtronik_client import (
+    LuxtronikAsyncClient,
+    LuxtronikCircuitBreaker,
+    LuxtronikRequestPolicy,
+)
+from .read_planner import LuxtronikReadPlanner
 
 # endregion Imports
 
+# Values the library has no name for, e.g. parameters.Unknown_Parameter_1136.
+UNKNOWN_KEY: Final = re.compile(r"Unknown_[A-Za-z]+_(\d+)")
+# Names of these values per LuxGroup, as the library parse gives them.
+UNKNOWN_NAMES: Final = ("Unknown_Parameter_{}", "Unknown_Calculation_{}", "Unknown_Parameter_{}")
+
+
+class LuxtronikWriteMismatch(NamedTuple):
+    """A written parameter the heatpump read back with another value."""
+
+    parameter: str
+    written: Any
+    read: Any
+
+
+class LuxtronikCapabilities(NamedTuple):
+    """Device facts derived from the values, see LuxtronikDevice.capabilities."""
+
+    cooling_mk: tuple[str, ...]
+    solar_present: bool
+    second_heat_generator: bool
+    domestic_water_circulation_pump: bool
+    firmware_version_minor: int
+
+
+def _affects_capabilities(group: LuxGroup, changed: list[int] | None) -> bool:
+    """Return if changed values of a group make the capabilities stale."""
+    if changed is None:
+        return True
+    if group == LuxGroup.parameters:
+        return len(changed) > 0
+    if group == LuxGroup.calculations:
+        return any(index in LUX_CALCULATIONS_VERSION_RANGE for index in changed)
+    return False
+
 
 class LuxtronikDevice:
     """Handle all communication with Luxtronik."""
-    __ignore_update = False
 
-    def __init__(self, host: str, port: int, safe: bool, lock_timeout_sec: int) -> None:
-        """Initialize the Luxtronik connection."""
-        self.lock = threading.Lock()
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        safe: bool,
+        lock_timeout_sec: int,
+        pool_size: int = 1,
+        policy: LuxtronikRequestPolicy = LuxtronikRequestPolicy(),
+        history_size: int = HISTORY_SIZE,
+    ) -> None:
+        """Initialize the Luxtronik connection, nothing is read before async_read.
+
+        The lock timeout limits the wait for other reads and writes, the policy
+        the requests to the heatpump. The history keeps history_size snapshots.
+        """
+        self._async_lock = asyncio.Lock()
+        self._async_write_lock = asyncio.Lock()
 
         self._host = host
         self._port = port
         self._lock_timeout_sec = lock_timeout_sec
-        self._luxtronik = Lux(host, port, safe)
-        self.update()
+        self.metrics = LuxtronikMetrics()
+        self._client = LuxtronikAsyncClient(
+            host, port, policy, pool_size, self.metrics
+        )
+        self._read_planner = LuxtronikReadPlanner()
+        # Indexed by LuxGroup.
+        self._lux_tables = [Parameters(safe=safe), Calculations(), Visibilities()]
+        for group, lux_table in zip(LuxGroup, self._lux_tables):
+            # The library keeps the datatypes, values included, in class attributes.
+            setattr(
+                lux_table,
+                group.name,
+                {index: copy.copy(item) for index, item in getattr(lux_table, group.name).items()},
+            )
+        self._raw_tables = [
+            LuxtronikRawTable("i"),
+            LuxtronikRawTable("i"),
+            LuxtronikRawTable("b"),
+        ]
+        self._keys: dict[str, LuxtronikKey] = {}
+        # Changed (group, index) since the last pop_changes, None = everything.
+        self._changes: set[tuple[LuxGroup, int]] | None = set()
+        self._capabilities: LuxtronikCapabilities | None = None
+        # Raw values of written parameters shown until they are read back.
+        self._optimistic: dict[tuple[LuxGroup, int], int] = {}
+        # Optimistic values sent to the heatpump with the generation of their
+        # write, confirmed by the next read started after that write.
+        self._written: dict[tuple[LuxGroup, int], int] = {}
+        self._write_generation = 0
+        self._write_mismatches: list[LuxtronikWriteMismatch] = []
+        self.history = LuxtronikHistory(HISTORY_KEYS, history_size)
+        self._history_keys = [self.register_key(key) for key in HISTORY_KEYS]
 
     @staticmethod
-    def connect(host: str, port: int):
-        """Connect to heatpump."""
-        return LuxtronikDevice(host, port, False, 30)
+    async def async_connect(host: str, port: int) -> "LuxtronikDevice":
+        """Connect to heatpump and read all values once."""
+        device = LuxtronikDevice(host, port, False, 30)
+        try:
+            await device.async_read()
+        finally:
+            await device.async_disconnect()
+        return device
+
+    @property
+    def host(self) -> str:
+        """Return the host of the heatpump."""
+        return self._host
+
+    @property
+    def circuit_breaker(self) -> LuxtronikCircuitBreaker:
+        """Return the circuit breaker of the requests to the heatpump."""
+        return self._client.breaker
 
     async def async_will_remove_from_hass(self):
         """Disconnect from Luxtronik by stopping monitor."""
-        self.disconnect()
+        await self.async_disconnect()
+
+    async def async_disconnect(self):
+        """Close the persistent connections to Luxtronik."""
+        await self._client.async_disconnect()
+
+    def register_key(self, group_sensor_id: str | None) -> LuxtronikKey | None:
+        """Register a luxtronik key used by an entity and return its handle.
+
+        The group of the key gets polled, see LuxtronikReadPlanner.
+        """
+        self._read_planner.register_key(group_sensor_id)
+        return self.resolve_key(group_sensor_id)
+
+    def resolve_key(self, group_sensor_id: str | None) -> LuxtronikKey | None:
+        """Resolve a key like calculations.ID_WEB_Temperatur_TVL once to a handle.
 
-    def disconnect(self):
-        """Disconnect from Luxtronik. - Nothing todo - disconnected after every read!"""
-        pass
+        Unknown keys are not remembered, they are looked up (and logged) again.
+        """
+        if not group_sensor_id:
+            return None
+        try:
+            return self._keys[group_sensor_id]
+        except KeyError:
+            pass
+        group, _, sensor_id = group_sensor_id.partition(".")
+        key = self._resolve_key(group, sensor_id) if sensor_id else None
+        if key is not None:
+            self._keys[group_sensor_id] = key
+        return key
 
-    def get_value(self, group_sensor_id: str):
-        """Get a sensor value from Luxtronik."""
-        sensor = self.get_sensor_by_id(group_sensor_id)
+    def _resolve_key(self, group: str, sensor_id: str) -> LuxtronikKey | None:
+        try:
+            lux_group = LuxGroup[group]
+        except KeyError:
+            return None
+        lux_table = self._lux_tables[lux_group]
+        items = getattr(lux_table, group)
+        sensor = None
+        if (match := UNKNOWN_KEY.fullmatch(sensor_id)) and int(match[1]) not in items:
+            # The library only adds them while parsing, there is no parse any more.
+            # The value stays None until a frame that long is read.
+            sensor = items[int(match[1])] = Unknown(sensor_id)
+        else:
+            try:
+                sensor = lux_table.get(sensor_id)
+            except Exception as err:
+                LOGGER.warning(f"Sensor id not found: {group}.{sensor_id}", err, exc_info=True)
         if sensor is None:
             return None
-        return sensor.value
+        index = next(index for index, item in items.items() if item is sensor)
+        return self._key(lux_group, index, sensor)
+
+    def _key(self, group: LuxGroup, index: int, sensor) -> LuxtronikKey:
+        width = 1
+        if group == LuxGroup.calculations and index in LUX_CALCULATIONS_VERSION_RANGE:
+            width = LUX_CALCULATIONS_VERSION_LENGTH
+        return LuxtronikKey(group, index, sensor, width)
+
+    def get_value(self, key: str | LuxtronikKey | None):
+        """Get a sensor value from Luxtronik by key or resolved handle."""
+        if not isinstance(key, LuxtronikKey):
+            key = self.resolve_key(key)
+            if key is None:
+                return None
+        return self._decode(key).value
 
     def get_sensor_by_id(self, group_sensor_id: str):
         """Get a sensor object by id from Luxtronik."""
-        try:
-            group = group_sensor_id.split(".")[0]
-            sensor_id = group_sensor_id.split(".")[1]
-            return self.get_sensor(group, sensor_id)
-        except IndexError as error:
-            LOGGER.critical(group_sensor_id, error, exc_info=True)
+        key = self.resolve_key(group_sensor_id)
+        if key is None:
+            return None
+        return self._decode(key)
 
     def get_sensor(self, group, sensor_id):
         """Get sensor by configured sensor ID."""
-        sensor = None
-        try:
-            if group == CONF_PARAMETERS:
-                sensor = self._luxtronik.parameters.get(sensor_id)
-            if group == CONF_CALCULATIONS:
-                sensor = self._luxtronik.calculations.get(sensor_id)
-            if group == CONF_VISIBILITIES:
-                sensor = self._luxtronik.visibilities.get(sensor_id)
-        except Exception as err:
-            LOGGER.warning(f"Sensor id not found: {group}.{sensor_id}", err, exc_info=True)
-        return sensor
+        return self.get_sensor_by_id(f"{group}.{sensor_id}")
+
+    def _decode(self, key: LuxtronikKey):
+        """Convert the raw value of a sensor if a newer frame was read."""
+        table = self._raw_tables[key.group]
+        index = key.index
+        if self._optimistic and (key.group, index) in self._optimistic:
+            key.sensor.value = key.sensor.from_heatpump(self._optimistic[key.group, index])
+            if index < len(table):
+                # Convert the table value again once the write is confirmed.
+                table.decoded[index] = 0
+            return key.sensor
+        if index < len(table) and table.decoded[index] != table.generation:
+            if key.width == 1:
+                raw = table.values[index]
+            else:
+                raw = table.values[index:index + key.width].tolist()
+            key.sensor.value = key.sensor.from_heatpump(raw)
+            table.decoded[index] = table.generation
+        return key.sensor
 
     @property
     def serial_number(self) -> str:
@@ -112,65 +280,95 @@ class LuxtronikDevice:
     @property
     def firmware_version_minor(self) -> int:
         """Return the heatpump firmware minor version."""
-        ver = self.firmware_version
-        if ver is None:
-            return 0
-        return int(re.search(r'\d+', ver.split('.')[1]).group(0))
+        return self.capabilities.firmware_version_minor
 
     @property
     def has_second_heat_generator(self) -> bool:
         """Is second heat generator activated 1=electrical heater"""
+        return self.capabilities.second_heat_generator
+
+    @property
+    def has_domestic_water_circulation_pump(self) -> bool:
+        """Exists a domestic water circulation pump. If not it is a domestic water charging pump"""
+        return self.capabilities.domestic_water_circulation_pump
+
+    @property
+    def capabilities(self) -> LuxtronikCapabilities:
+        """Return the capabilities, detected again after the parameters changed."""
+        if self._capabilities is None:
+            self._capabilities = self._detect_capabilities()
+        return self._capabilities
+
+    def _detect_capabilities(self) -> LuxtronikCapabilities:
+        capabilities = LuxtronikCapabilities(
+            cooling_mk=self._detect_cooling_Mk(),
+            solar_present=self._detect_solar_present(),
+            second_heat_generator=self._detect_second_heat_generator(),
+            domestic_water_circulation_pump=self._detect_domestic_water_circulation_pump(),
+            firmware_version_minor=self._detect_firmware_version_minor(),
+        )
+        LOGGER.info("Capabilities = %s", capabilities)
+        return capabilities
+
+    def _detect_firmware_version_minor(self) -> int:
+        ver = self.firmware_version
+        try:
+            return int(re.search(r'\d+', ver.split('.')[1]).group(0))
+        except (AttributeError, IndexError):
+            return 0
+
+    def _detect_second_heat_generator(self) -> bool:
         try:
-            self.read()
             return int(self.get_value('parameters.ID_Einst_ZWE1Art_akt')) > 0
             # ID_Einst_ZWE1Fkt_akt = 1 --> Heating and domestic water
         except Exception:
             return False
 
-    @property
-    def has_domestic_water_circulation_pump(self) -> bool:
-        """Exists a domestic water circulation pump. If not it is a domestic water charging pump"""
+    def _detect_domestic_water_circulation_pump(self) -> bool:
         try:
-            self.read()
             return int(self.get_value('parameters.ID_Einst_BWZIP_akt')) != 1
         except Exception:
             return False
 
-    def detect_cooling_Mk(self):
-        """ returns list of parameters that are may show cooling is enabled """
+    def _detect_cooling_Mk(self) -> tuple[str, ...]:
         coolingMk = []
         for Mk in LUX_MK_SENSORS:
             sensor_value = self.get_value(Mk)
-            # LOGGER.info(f"{Mk} = {sensor_value}")
             if sensor_value in [LuxMkTypes.cooling.value,
                                 LuxMkTypes.heating_cooling.value]:
                 coolingMk = coolingMk + [Mk]
+        return tuple(coolingMk)
 
-        LOGGER.info(f"CoolingMk = {coolingMk}")
-        return coolingMk
+    def _detect_solar_present(self) -> bool:
+        try:
+            return (
+                bool(self.get_value(LUX_DETECT_SOLAR_SENSOR))
+                or self.get_value("parameters.ID_BSTD_Solar") > 0.01
+                or
+                (bool(self.get_value("visibilities.ID_Visi_Temp_Solarkoll"))
+                 and float(self.get_value("calculations.ID_WEB_Temperatur_TSK"))
+                 != 5.0
+                 )
+                or
+                (bool(self.get_value("visibilities.ID_Visi_Temp_Solarsp"))
+                 and float(self.get_value("calculations.ID_WEB_Temperatur_TSS"))
+                 != 150.0
+                 )
+            )
+        except TypeError:
+            return False
+
+    def detect_cooling_Mk(self):
+        """ returns list of parameters that are may show cooling is enabled """
+        return list(self.capabilities.cooling_mk)
 
     def detect_solar_present(self) -> bool:
         """Detect and returns True if solar is present."""
-        return (
-            bool(self.get_value(LUX_DETECT_SOLAR_SENSOR))
-            or self.get_value("parameters.ID_BSTD_Solar") > 0.01
-            or
-            (bool(self.get_value("visibilities.ID_Visi_Temp_Solarkoll"))
-             and float(self.get_value("calculations.ID_WEB_Temperatur_TSK"))
-             != 5.0
-             )
-            or
-            (bool(self.get_value("visibilities.ID_Visi_Temp_Solarsp"))
-             and float(self.get_value("calculations.ID_WEB_Temperatur_TSS"))
-             != 150.0
-             )
-        )
+        return self.capabilities.solar_present
 
     def detect_cooling_present(self):
         """ returns True if Cooling is present """
-        CoolingPresent = (len(self.detect_cooling_Mk()) > 0)
-        LOGGER.info(f"CoolingPresent = {CoolingPresent}")
-        return CoolingPresent
+        return len(self.capabilities.cooling_mk) > 0
 
     def detect_cooling_target_temperature_sensor(self):
         """ if only 1 MK parameter related to cooling is returned
@@ -184,70 +382,208 @@ class LuxtronikDevice:
         LOGGER.info(f"cooling_target_temperature_sensor = '{cooling_target_temperature_sensor}' ")
         return cooling_target_temperature_sensor
 
-    def write(
-        self, parameter, value, use_debounce=True, update_immediately_after_write=False
-    ):
-        """Write a parameter to the Luxtronik heatpump."""
-        self.__ignore_update = True
-        if use_debounce:
-            self.__write_debounced(parameter, value, update_immediately_after_write)
-        else:
-            self.__write(parameter, value, update_immediately_after_write)
+    def set_optimistic(self, parameters: dict[str, Any]) -> set[tuple[LuxGroup, int]]:
+        """Show parameters with their new values until they are read back.
+
+        Return the (group, index) of the values shown differently now.
+        """
+        lux_parameters: Parameters = self._lux_tables[LuxGroup.parameters]
+        changes = set()
+        for parameter, value in parameters.items():
+            key = self.resolve_key(f"{CONF_PARAMETERS}.{parameter}")
+            if key is None or (lux_parameters.safe and not key.sensor.writeable):
+                continue
+            raw = key.sensor.to_heatpump(value)
+            if not isinstance(raw, int):
+                continue
+            position = (key.group, key.index)
+            self._optimistic[position] = raw
+            self._written.pop(position, None)
+            changes.add(position)
+        self._mark_changed(changes)
+        return changes
+
+    def discard_optimistic(self, parameters: Iterable[str]) -> set[tuple[LuxGroup, int]]:
+        """Show the read values of parameters again, e.g. after a failed write."""
+        changes = {
+            position
+            for position in self._parameter_positions(parameters)
+            if self._optimistic.pop(position, None) is not None
+        }
+        for position in changes:
+            self._written.pop(position, None)
+        self._mark_changed(changes)
+        return changes
 
-    @debounce(3)
-    def __write_debounced(self, parameter, value, update_immediately_after_write):
-        self.__write(parameter, value, update_immediately_after_write)
+    def pop_write_mismatches(self) -> list[LuxtronikWriteMismatch]:
+        """Return the written parameters read back with another value."""
+        mismatches, self._write_mismatches = self._write_mismatches, []
+        return mismatches
 
-    def __write(self, parameter, value, update_immediately_after_write):
+    async def async_write_batch(self, parameters: dict[str, Any]) -> None:
+        """Write parameters to the Luxtronik heatpump in one locked transaction.
+
+        Raise TimeoutError if another write holds the lock for too long. The
+        caller discards the optimistic values of a failed write.
+        """
+        if not await self._async_acquire_lock(self._async_write_lock):
+            raise TimeoutError(
+                f"Couldn't write luxtronik parameters {parameters} because of lock timeout {self._lock_timeout_sec}"
+            )
+        lux_parameters: Parameters = self._lux_tables[LuxGroup.parameters]
         try:
-            # TODO: change to "with"
-            # with self.lock.acquire_timeout(self._lock_timeout_sec) as lock_result:
-            if self.lock.acquire(blocking=True, timeout=self._lock_timeout_sec):
-                LOGGER.info(
-                    'LuxtronikDevice.write %s value: "%s" - %s',
-                    parameter,
-                    value,
-                    update_immediately_after_write,
-                )
-                self._luxtronik.parameters.set(parameter, value)
-                self._luxtronik.write()
-            else:
-                LOGGER.warning(
-                    "Couldn't write luxtronik parameter %s with value %s because of lock timeout %s",
-                    parameter,
-                    value,
-                    self._lock_timeout_sec,
+            LOGGER.info("LuxtronikDevice.async_write_batch %s", parameters)
+            for parameter, value in parameters.items():
+                lux_parameters.set(parameter, value)
+            sent = lux_parameters.queue
+            try:
+                await self._client.async_write(sent)
+            finally:
+                lux_parameters.queue = {}
+                self._read_planner.mark_dirty(CONF_PARAMETERS)
+            # A value changed again meanwhile is confirmed by its own write.
+            self._write_generation += 1
+            self._written.update(
+                (position, self._write_generation)
+                for position in self._parameter_positions(parameters)
+                if position in self._optimistic
+                and self._optimistic[position] == sent.get(position[1])
+            )
+        finally:
+            self._async_write_lock.release()
+
+    def _parameter_positions(self, parameters: Iterable[str]) -> set[tuple[LuxGroup, int]]:
+        keys = (self.resolve_key(f"{CONF_PARAMETERS}.{parameter}") for parameter in parameters)
+        return {(key.group, key.index) for key in keys if key is not None}
+
+    def _mark_changed(self, changes: set[tuple[LuxGroup, int]]) -> None:
+        if self._changes is not None:
+            self._changes.update(changes)
+
+    def _confirm_written(self, write_generation: int) -> None:
+        """Compare the parameters written up to write_generation with the values read back.
+
+        A read started before a write finished, e.g. on another pooled
+        connection, may still hold the old values of that write.
+        """
+        table = self._raw_tables[LuxGroup.parameters]
+        lux_parameters: Parameters = self._lux_tables[LuxGroup.parameters]
+        confirmed = {
+            position
+            for position, generation in self._written.items()
+            if generation <= write_generation
+        }
+        for position in confirmed:
+            del self._written[position]
+            written = self._optimistic.pop(position)
+            _, index = position
+            read = table.values[index] if index < len(table) else None
+            if read != written:
+                sensor = lux_parameters.parameters[index]
+                self._write_mismatches.append(
+                    LuxtronikWriteMismatch(
+                        sensor.name,
+                        sensor.from_heatpump(written),
+                        None if read is None else sensor.from_heatpump(read),
+                    )
                 )
+            if index < len(table):
+                table.decoded[index] = 0
+        self._mark_changed(confirmed)
+
+    async def async_read(self, groups: list[str] | None = None):
+        """Get the data from Luxtronik without blocking the event loop.
+
+        Without groups, the groups due according to the read planner are read.
+        Raise TimeoutError if another read holds the lock for too long.
+        """
+        if not await self._async_acquire_lock(self._async_lock):
+            # Not a successful poll, the values are as old as before.
+            raise TimeoutError(
+                f"Couldn't read luxtronik data because of lock timeout {self._lock_timeout_sec}"
+            )
+        if groups is None:
+            groups = self._read_planner.plan()
+        write_generation = self._write_generation
+        try:
+            data = await self._client.async_read(groups)
+        except BaseException:
+            self._read_planner.mark_failed(groups)
+            raise
         finally:
-            self.lock.release()
-            if update_immediately_after_write:
-                time.sleep(3)
-                self.read()
-            self.__ignore_update = False
-            LOGGER.info(
-                'LuxtronikDevice.write finished %s value: "%s" - %s',
-                parameter,
-                value,
-                update_immediately_after_write,
+            self._async_lock.release()
+        self._read_planner.mark_read(groups)
+        with self.metrics.timer(METRIC_DECODE_TIME):
+            self._load_frames(
+                {LuxGroup[group]: frame for group, frame in data.items()}, write_generation
             )
+            if CONF_CALCULATIONS in data:
+                self.history.record(
+                    time.time(), [self.get_value(key) for key in self._history_keys]
+                )
+
+    def snapshot(self) -> dict[LuxGroup, bytes]:
+        """Return the raw frames of all tables read so far."""
+        return {
+            group: table.frame()
+            for group, table in zip(LuxGroup, self._raw_tables)
+            if len(table)
+        }
+
+    def load_snapshot(self, frames: dict[LuxGroup, bytes]) -> bool:
+        """Load the values of a snapshot, e.g. before the first read after a restart.
+
+        The groups are still read on the next poll. Return False if the
+        snapshot does not contain all tables or a frame is malformed.
+        """
+        if set(frames) != set(LuxGroup) or any(
+            not frame or len(frame) % self._raw_tables[group].values.itemsize
+            for group, frame in frames.items()
+        ):
+            return False
+        self._load_frames(frames)
+        return True
+
+    def _load_frames(
+        self, frames: dict[LuxGroup, bytes], write_generation: int | None = None
+    ) -> None:
+        """Load the frames, a read passes the write generation from its start."""
+        for group, frame in frames.items():
+            changed = self._raw_tables[group].load(frame)
+            if self._capabilities is not None and _affects_capabilities(group, changed):
+                self._capabilities = None
+            if changed is None:
+                self._changes = None
+            elif self._changes is not None:
+                self._changes.update((group, index) for index in changed)
+            if group == LuxGroup.parameters and self._written and write_generation is not None:
+                self._confirm_written(write_generation)
 
-    @Throttle(MIN_TIME_BETWEEN_UPDATES)
-    def update(self):
-        """Update sensor values."""
-        if self.__ignore_update:
-            return
-        self.read()
+    def dump(self, group: LuxGroup) -> dict[int, Any]:
+        """Return the datatypes of a table with the values read last, e.g. for diagnostics."""
+        items = getattr(self._lux_tables[group], group.name)
+        dump = {}
+        for index in range(len(self._raw_tables[group])):
+            sensor = items.get(index)
+            if sensor is None:
+                if group == LuxGroup.calculations and index in LUX_CALCULATIONS_VERSION_RANGE:
+                    # Part of the firmware version.
+                    continue
+                sensor = items[index] = Unknown(UNKNOWN_NAMES[group].format(index))
+            dump[index] = self._decode(self._key(group, index, sensor))
+        return dump
 
-    def read(self):
-        """Get the data from Luxtronik."""
+    def pop_changes(self) -> set[tuple[LuxGroup, int]] | None:
+        """Return the values changed by reads since the last call, None = all."""
+        changes = self._changes
+        self._changes = set()
+        return changes
+
+    async def _async_acquire_lock(self, lock: asyncio.Lock) -> bool:
         try:
-            # TODO: change to "with"
-            if self.lock.acquire(blocking=True, timeout=self._lock_timeout_sec):
-                self._luxtronik.read()
-            else:
-                LOGGER.warning(
-                    "Couldn't read luxtronik data because of lock timeout %s",
-                    self._lock_timeout_sec,
-                )
-        finally:
-            self.lock.release()
+            with self.metrics.timer(METRIC_LOCK_WAIT_TIME):
+                async with asyncio.timeout(self._lock_timeout_sec):
+                    await lock.acquire()
+        except TimeoutError:
+            return False
+        return True
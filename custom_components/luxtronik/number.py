@@ -8,16 +8,16 @@ from homeassistant.components.sensor import ENTITY_ID_FORMAT, SensorDeviceClass,
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import PERCENTAGE, UnitOfTemperature, UnitOfTime
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.typing import ConfigType
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from . import LuxtronikDevice
+from . import get_entry_data
 from .const import (ATTR_EXTRA_STATE_ATTRIBUTE_LAST_THERMAL_DESINFECTION,
                     ATTR_EXTRA_STATE_ATTRIBUTE_LUXTRONIK_KEY,
-                    DOMAIN, LOGGER,
+                    LOGGER,
                     LUX_SENSOR_COOLING_START_DELAY,
                     LUX_SENSOR_COOLING_STOP_DELAY,
                     LUX_SENSOR_COOLING_THRESHOLD,
@@ -32,6 +32,7 @@ from .const import (ATTR_EXTRA_STATE_ATTRIBUTE_LAST_THERMAL_DESINFECTION,
                     LUX_SENSOR_HEATING_TARGET_CORRECTION,
                     LUX_SENSOR_HEATING_THRESHOLD_TEMPERATURE,
                     LUX_SENSOR_PUMP_OPTIMIZATION_TIME)
+from .coordinator import LuxtronikCoordinator
 from .helpers.helper import get_sensor_text
 
 # endregion Imports
@@ -55,29 +56,31 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up a Luxtronik number from ConfigEntry."""
-    luxtronik: LuxtronikDevice = hass.data.get(DOMAIN)
-    if not luxtronik:
+    entry_data = get_entry_data(hass, config_entry.entry_id)
+    if not entry_data:
         LOGGER.warning("number.async_setup_entry no luxtronik!")
         return False
+    luxtronik = entry_data.luxtronik
+    coordinator = entry_data.coordinator
 
     # Build Sensor names with local language:
     lang = hass.config.language
 
-    deviceInfo = hass.data[f"{DOMAIN}_DeviceInfo"]
+    deviceInfo = entry_data.device_info
     entities = [
     ]
     if luxtronik.has_second_heat_generator or True:
         text_release_second_heat_generator = get_sensor_text(lang, 'release_second_heat_generator')
         entities = [
             LuxtronikNumber(
-                luxtronik, deviceInfo,
+                coordinator, deviceInfo,
                 number_key='parameters.ID_Einst_ZWEFreig_akt',
                 unique_id='release_second_heat_generator', name=text_release_second_heat_generator,
                 icon='mdi:download-lock',
                 min_value=-20.0, max_value=20.0, step=0.1,
                 entity_category=EntityCategory.CONFIG, factor=0.1),
             LuxtronikNumber(
-                luxtronik, deviceInfo,
+                coordinator, deviceInfo,
                 number_key='parameters.ID_Einst_Freigabe_Zeit_ZWE',
                 unique_id='release_time_second_heat_generator', name=text_release_second_heat_generator,
                 icon='mdi:timer-play', unit_of_measurement=UnitOfTime.MINUTES,
@@ -85,7 +88,7 @@ async def async_setup_entry(
                 entity_category=EntityCategory.CONFIG),
         ]
 
-    deviceInfoHeating = hass.data[f"{DOMAIN}_DeviceInfo_Heating"]
+    deviceInfoHeating = entry_data.device_info_heating
     if deviceInfoHeating is not None:
         text_heating_threshold = get_sensor_text(lang, 'heating_threshold')
         text_correction = get_sensor_text(lang, 'correction')
@@ -100,77 +103,77 @@ async def async_setup_entry(
         text_heating_maximum_circulation_pump_speed = get_sensor_text(lang, 'heating_maximum_circulation_pump_speed')
         entities += [
             LuxtronikNumber(
-                luxtronik, deviceInfoHeating,
+                coordinator, deviceInfoHeating,
                 number_key=LUX_SENSOR_HEATING_TARGET_CORRECTION,
                 unique_id='heating_target_correction', name=f"{text_correction}",
                 icon='mdi:plus-minus-variant',
                 min_value=-5.0, max_value=5.0, step=0.1,
                 mode=NumberMode.BOX, entity_category=None),
             LuxtronikNumber(
-                luxtronik, deviceInfoHeating,
+                coordinator, deviceInfoHeating,
                 number_key=LUX_SENSOR_PUMP_OPTIMIZATION_TIME,
                 unique_id='pump_optimization_time', name=text_pump_optimization_time,
                 icon='mdi:timer-settings', unit_of_measurement=UnitOfTime.MINUTES,
                 min_value=5, max_value=180, step=5,
                 entity_category=EntityCategory.CONFIG),
             LuxtronikNumber(
-                luxtronik, deviceInfoHeating,
+                coordinator, deviceInfoHeating,
                 number_key=LUX_SENSOR_HEATING_THRESHOLD_TEMPERATURE,
                 unique_id='heating_threshold_temperature', name=f"{text_heating_threshold}",
                 icon='mdi:download-outline',
                 min_value=5.0, max_value=30.0, step=0.5,
                 mode=NumberMode.BOX, entity_category=EntityCategory.CONFIG),
             LuxtronikNumber(
-                luxtronik, deviceInfoHeating,
+                coordinator, deviceInfoHeating,
                 number_key=LUX_SENSOR_HEATING_MIN_FLOW_OUT_TEMPERATURE,
                 unique_id='heating_min_flow_out_temperature', name=f"{text_min_flow_out_temperature}",
                 icon='mdi:waves-arrow-left',
                 min_value=5.0, max_value=30.0, step=0.5, factor=0.1,
                 mode=NumberMode.BOX, entity_category=EntityCategory.CONFIG),
             LuxtronikNumber(
-                luxtronik, deviceInfoHeating,
+                coordinator, deviceInfoHeating,
                 number_key=LUX_SENSOR_HEATING_CIRCUIT_CURVE1_TEMPERATURE,
                 unique_id='heating_circuit_curve1_temperature', name=f"{text_heating_circuit_curve1_temperature}",
                 icon='mdi:chart-bell-curve',
                 min_value=20.0, max_value=70.0, step=0.5,
                 mode=NumberMode.BOX, entity_category=EntityCategory.CONFIG),
             LuxtronikNumber(
-                luxtronik, deviceInfoHeating,
+                coordinator, deviceInfoHeating,
                 number_key=LUX_SENSOR_HEATING_CIRCUIT_CURVE2_TEMPERATURE,
                 unique_id='heating_circuit_curve2_temperature', name=f"{text_heating_circuit_curve2_temperature}",
                 icon='mdi:chart-bell-curve',
                 min_value=5.0, max_value=35.0, step=0.5,
                 mode=NumberMode.BOX, entity_category=EntityCategory.CONFIG),
             LuxtronikNumber(
-                luxtronik, deviceInfoHeating,
+                coordinator, deviceInfoHeating,
                 number_key=LUX_SENSOR_HEATING_CIRCUIT_CURVE_NIGHT_TEMPERATURE,
                 unique_id='heating_circuit_curve_night_temperature', name=f"{text_heating_circuit_curve_night_temperature}",
                 icon='mdi:chart-bell-curve',
                 min_value=-15.0, max_value=10.0, step=0.5,
                 mode=NumberMode.BOX, entity_category=EntityCategory.CONFIG),
             LuxtronikNumber(
-                luxtronik, deviceInfoHeating,
+                coordinator, deviceInfoHeating,
                 number_key='parameters.ID_Einst_TAbsMin_akt',
                 unique_id='heating_night_lowering_to_temperature', name=f"{text_heating_night_lowering_to_temperature}",
                 icon='mdi:thermometer-low',
                 min_value=-20.0, max_value=10.0, step=0.5,
                 mode=NumberMode.BOX, entity_category=EntityCategory.CONFIG, factor=0.1),
             LuxtronikNumber(
-                luxtronik, deviceInfoHeating,
+                coordinator, deviceInfoHeating,
                 number_key='parameters.ID_Einst_HRHyst_akt',
                 unique_id='heating_hysteresis', name=text_heating_hysteresis,
                 icon='mdi:thermometer', unit_of_measurement=UnitOfTemperature.KELVIN,
                 min_value=0.5, max_value=6.0, step=0.1,
                 mode=NumberMode.BOX, entity_category=EntityCategory.CONFIG, factor=0.1),
             LuxtronikNumber(
-                luxtronik, deviceInfoHeating,
+                coordinator, deviceInfoHeating,
                 number_key='parameters.ID_Einst_TRErhmax_akt',
                 unique_id='heating_max_flow_out_increase_temperature', name=text_heating_max_flow_out_increase_temperature,
                 icon='mdi:thermometer', unit_of_measurement=UnitOfTemperature.KELVIN,
                 min_value=1.0, max_value=7.0, step=0.1,
                 mode=NumberMode.BOX, entity_category=EntityCategory.CONFIG, factor=0.1),
             LuxtronikNumber(
-                luxtronik, deviceInfoHeating,
+                coordinator, deviceInfoHeating,
                 number_key=LUX_SENSOR_HEATING_MAXIMUM_CIRCULATION_PUMP_SPEED,
                 unique_id='heating_maximum_circulation_pump_speed', name=text_heating_maximum_circulation_pump_speed,
                 icon='mdi:speedometer', unit_of_measurement=PERCENTAGE,
@@ -187,13 +190,13 @@ async def async_setup_entry(
             text_heating_room_temperature_impact_factor = get_sensor_text(lang, 'heating_room_temperature_impact_factor')
             entities += [
                 LuxtronikNumber(
-                    luxtronik, deviceInfoHeating,
+                    coordinator, deviceInfoHeating,
                     number_key=LUX_SENSOR_HEATING_ROOM_TEMPERATURE_IMPACT_FACTOR,
                     unique_id='heating_room_temperature_impact_factor', name=f"{text_heating_room_temperature_impact_factor}",
                     icon='mdi:thermometer-chevron-up', unit_of_measurement=PERCENTAGE, min_value=0, max_value=200, step=10, mode=NumberMode.BOX, entity_category=EntityCategory.CONFIG),
             ]
 
-    deviceInfoDomesticWater = hass.data[f"{DOMAIN}_DeviceInfo_Domestic_Water"]
+    deviceInfoDomesticWater = entry_data.device_info_domestic_water
     if deviceInfoDomesticWater is not None:
         text_target = get_sensor_text(lang, 'target')
         text_domestic_water = get_sensor_text(lang, 'domestic_water')
@@ -201,21 +204,21 @@ async def async_setup_entry(
         text_domestic_water_hysteresis = get_sensor_text(lang, 'domestic_water_hysteresis')
         entities += [
             LuxtronikNumber(
-                luxtronik, deviceInfoDomesticWater,
+                coordinator, deviceInfoDomesticWater,
                 number_key=LUX_SENSOR_DOMESTIC_WATER_TARGET_TEMPERATURE,
                 unique_id='domestic_water_target_temperature', name=f"{text_domestic_water} {text_target}",
                 icon='mdi:thermometer-water',
                 min_value=40.0, max_value=60.0, step=1.0,
                 mode=NumberMode.BOX),
             LuxtronikNumber(
-                luxtronik, deviceInfoDomesticWater,
+                coordinator, deviceInfoDomesticWater,
                 number_key='parameters.ID_Einst_BWS_Hyst_akt',
                 unique_id='domestic_water_hysteresis', name=text_domestic_water_hysteresis,
                 icon='mdi:thermometer', unit_of_measurement=UnitOfTemperature.KELVIN,
                 min_value=1.0, max_value=30.0, step=0.1,
                 mode=NumberMode.BOX, entity_category=EntityCategory.CONFIG),
             LuxtronikNumberThermalDesinfection(
-                luxtronik, deviceInfoDomesticWater,
+                coordinator, deviceInfoDomesticWater,
                 number_key='parameters.ID_Einst_LGST_akt',
                 unique_id='domestic_water_thermal_desinfection_target', name=f"{text_thermal_desinfection} {text_target} {text_domestic_water}",
                 icon='mdi:thermometer-high',
@@ -231,28 +234,28 @@ async def async_setup_entry(
             text_solar_pump_max_temperature_collector = get_sensor_text(lang, 'solar_pump_max_temperature_collector')
             entities += [
                 LuxtronikNumber(
-                    luxtronik, deviceInfoDomesticWater,
+                    coordinator, deviceInfoDomesticWater,
                     number_key='parameters.ID_Einst_TDC_Ein_akt',
                     unique_id='solar_pump_on_difference_temperature', name=text_solar_pump_on_difference_temperature,
                     icon='mdi:pump', unit_of_measurement=UnitOfTemperature.KELVIN,
                     min_value=2.0, max_value=15.0, step=0.5,
                     mode=NumberMode.BOX, entity_category=EntityCategory.CONFIG),
                 LuxtronikNumber(
-                    luxtronik, deviceInfoDomesticWater,
+                    coordinator, deviceInfoDomesticWater,
                     number_key='parameters.ID_Einst_TDC_Aus_akt',
                     unique_id='solar_pump_off_difference_temperature', name=text_solar_pump_off_difference_temperature,
                     icon='mdi:pump-off', unit_of_measurement=UnitOfTemperature.KELVIN,
                     min_value=0.5, max_value=10.0, step=0.5,
                     mode=NumberMode.BOX, entity_category=EntityCategory.CONFIG),
                 LuxtronikNumber(
-                    luxtronik, deviceInfoDomesticWater,
+                    coordinator, deviceInfoDomesticWater,
                     number_key='parameters.ID_Einst_TDC_Max_akt',
                     unique_id='solar_pump_off_max_difference_temperature_boiler', name=text_solar_pump_off_max_difference_temperature_boiler,
                     icon='mdi:water-boiler-alert',
                     min_value=20, max_value=95, step=1,
                     mode=NumberMode.BOX, entity_category=EntityCategory.CONFIG),
                 LuxtronikNumber(
-                    luxtronik, deviceInfoDomesticWater,
+                    coordinator, deviceInfoDomesticWater,
                     number_key='parameters.ID_Einst_TDC_Koll_Max_akt',
                     unique_id='solar_pump_max_temperature_collector', name=text_solar_pump_max_temperature_collector,
                     icon='mdi:solar-panel-large',
@@ -260,7 +263,7 @@ async def async_setup_entry(
                     mode=NumberMode.BOX, entity_category=EntityCategory.CONFIG),
             ]
 
-    deviceInfoCooling = hass.data[f"{DOMAIN}_DeviceInfo_Cooling"]
+    deviceInfoCooling = entry_data.device_info_cooling
     if deviceInfoCooling is not None:
         text_cooling_threshold_temperature = get_sensor_text(
             lang, 'cooling_threshold_temperature')
@@ -272,20 +275,20 @@ async def async_setup_entry(
             lang, 'cooling_target_temperature')
 
         entities += [
-            LuxtronikNumber(luxtronik, deviceInfoCooling,
+            LuxtronikNumber(coordinator, deviceInfoCooling,
                             number_key=LUX_SENSOR_COOLING_THRESHOLD,
                             unique_id='cooling_threshold_temperature',
                             name=f"{text_cooling_threshold_temperature}",
                             icon='mdi:sun-thermometer',
                             min_value=18.0, max_value=30.0, step=0.5, mode=NumberMode.BOX),
-            LuxtronikNumber(luxtronik, deviceInfoCooling,
+            LuxtronikNumber(coordinator, deviceInfoCooling,
                             number_key=LUX_SENSOR_COOLING_START_DELAY,
                             unique_id='cooling_start_delay_hours',
                             name=f"{text_cooling_start_delay_hours}",
                             icon='mdi:clock-start',
                             unit_of_measurement=UnitOfTime.HOURS,
                             min_value=0.0, max_value=12.0, step=0.5, mode=NumberMode.BOX),
-            LuxtronikNumber(luxtronik, deviceInfoCooling,
+            LuxtronikNumber(coordinator, deviceInfoCooling,
                             number_key=LUX_SENSOR_COOLING_STOP_DELAY,
                             unique_id='cooling_stop_delay_hours',
                             name=f"{text_cooling_stop_delay_hours}",
@@ -295,7 +298,7 @@ async def async_setup_entry(
         ]
         LUX_SENSOR_COOLING_TARGET = luxtronik.detect_cooling_target_temperature_sensor()
         entities += [
-            LuxtronikNumber(luxtronik, deviceInfoCooling,
+            LuxtronikNumber(coordinator, deviceInfoCooling,
                             number_key=LUX_SENSOR_COOLING_TARGET,
                             unique_id='cooling_target_temperature',
                             name=f"{text_cooling_target_temperature}",
@@ -307,14 +310,15 @@ async def async_setup_entry(
 # endregion Setup
 
 
-class LuxtronikNumber(NumberEntity, RestoreEntity):
+class LuxtronikNumber(CoordinatorEntity[LuxtronikCoordinator], NumberEntity, RestoreEntity):
     """Representation of a Luxtronik number."""
 
-    _use_value = None
+    # Only write the state if the value changed.
+    _change_detection = True
 
     def __init__(
         self,
-        luxtronik: LuxtronikDevice,
+        coordinator: LuxtronikCoordinator,
         deviceInfo: DeviceInfo,
         number_key: str,
         unique_id: str,
@@ -335,13 +339,12 @@ class LuxtronikNumber(NumberEntity, RestoreEntity):
         # **kwargs: Any
     ) -> None:
         """Initialize the number."""
-        # super.__init__()
-        # NumberEntity.__init__(*args, **kwargs)
-        # super().__init__(*args)
-        self._luxtronik = luxtronik
+        super().__init__(coordinator)
+        self._luxtronik = coordinator.luxtronik
         self._number_key = number_key
+        self._number_handle = self._luxtronik.register_key(number_key)
 
-        self.entity_id = ENTITY_ID_FORMAT.format(f"{DOMAIN}_{unique_id}")
+        self.entity_id = ENTITY_ID_FORMAT.format(f"{coordinator.entity_prefix}_{unique_id}")
         self._attr_unique_id = self.entity_id
         self._attr_device_class = device_class
         self._attr_name = name
@@ -368,33 +371,34 @@ class LuxtronikNumber(NumberEntity, RestoreEntity):
         """Return the icon to be used for this entity."""
         return self._icon
 
-    def update(self):
-        """Get the latest status and use it to update our sensor state."""
-        self._use_value = None
-        self._luxtronik.update()
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if self._change_detection and not self.coordinator.has_changed([self._number_handle]):
+            return
+        super()._handle_coordinator_update()
 
     @property
     def native_value(self):
         """Return the current value."""
-        if self._use_value is not None:
-            return self._use_value
-        value = self._luxtronik.get_value(self._number_key)
+        value = self._luxtronik.get_value(self._number_handle)
         if value is None:
             return None
         elif self._factor is None:
             return value
         return value * self._factor
 
-    def set_native_value(self, value):
+    async def async_set_native_value(self, value):
         """Update the current value."""
-        # self._use_value = value
         if self._factor is not None:
             value = int(value / self._factor)
-        self._luxtronik.write(self._number_key.split('.')[1], value)
-        self.schedule_update_ha_state(force_refresh=True)
+        await self.coordinator.async_write(self._number_key.split('.')[1], value,
+                                           update_immediately_after_write=True)
+        self.async_write_ha_state()
 
 
 class LuxtronikNumberThermalDesinfection(LuxtronikNumber, RestoreEntity):
+    _change_detection = False
     _last_thermal_desinfection: datetime.date = None
 
     def __init__(self, *args, **kwargs):
@@ -405,8 +409,9 @@ class LuxtronikNumberThermalDesinfection(LuxtronikNumber, RestoreEntity):
             ATTR_EXTRA_STATE_ATTRIBUTE_LAST_THERMAL_DESINFECTION: default_timestamp
         }
 
-    def update(self):
-        LuxtronikNumber.update(self)
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
         domesticWaterCurrent = float(self._luxtronik.get_value(LUX_SENSOR_DOMESTIC_WATER_CURRENT_TEMPERATURE))
         if domesticWaterCurrent >= float(self.native_value) and (self._last_thermal_desinfection is None or self._last_thermal_desinfection == "" or (isinstance(self._last_thermal_desinfection, date) and cast(date, self._last_thermal_desinfection) < datetime.now().date())):
             self._last_thermal_desinfection = datetime.now().date
@@ -414,6 +419,7 @@ class LuxtronikNumberThermalDesinfection(LuxtronikNumber, RestoreEntity):
                 ATTR_EXTRA_STATE_ATTRIBUTE_LUXTRONIK_KEY: self._number_key,
                 ATTR_EXTRA_STATE_ATTRIBUTE_LAST_THERMAL_DESINFECTION: datetime.now()
             }
+        super()._handle_coordinator_update()
 
     async def async_added_to_hass(self) -> None:
         """Handle entity which will be added."""
@@ -429,12 +435,3 @@ class LuxtronikNumberThermalDesinfection(LuxtronikNumber, RestoreEntity):
                 ATTR_EXTRA_STATE_ATTRIBUTE_LUXTRONIK_KEY: self._number_key,
                 ATTR_EXTRA_STATE_ATTRIBUTE_LAST_THERMAL_DESINFECTION: self._last_thermal_desinfection
             }
-
-        DATA_UPDATED = f"{DOMAIN}_data_updated"
-        async_dispatcher_connect(
-            self.hass, DATA_UPDATED, self._schedule_immediate_update
-        )
-
-    @callback
-    def _schedule_immediate_update(self):
-        self.async_schedule_update_ha_state(True)
@@ -0,0 +1,75 @@
+"""Plan which Luxtronik tables have to be read on a poll."""
+# region Imports
+from datetime import timedelta
+import time
+
+from .const import (
+    CONF_CALCULATIONS,
+    CONF_PARAMETERS,
+    CONF_VISIBILITIES,
+    READ_INTERVAL_CALCULATIONS,
+    READ_INTERVAL_PARAMETERS,
+    READ_INTERVAL_UNSUBSCRIBED,
+    READ_INTERVAL_VISIBILITIES,
+)
+
+# endregion Imports
+
+
+class LuxtronikReadPlanner:
+    """Track the groups entities use and when each group is due."""
+
+    def __init__(self) -> None:
+        """Initialize the planner."""
+        self._intervals: dict[str, timedelta] = {
+            CONF_PARAMETERS: READ_INTERVAL_PARAMETERS,
+            CONF_CALCULATIONS: READ_INTERVAL_CALCULATIONS,
+            CONF_VISIBILITIES: READ_INTERVAL_VISIBILITIES,
+        }
+        self._subscribed: set[str] = set()
+        self._dirty: set[str] = set()
+        self._last_read: dict[str, float] = {}
+
+    @property
+    def groups(self) -> list[str]:
+        """Return all readable groups."""
+        return list(self._intervals)
+
+    def register_key(self, group_sensor_id: str | None) -> None:
+        """Register a luxtronik key (e.g. calculations.ID_WEB_Temperatur_TVL)."""
+        if not group_sensor_id:
+            return
+        group = group_sensor_id.split(".")[0]
+        if group in self._intervals:
+            self._subscribed.add(group)
+
+    def mark_dirty(self, group: str) -> None:
+        """Force a group to be read on the next poll, e.g. after a write."""
+        self._dirty.add(group)
+
+    def plan(self) -> list[str]:
+        """Return the groups which are due for reading."""
+        now = time.monotonic()
+        due = []
+        for group, interval in self._intervals.items():
+            last_read = self._last_read.get(group)
+            if group not in self._subscribed:
+                interval = max(interval, READ_INTERVAL_UNSUBSCRIBED)
+            if (
+                last_read is None
+                or group in self._dirty
+                or now - last_read >= interval.total_seconds()
+            ):
+                due.append(group)
+        self._dirty.difference_update(due)
+        return due
+
+    def mark_read(self, groups: list[str]) -> None:
+        """Remember that groups were read successfully."""
+        now = time.monotonic()
+        for group in groups:
+            self._last_read[group] = now
+
+    def mark_failed(self, groups: list[str]) -> None:
+        """Retry groups on the next poll after a failed read."""
+        self._dirty.update(groups)
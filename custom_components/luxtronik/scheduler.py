@@ -0,0 +1,99 @@
+"""Poll scheduling of the Luxtronik heatpumps."""
+# region Imports
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import timedelta
+import time
+
+from .const import (
+    FAST_POLL_DURATION,
+    LUX_STATUS_DEFROST,
+    LUX_STATUS_EVU,
+    LUX_STATUS_NO_REQUEST,
+    MAX_CONCURRENT_POLLS,
+    MIN_TIME_BETWEEN_UPDATES,
+    POLL_STAGGER,
+)
+
+# endregion Imports
+
+
+class LuxtronikPollScheduler:
+    """Limit the concurrent polls of all heatpumps and stagger their start.
+
+    Every coordinator keeps its own interval, polls that fall due at the same
+    time are spread apart by the stagger instead of hitting the network at once.
+    """
+
+    def __init__(
+        self,
+        max_concurrent_polls: int = MAX_CONCURRENT_POLLS,
+        stagger: timedelta = POLL_STAGGER,
+    ) -> None:
+        """Initialize the scheduler."""
+        self._semaphore = asyncio.Semaphore(max_concurrent_polls)
+        self._stagger = stagger.total_seconds()
+        self._next_start = 0.0
+        self._devices = 0
+
+    @property
+    def devices(self) -> int:
+        """Return the number of registered heatpumps."""
+        return self._devices
+
+    def register(self) -> None:
+        """Register a heatpump polled through this scheduler."""
+        self._devices += 1
+
+    def unregister(self) -> int:
+        """Unregister a heatpump and return the number still registered."""
+        self._devices = max(self._devices - 1, 0)
+        return self._devices
+
+    @asynccontextmanager
+    async def async_poll_slot(self) -> AsyncIterator[None]:
+        """Wait for the stagger slot and a free poll, a single heatpump never waits."""
+        if self._devices > 1:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            start = max(now, self._next_start)
+            self._next_start = start + self._stagger
+            if start > now:
+                await asyncio.sleep(start - now)
+        async with self._semaphore:
+            yield
+
+
+class LuxtronikPollInterval:
+    """Choose the poll interval of a heatpump from its operating state.
+
+    Polls with the min interval during defrost and for a while after a
+    compressor start/stop or a write, with the max interval while there is no
+    request or EVU lock and with the default interval otherwise.
+    """
+
+    def __init__(self, min_interval: timedelta, max_interval: timedelta) -> None:
+        """Initialize the interval bounds."""
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.default_interval = min(
+            max(MIN_TIME_BETWEEN_UPDATES, self.min_interval), self.max_interval
+        )
+        self._compressor_on: bool | None = None
+        self._fast_until = 0.0
+
+    def fast_poll(self, duration: timedelta = FAST_POLL_DURATION) -> None:
+        """Poll with the min interval for a while, e.g. after a write."""
+        self._fast_until = max(self._fast_until, time.monotonic() + duration.total_seconds())
+
+    def next_interval(self, status: str | None, compressor_on: bool | None) -> timedelta:
+        """Return the interval until the next poll after a poll returned these values."""
+        if self._compressor_on is not None and compressor_on != self._compressor_on:
+            self.fast_poll()
+        self._compressor_on = compressor_on
+        if status == LUX_STATUS_DEFROST or time.monotonic() < self._fast_until:
+            return self.min_interval
+        if status in (LUX_STATUS_NO_REQUEST, LUX_STATUS_EVU) and not compressor_on:
+            return self.max_interval
+        return self.default_interval
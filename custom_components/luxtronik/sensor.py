@@ -8,24 +8,27 @@ from homeassistant.components.sensor import (ENTITY_ID_FORMAT,
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (CONF_FRIENDLY_NAME, CONF_ICON, CONF_ID,
                                  CONF_SENSORS,
-                                 EVENT_HOMEASSISTANT_STOP,
-                                 STATE_UNAVAILABLE,
-                                 UnitOfElectricPotential, UnitOfEnergy, UnitOfPower,
+                                 UnitOfElectricPotential, UnitOfEnergy,
+                                 UnitOfInformation, UnitOfPower,
                                  UnitOfPressure, UnitOfTemperature, UnitOfTime)
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_change
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 
+from . import get_entry_data
 from .const import (ATTR_EXTRA_STATE_ATTRIBUTE_LUXTRONIK_KEY, ATTR_STATUS_TEXT,
                     CONF_GROUP,
                     DEFAULT_DEVICE_CLASS, DEVICE_CLASSES, DOMAIN, ICONS,
                     LOGGER, LUX_BINARY_SENSOR_ADDITIONAL_CIRCULATION_PUMP,
+                    LUX_SENSOR_FLOW_HEATING, LUX_SENSOR_HEAT_OUTPUT,
                     LUX_SENSOR_MODE_HEATING, LUX_SENSOR_STATUS,
-                    LUX_SENSOR_STATUS1, LUX_SENSOR_STATUS3, LUX_STATE_ICON_MAP,
+                    LUX_SENSOR_STATUS1, LUX_SENSOR_STATUS2, LUX_SENSOR_STATUS3,
+                    LUX_SENSOR_STATUS_TIME, LUX_STATE_ICON_MAP,
                     LUX_STATES_ON, LUX_STATUS1_HEATPUMP_COMING,
                     LUX_STATUS1_HEATPUMP_SHUTDOWN, LUX_STATUS1_WORKAROUND,
                     LUX_STATUS3_WORKAROUND, LUX_STATUS_DOMESTIC_WATER,
@@ -33,12 +36,17 @@ from .const import (ATTR_EXTRA_STATE_ATTRIBUTE_LUXTRONIK_KEY, ATTR_STATUS_TEXT,
                     LUX_STATUS_COOLING,
                     LUX_STATUS_THERMAL_DESINFECTION, SECOUND_TO_HOUR_FACTOR,
                     UNITS, LuxMode)
+from .coordinator import LuxtronikCoordinator
 from .helpers.helper import get_sensor_text, get_sensor_value_text
+from .helpers.metrics import (METRIC_BYTES_RECEIVED, METRIC_CONNECT_TIME,
+                              METRIC_DECODE_TIME, METRIC_LOCK_WAIT_TIME,
+                              METRIC_READ_TIME, METRIC_WRITE_TIME)
 from .luxtronik_device import LuxtronikDevice
 
 # endregion Imports
 
 # region Constants
+THERMAL_WINDOW_TEXTS = {"1min": "1 min", "15min": "15 min", "1h": "1 h"}
 # endregion Constants
 
 # region Setup
@@ -56,15 +64,17 @@ async def async_setup_platform(
         config,
         discovery_info,
     )
-    luxtronik: LuxtronikDevice = hass.data.get(DOMAIN)
-    if not luxtronik:
+    entry_data = get_entry_data(hass)
+    if not entry_data:
         LOGGER.warning("%s.sensor.async_setup_platform no luxtronik!", DOMAIN)
         return False
+    luxtronik = entry_data.luxtronik
+    coordinator = entry_data.coordinator
 
     # use_legacy_sensor_ids = hass.data[f"{DOMAIN}_{CONF_USE_LEGACY_SENSOR_IDS}"]
     # LOGGER.info("sensor.async_setup_platform use_legacy_sensor_ids: '%s'",
     #             use_legacy_sensor_ids)
-    device_info = hass.data[f"{DOMAIN}_DeviceInfo"]
+    device_info = entry_data.device_info
 
     sensors = config.get(CONF_SENSORS)
     entities = []
@@ -91,7 +101,7 @@ async def async_setup_platform(
                 )
                 entities += [
                     LuxtronikSensor(
-                        luxtronik=luxtronik,
+                        coordinator=coordinator,
                         device_info=device_info,
                         sensor_key=f"{group}.{sensor_id}",
                         unique_id=sensor_id,
@@ -123,13 +133,14 @@ async def async_setup_entry(
 ) -> None:
     """Set up a Luxtronik sensor from ConfigEntry."""
     LOGGER.info(f"{DOMAIN}.sensor.async_setup_entry ConfigType: %s", config_entry)
-    luxtronik: LuxtronikDevice = hass.data.get(DOMAIN)
-    if not luxtronik:
+    entry_data = get_entry_data(hass, config_entry.entry_id)
+    if not entry_data:
         LOGGER.warning("%s.sensor.async_setup_entry no luxtronik!", DOMAIN)
         return False
-    luxtronik.read()
+    luxtronik = entry_data.luxtronik
+    coordinator = entry_data.coordinator
 
-    device_info = hass.data[f"{DOMAIN}_DeviceInfo"]
+    device_info = entry_data.device_info
 
     # region: Build Sensor names with local language:
     lang = hass.config.language
@@ -172,7 +183,7 @@ async def async_setup_entry(
 
     entities = [
         LuxtronikStatusSensor(
-            luxtronik,
+            coordinator,
             device_info,
             LUX_SENSOR_STATUS,
             "status",
@@ -184,9 +195,9 @@ async def async_setup_entry(
             # entity_category=EntityCategory.DIAGNOSTIC,
         ),
         LuxtronikSensor(
-            luxtronik,
+            coordinator,
             device_info,
-            "calculations.ID_WEB_HauptMenuStatus_Zeit",
+            LUX_SENSOR_STATUS_TIME,
             "status_time",
             f"Status {text_time}",
             "mdi:timer-sand",
@@ -214,7 +225,7 @@ async def async_setup_entry(
             }
         ),
         LuxtronikSensor(
-            luxtronik,
+            coordinator,
             device_info,
             LUX_SENSOR_STATUS1,
             "status_line_1",
@@ -227,9 +238,9 @@ async def async_setup_entry(
             entity_registry_visible_default=False,
         ),
         LuxtronikSensor(
-            luxtronik,
+            coordinator,
             device_info,
-            "calculations.ID_WEB_HauptMenuStatus_Zeile2",
+            LUX_SENSOR_STATUS2,
             "status_line_2",
             "Status 2",
             "mdi:numeric-2-circle",
@@ -240,7 +251,7 @@ async def async_setup_entry(
             entity_registry_visible_default=False,
         ),
         LuxtronikSensor(
-            luxtronik,
+            coordinator,
             device_info,
             LUX_SENSOR_STATUS3,
             "status_line_3",
@@ -253,7 +264,7 @@ async def async_setup_entry(
             entity_registry_visible_default=False,
         ),
         LuxtronikSensor(
-            luxtronik,
+            coordinator,
             device_info,
             "calculations.ID_WEB_Temperatur_TWE",
             "heat_source_input_temperature",
@@ -261,7 +272,7 @@ async def async_setup_entry(
             entity_category=None,
         ),
         LuxtronikSensor(
-            luxtronik,
+            coordinator,
             device_info,
             "calculations.ID_WEB_Temperatur_TA",
             "outdoor_temperature",
@@ -269,7 +280,7 @@ async def async_setup_entry(
             entity_category=None,
         ),
         LuxtronikSensor(
-            luxtronik,
+            coordinator,
             device_info,
             "calculations.ID_WEB_Mitteltemperatur",
             "outdoor_temperature_average",
@@ -277,7 +288,7 @@ async def async_setup_entry(
             entity_category=None,
         ),
         LuxtronikSensor(
-            luxtronik,
+            coordinator,
             device_info,
             sensor_key="calculations.ID_WEB_Zaehler_BetrZeitImpVD1",
             unique_id="compressor_impulses",
@@ -289,7 +300,7 @@ async def async_setup_entry(
             entity_category=EntityCategory.DIAGNOSTIC,
         ),
         LuxtronikSensor(
-            luxtronik,
+            coordinator,
             device_info,
             sensor_key="calculations.ID_WEB_Zaehler_BetrZeitVD1",
             unique_id="operation_hours_compressor1",
@@ -306,7 +317,7 @@ async def async_setup_entry(
     if has_second_compressor:
         entities += [
             LuxtronikSensor(
-                luxtronik,
+                coordinator,
                 device_info,
                 sensor_key="calculations.ID_WEB_Zaehler_BetrZeitVD2",
                 unique_id="operation_hours_compressor2",
@@ -319,7 +330,7 @@ async def async_setup_entry(
                 factor=SECOUND_TO_HOUR_FACTOR,
             ),
             LuxtronikSensor(
-                luxtronik,
+                coordinator,
                 device_info,
                 sensor_key="calculations.ID_WEB_Zaehler_BetrZeitImpVD2",
                 unique_id="compressor_impulses2",
@@ -334,7 +345,7 @@ async def async_setup_entry(
 
     entities += [
         LuxtronikSensor(
-            luxtronik,
+            coordinator,
             device_info,
             sensor_key="calculations.ID_WEB_Zaehler_BetrZeitWP",
             unique_id="operation_hours",
@@ -347,7 +358,7 @@ async def async_setup_entry(
             factor=SECOUND_TO_HOUR_FACTOR,
         ),
         LuxtronikSensor(
-            luxtronik,
+            coordinator,
             device_info,
             sensor_key="calculations.ID_WEB_WMZ_Seit",
             unique_id="heat_amount_counter",
@@ -360,7 +371,7 @@ async def async_setup_entry(
         ),
 
         LuxtronikSensor(
-            luxtronik,
+            coordinator,
             device_info,
             "calculations.ID_WEB_Temperatur_THG",
             "hot_gas_temperature",
@@ -368,7 +379,7 @@ async def async_setup_entry(
             entity_category=None,
         ),
         LuxtronikSensor(
-            luxtronik,
+            coordinator,
             device_info,
             "calculations.ID_WEB_LIN_ANSAUG_VERDICHTER",
             "suction_compressor_temperature",
@@ -377,7 +388,7 @@ async def async_setup_entry(
             entity_registry_enabled_default=False,
         ),
         LuxtronikSensor(
-            luxtronik,
+            coordinator,
             device_info,
             "calculations.ID_WEB_LIN_ANSAUG_VERDAMPFER",
             "suction_evaporator_temperature",
@@ -386,7 +397,7 @@ async def async_setup_entry(
             entity_registry_enabled_default=False,
         ),
         LuxtronikSensor(
-            luxtronik,
+            coordinator,
             device_info,
             "calculations.ID_WEB_LIN_VDH",
             "compressor_heating_temperature",
@@ -394,7 +405,7 @@ async def async_setup_entry(
             entity_category=None,
         ),
         LuxtronikSensor(
-            luxtronik,
+            coordinator,
             device_info,
             "calculations.ID_WEB_LIN_UH",
             "overheating_temperature",
@@ -405,7 +416,7 @@ async def async_setup_entry(
             entity_registry_enabled_default=False,
         ),
         LuxtronikSensor(
-            luxtronik,
+            coordinator,
             device_info,
             "calculations.ID_WEB_LIN_UH_Soll",
             "overheating_target_temperature",
@@ -415,7 +426,7 @@ async def async_setup_entry(
             entity_registry_enabled_default=False,
         ),
         LuxtronikSensor(
-            luxtronik,
+            coordinator,
             device_info,
             "calculations.ID_WEB_LIN_HD",
             "high_pressure",
@@ -427,7 +438,7 @@ async def async_setup_entry(
             icon="mdi:gauge-full",
         ),
         LuxtronikSensor(
-            luxtronik,
+            coordinator,
             device_info,
             "calculations.ID_WEB_LIN_ND",
             "low_pressure",
@@ -439,7 +450,7 @@ async def async_setup_entry(
             icon="mdi:gauge-low",
         ),
         LuxtronikSensor(
-            luxtronik,
+            coordinator,
             device_info,
             sensor_key="calculations.ID_WEB_Zaehler_BetrZeitZWE1",
             unique_id="operation_hours_additional_heat_generator",
@@ -452,7 +463,7 @@ async def async_setup_entry(
             factor=SECOUND_TO_HOUR_FACTOR,
         ),
         LuxtronikSensor(
-            luxtronik,
+            coordinator,
             device_info,
             sensor_key="calculations.ID_WEB_AnalogOut1",
             unique_id="analog_out1",
@@ -464,7 +475,7 @@ async def async_setup_entry(
             factor=0.1,
         ),
         LuxtronikSensor(
-            luxtronik,
+            coordinator,
             device_info,
             sensor_key="calculations.ID_WEB_AnalogOut2",
             unique_id="analog_out2",
@@ -478,7 +489,7 @@ async def async_setup_entry(
         LuxtronikIndexStatusSensor(
             key_index=None,
             key_timestamp_template=None,
-            luxtronik=luxtronik,
+            coordinator=coordinator,
             device_info=device_info,
             sensor_key="Switchoff",
             unique_id="switchoff_reason",
@@ -493,7 +504,7 @@ async def async_setup_entry(
         LuxtronikIndexStatusSensor(
             key_index="calculations.ID_WEB_AnzahlFehlerInSpeicher",
             key_timestamp_template="calculations.ID_WEB_ERROR_Time0",
-            luxtronik=luxtronik,
+            coordinator=coordinator,
             device_info=device_info,
             sensor_key="calculations.ID_WEB_ERROR_Nr0",
             unique_id="error_reason",
@@ -509,7 +520,7 @@ async def async_setup_entry(
     if luxtronik.get_value("calculations.Heat_Output") is not None:
         entities += [
             LuxtronikSensor(
-                luxtronik,
+                coordinator,
                 device_info,
                 sensor_key="calculations.Heat_Output",
                 unique_id="current_heat_output",
@@ -520,9 +531,36 @@ async def async_setup_entry(
                 entity_category=EntityCategory.DIAGNOSTIC,
             ),
         ]
+    if (
+        luxtronik.get_value(LUX_SENSOR_FLOW_HEATING) is not None
+        or luxtronik.get_value(LUX_SENSOR_HEAT_OUTPUT) is not None
+    ):
+        text_thermal_power = get_sensor_text(lang, "thermal_power")
+        text_cop = get_sensor_text(lang, "coefficient_of_performance")
+        for window, window_text in THERMAL_WINDOW_TEXTS.items():
+            entities += [
+                LuxtronikThermalSensor(
+                    coordinator,
+                    device_info,
+                    window,
+                    "thermal_power",
+                    f"{text_thermal_power} {window_text}",
+                    device_class=SensorDeviceClass.POWER,
+                    unit_of_measurement=UnitOfPower.WATT,
+                    icon="mdi:heat-wave",
+                ),
+                LuxtronikThermalSensor(
+                    coordinator,
+                    device_info,
+                    window,
+                    "cop",
+                    f"{text_cop} {window_text}",
+                    icon="mdi:gauge",
+                ),
+            ]
     text_additional_heat_generator_amount_counter = get_sensor_text(lang, "additional_heat_generator_amount_counter")
     add_sensor_if_active(luxtronik, entities, "visibilities.ID_Visi_Waermemenge_ZWE", LuxtronikSensor(
-        luxtronik,
+        coordinator,
         device_info,
         sensor_key="parameters.ID_Waermemenge_ZWE",
         unique_id="additional_heat_generator_amount_counter",
@@ -538,7 +576,7 @@ async def async_setup_entry(
     if device_info.get('model') != 'LD7':
         entities += [
             LuxtronikSensor(
-                luxtronik,
+                coordinator,
                 device_info,
                 "calculations.ID_WEB_Freq_VD",
                 "pump frequency",
@@ -550,7 +588,7 @@ async def async_setup_entry(
                 device_class=SensorDeviceClass.FREQUENCY,
             ),
             LuxtronikSensor(
-                luxtronik,
+                coordinator,
                 device_info,
                 "calculations.ID_WEB_Temperatur_TWA",
                 "heat_source_output_temperature",
@@ -560,7 +598,7 @@ async def async_setup_entry(
             ),
         ]
 
-    device_info_heating = hass.data[f"{DOMAIN}_DeviceInfo_Heating"]
+    device_info_heating = entry_data.device_info_heating
     if device_info_heating is not None:
         text_flow_in = get_sensor_text(lang, "flow_in")
         text_flow_out = get_sensor_text(lang, "flow_out")
@@ -572,7 +610,7 @@ async def async_setup_entry(
             text_room = get_sensor_text(lang, "room")
             entities += [
                 LuxtronikSensor(
-                    luxtronik,
+                    coordinator,
                     device_info_heating,
                     "calculations.ID_WEB_RBE_RT_Ist",
                     "room_temperature",
@@ -580,7 +618,7 @@ async def async_setup_entry(
                     entity_category=None,
                 ),
                 LuxtronikSensor(
-                    luxtronik,
+                    coordinator,
                     device_info_heating,
                     "calculations.ID_WEB_RBE_RT_Soll",
                     "room_target_temperature",
@@ -591,7 +629,7 @@ async def async_setup_entry(
 
         entities += [
             LuxtronikSensor(
-                luxtronik,
+                coordinator,
                 device_info_heating,
                 "calculations.ID_WEB_Temperatur_TVL",
                 "flow_in_temperature",
@@ -603,7 +641,7 @@ async def async_setup_entry(
                 }
             ),
             LuxtronikSensor(
-                luxtronik,
+                coordinator,
                 device_info_heating,
                 "calculations.ID_WEB_Temperatur_TRL",
                 "flow_out_temperature",
@@ -612,7 +650,7 @@ async def async_setup_entry(
                 entity_category=None,
             ),
             LuxtronikFlowOutStatusSensor(
-                luxtronik,
+                coordinator,
                 device_info_heating,
                 "calculations.ID_WEB_Sollwert_TRL_HZ",
                 "flow_out_temperature_target",
@@ -620,7 +658,7 @@ async def async_setup_entry(
                 entity_category=None,
             ),
             LuxtronikSensor(
-                luxtronik,
+                coordinator,
                 device_info_heating,
                 sensor_key="calculations.ID_WEB_Zaehler_BetrZeitHz",
                 unique_id="operation_hours_heating",
@@ -633,7 +671,7 @@ async def async_setup_entry(
                 factor=SECOUND_TO_HOUR_FACTOR,
             ),
             LuxtronikSensor(
-                luxtronik,
+                coordinator,
                 device_info_heating,
                 sensor_key="calculations.ID_WEB_WMZ_Heizung",
                 unique_id="heat_amount_heating",
@@ -646,7 +684,7 @@ async def async_setup_entry(
             ),
         ]
         add_sensor_if_min_minor_version(luxtronik, entities, 88, LuxtronikSensor(
-            luxtronik,
+            coordinator,
             device_info_heating,
             sensor_key="parameters.Unknown_Parameter_1136",
             unique_id="heat_energy_input",
@@ -660,7 +698,7 @@ async def async_setup_entry(
         )
 
     add_sensor_if_active(luxtronik, entities, "visibilities.ID_Visi_Temp_Rucklauf", LuxtronikSensor(
-        luxtronik,
+        coordinator,
         device_info_heating,
         "calculations.ID_WEB_Temperatur_TRL_ext",
         "flow_out_temperature_external",
@@ -669,7 +707,7 @@ async def async_setup_entry(
         entity_category=None)
     )
 
-    device_info_domestic_water = hass.data[f"{DOMAIN}_DeviceInfo_Domestic_Water"]
+    device_info_domestic_water = entry_data.device_info_domestic_water
     if device_info_domestic_water is not None:
         text_collector = get_sensor_text(lang, "collector")
         text_buffer = get_sensor_text(lang, "buffer")
@@ -683,7 +721,7 @@ async def async_setup_entry(
 
         entities += [
             LuxtronikSensor(
-                luxtronik,
+                coordinator,
                 device_info_domestic_water,
                 "calculations.ID_WEB_Temperatur_TBW",
                 "domestic_water_temperature",
@@ -692,7 +730,7 @@ async def async_setup_entry(
                 entity_category=None,
             ),
             LuxtronikSensor(
-                luxtronik,
+                coordinator,
                 device_info_domestic_water,
                 sensor_key="calculations.ID_WEB_Zaehler_BetrZeitBW",
                 unique_id="operation_hours_domestic_water",
@@ -705,7 +743,7 @@ async def async_setup_entry(
                 factor=SECOUND_TO_HOUR_FACTOR,
             ),
             LuxtronikSensor(
-                luxtronik,
+                coordinator,
                 device_info_domestic_water,
                 sensor_key="calculations.ID_WEB_WMZ_Brauchwasser",
                 unique_id="heat_amount_domestic_water",
@@ -718,7 +756,7 @@ async def async_setup_entry(
             ),
         ]
         add_sensor_if_min_minor_version(luxtronik, entities, 88, LuxtronikSensor(
-            luxtronik,
+            coordinator,
             device_info_domestic_water,
             sensor_key="parameters.Unknown_Parameter_1137",
             unique_id="domestic_water_energy_input",
@@ -737,7 +775,7 @@ async def async_setup_entry(
             # if luxtronik.get_value("visibilities.ID_Visi_Temp_Solarkoll") > 0:
             entities += [
                 LuxtronikSensor(
-                    luxtronik,
+                    coordinator,
                     device_info_domestic_water,
                     "calculations.ID_WEB_Temperatur_TSK",
                     "solar_collector_temperature",
@@ -749,7 +787,7 @@ async def async_setup_entry(
         # if luxtronik.get_value("visibilities.ID_Visi_Temp_Solarsp") > 0:
             entities += [
                 LuxtronikSensor(
-                    luxtronik,
+                    coordinator,
                     device_info_domestic_water,
                     "calculations.ID_WEB_Temperatur_TSS",
                     "solar_buffer_temperature",
@@ -762,7 +800,7 @@ async def async_setup_entry(
             text_operation_hours_solar = get_sensor_text(lang, "operation_hours_solar")
             entities += [
                 LuxtronikSensor(
-                    luxtronik,
+                    coordinator,
                     device_info_domestic_water,
                     sensor_key="parameters.ID_BSTD_Solar",
                     unique_id="operation_hours_solar",
@@ -776,12 +814,12 @@ async def async_setup_entry(
                 ),
             ]
 
-    deviceInfoCooling = hass.data[f"{DOMAIN}_DeviceInfo_Cooling"]
+    deviceInfoCooling = entry_data.device_info_cooling
     if deviceInfoCooling is not None:
         text_operation_hours_cooling = get_sensor_text(lang, "operation_hours_cooling")
         entities += [
             LuxtronikSensor(
-                luxtronik,
+                coordinator,
                 deviceInfoCooling,
                 sensor_key="calculations.ID_WEB_Zaehler_BetrZeitKue",
                 unique_id="operation_hours_cooling",
@@ -795,9 +833,29 @@ async def async_setup_entry(
             )
         ]
 
-    hass.bus.async_listen_once(
-        EVENT_HOMEASSISTANT_STOP, luxtronik.async_will_remove_from_hass()
-    )
+    entities += [
+        LuxtronikMetricSensor(
+            coordinator, device_info, metric, get_sensor_text(lang, f"metric_{metric}")
+        )
+        for metric in [
+            METRIC_CONNECT_TIME,
+            METRIC_READ_TIME,
+            METRIC_DECODE_TIME,
+            METRIC_LOCK_WAIT_TIME,
+            METRIC_WRITE_TIME,
+        ]
+    ]
+    entities += [
+        LuxtronikMetricSensor(
+            coordinator,
+            device_info,
+            METRIC_BYTES_RECEIVED,
+            get_sensor_text(lang, f"metric_{METRIC_BYTES_RECEIVED}"),
+            unit_of_measurement=UnitOfInformation.BYTES,
+            factor=1,
+            icon="mdi:download-network",
+        ),
+    ]
 
     async_add_entities(entities)
 
@@ -819,13 +877,15 @@ async def async_setup_entry(
 # endregion Setup
 
 
-class LuxtronikSensor(SensorEntity, RestoreEntity):
+class LuxtronikSensor(CoordinatorEntity[LuxtronikCoordinator], SensorEntity, RestoreEntity):
     """Representation of a Luxtronik Sensor."""
     _attr_is_on = True
+    # Only write the state if the sensor or extra attribute values changed.
+    _change_detection = True
 
     def __init__(
         self,
-        luxtronik: LuxtronikDevice,
+        coordinator: LuxtronikCoordinator,
         device_info: DeviceInfo,
         sensor_key: str,
         unique_id: str,
@@ -843,17 +903,17 @@ class LuxtronikSensor(SensorEntity, RestoreEntity):
         # **kwargs: Any
     ) -> None:
         """Initialize the sensor."""
-        # super().__init__(*args)
-#        super(LuxtronikSensor, self).__init__(*args)
-        self._luxtronik = luxtronik
+        super().__init__(coordinator)
+        self._luxtronik = coordinator.luxtronik
 
-        self.entity_id = ENTITY_ID_FORMAT.format(f"{DOMAIN}_{unique_id}")
+        self.entity_id = ENTITY_ID_FORMAT.format(f"{coordinator.entity_prefix}_{unique_id}")
         self._attr_unique_id = self.entity_id
         self._attr_device_class = device_class
         self._attr_name = name
         self._icon = icon
         self._attr_native_unit_of_measurement = unit_of_measurement
         self._sensor_key = sensor_key
+        self._sensor_handle = self._luxtronik.register_key(sensor_key)
         self._attr_state_class = state_class
 
         self._attr_device_info = device_info
@@ -863,6 +923,12 @@ class LuxtronikSensor(SensorEntity, RestoreEntity):
         self._attr_entity_registry_enabled_default = entity_registry_enabled_default
         self._attr_extra_state_attributes = {ATTR_EXTRA_STATE_ATTRIBUTE_LUXTRONIK_KEY: sensor_key}
         self._extra_attributes = extra_attributes
+        self._watched_keys = [self._sensor_handle] + [
+            self._luxtronik.register_key(key) for key in (extra_attributes or {}).values()
+        ]
+        if sensor_key in [LUX_SENSOR_STATUS, LUX_SENSOR_STATUS1]:
+            # The status text depends on further values.
+            self._change_detection = False
 
     def disable_by_default(self):
         self._attr_entity_registry_enabled_default = False
@@ -883,7 +949,7 @@ class LuxtronikSensor(SensorEntity, RestoreEntity):
     @property
     def native_value(self):  # -> float | int | None:
         """Return the state of the sensor."""
-        value = self._luxtronik.get_value(self._sensor_key)
+        value = self._luxtronik.get_value(self._sensor_handle)
         if value is not None and isinstance(value, datetime) and value.tzinfo is None:
             time_zone = dt_util.get_time_zone(self.hass.config.time_zone)
             value = value.replace(tzinfo=time_zone)
@@ -904,9 +970,8 @@ class LuxtronikSensor(SensorEntity, RestoreEntity):
                 return LUX_STATUS_NO_REQUEST
             # endregion Workaround Luxtronik Bug: Status shows heating but status 3 = no request!
         # region Workaround Luxtronik Bug: Line 1 shows 'heatpump coming' on shutdown!
-        elif self._sensor_key == LUX_SENSOR_STATUS1 and value == LUX_STATUS1_HEATPUMP_COMING:
-            if int(self._luxtronik.get_value('calculations.ID_WEB_Time_SSPEIN_akt')) < 10 and int(self._luxtronik.get_value('calculations.ID_WEB_Time_SSPAUS_akt')) > 0:
-                return LUX_STATUS1_HEATPUMP_SHUTDOWN
+        elif self._sensor_key == LUX_SENSOR_STATUS1:
+            value = _status1_value(self._luxtronik, value)
             # endregion Workaround Luxtronik Bug: Line 1 shows 'heatpump coming' on shutdown!
 
         # workaround to detect (passive) cooling active
@@ -928,24 +993,50 @@ class LuxtronikSensor(SensorEntity, RestoreEntity):
         """Return true if sensor is on."""
         return self.native_value in LUX_STATES_ON
 
-    def update(self):
+    async def async_added_to_hass(self) -> None:
+        """Handle entity which will be added."""
+        await super().async_added_to_hass()
+        self._update_from_coordinator()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._update_from_coordinator()
+        if self._change_detection and not self.coordinator.has_changed(self._watched_keys):
+            return
+        super()._handle_coordinator_update()
+
+    def _update_from_coordinator(self):
         """Get the latest status and use it to update our sensor state."""
-        self._luxtronik.update()
-        if self._sensor_key == "calculations.ID_WEB_HauptMenuStatus_Zeit":
-            value = self.native_value
-            if value is None:
-                time_str = None
-            else:
-                (minutes, seconds) = divmod(int(value), 60)
-                hours, minutes = divmod(minutes, 60)
-                time_str = f"{hours:01.0f}:{minutes:02.0f} h"
-            self._attr_extra_state_attributes[ATTR_STATUS_TEXT] = time_str
+        if self._sensor_key == LUX_SENSOR_STATUS_TIME:
+            self._attr_extra_state_attributes[ATTR_STATUS_TEXT] = _status_time_text(self.native_value)
         if self._extra_attributes is not None:
             for key, value in self._extra_attributes.items():
                 self._attr_extra_state_attributes[key] = self._luxtronik.get_value(value)
 
 
+def _status1_value(luxtronik: LuxtronikDevice, value):
+    """Return the status line 1 with the 'heatpump coming' on shutdown workaround."""
+    if value == LUX_STATUS1_HEATPUMP_COMING:
+        if int(luxtronik.get_value('calculations.ID_WEB_Time_SSPEIN_akt')) < 10 and int(luxtronik.get_value('calculations.ID_WEB_Time_SSPAUS_akt')) > 0:
+            return LUX_STATUS1_HEATPUMP_SHUTDOWN
+    return value
+
+
+def _status_time_text(value) -> str | None:
+    if value is None:
+        return None
+    (minutes, seconds) = divmod(int(value), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:01.0f}:{minutes:02.0f} h"
+
+
+def _evu_time_text(evu_time: time | None) -> str:
+    return '' if evu_time is None else evu_time.strftime('%H:%M')
+
+
 class LuxtronikIndexStatusSensor(LuxtronikSensor):
+    _change_detection = False
     # _min_index = 0
     # _max_index = 4
 
@@ -959,7 +1050,6 @@ class LuxtronikIndexStatusSensor(LuxtronikSensor):
         self._update_sensor_keys()
 
     def _update_sensor_keys(self):
-        self._luxtronik.update()
         if self._key_index is None or self._key_index == "":
             index = max(self._luxtronik.get_value(f"parameters.ID_{self._key_template}_index") - 1, 0)
             self._sensor_key = f"parameters.ID_{self._key_template}_file_{index}_0"
@@ -968,14 +1058,15 @@ class LuxtronikIndexStatusSensor(LuxtronikSensor):
             index = self._luxtronik.get_value(self._key_index)
             self._sensor_key = self._key_template.replace("%n", str(index))
             self._sensor_key_timestamp = self._key_timestamp_template.replace("%n", str(index))
+        self._sensor_handle = self._luxtronik.register_key(self._sensor_key)
 
-    def update(self):
+    def _update_from_coordinator(self):
         """Get the latest status and use it to update our sensor state."""
         self._update_sensor_keys()
 
     @property
     def native_value(self) -> str:
-        value = str(self._luxtronik.get_value(self._sensor_key))
+        value = str(self._luxtronik.get_value(self._sensor_handle))
         value_timestamp = self._luxtronik.get_value(self._sensor_key_timestamp)
         if value_timestamp is not None and isinstance(value_timestamp, int):
             value_timestamp = datetime.fromtimestamp(value_timestamp, timezone.utc)
@@ -1015,6 +1106,8 @@ class LuxtronikIndexStatusSensor(LuxtronikSensor):
 
 
 class LuxtronikFlowOutStatusSensor(LuxtronikSensor, RestoreEntity):
+    _change_detection = False
+
     def _calc_switch_gap(self) -> float:
         flow_out_target = float(self._luxtronik.get_value("calculations.ID_WEB_Sollwert_TRL_HZ"))
         flow_out = float(self._luxtronik.get_value("calculations.ID_WEB_Temperatur_TRL"))
@@ -1035,9 +1128,15 @@ class LuxtronikFlowOutStatusSensor(LuxtronikSensor, RestoreEntity):
         }
 
 
+def _time_now() -> time:
+    now = datetime.now()
+    return time(now.hour, now.minute)
+
+
 class LuxtronikStatusSensor(LuxtronikSensor, RestoreEntity):
     """Luxtronik Status Sensor with extended attr."""
 
+    _change_detection = False
     _last_state: str = None
 
     _first_evu_start_time: time = None
@@ -1045,59 +1144,53 @@ class LuxtronikStatusSensor(LuxtronikSensor, RestoreEntity):
     _second_evu_start_time: time = None
     _second_evu_end_time: time = None
 
-    def update(self):
-        LuxtronikSensor.update(self)
-        time_now = time(datetime.now().hour, datetime.now().minute)
-        if self.native_value is not None and self._last_state is not None and self.native_value == LUX_STATUS_EVU and self._last_state != LUX_STATUS_EVU:
+    def _update_from_coordinator(self):
+        LuxtronikSensor._update_from_coordinator(self)
+        value = self.native_value
+        time_now = _time_now()
+        if value is not None and self._last_state is not None and value == LUX_STATUS_EVU and self._last_state != LUX_STATUS_EVU:
             # evu start
             if self._first_evu_start_time is None or time_now.hour <= self._first_evu_start_time.hour or (self._second_evu_start_time is not None and time_now.hour < self._second_evu_start_time.hour) or time_now.hour <= self._first_evu_end_time.hour:
                 self._first_evu_start_time = time_now
             else:
                 self._second_evu_start_time = time_now
-        elif self.native_value is not None and self._last_state is not None and self.native_value != LUX_STATUS_EVU and self._last_state == LUX_STATUS_EVU:
+        elif value is not None and self._last_state is not None and value != LUX_STATUS_EVU and self._last_state == LUX_STATUS_EVU:
             # evu end
             if self._first_evu_end_time is None or time_now.hour <= self._first_evu_end_time.hour or (self._second_evu_start_time is not None and time_now < self._second_evu_start_time):
                 self._first_evu_end_time = time_now
             else:
                 self._second_evu_end_time = time_now
 
-        self._last_state = self.native_value
-
-    def _get_sensor_value(self, sensor_name: str):
-        sensor = self.hass.states.get(sensor_name)
-        if sensor is not None:
-            return sensor.state
-        return None
+        self._last_state = value
+        self._update_attributes(value, time_now)
 
-    def _get_sensor_attr(self, sensor_name: str, attr: str):
-        sensor = self.hass.states.get(sensor_name)
-        if sensor is not None and attr in sensor.attributes:
-            return sensor.attributes[attr]
-        return None
+    def _update_attributes(self, value, time_now: time) -> None:
+        """Build the attributes once per update instead of on every state read."""
+        evu_event_minutes = self._calc_next_evu_event_minutes(time_now)
+        self._attr_extra_state_attributes = {
+            ATTR_STATUS_TEXT: self._build_status_text(value, evu_event_minutes),
+            ATTR_EXTRA_STATE_ATTRIBUTE_LUXTRONIK_KEY: self._sensor_key,
+            'status raw': self._luxtronik.get_value(self._sensor_handle),
+            'EVU first start time': _evu_time_text(self._first_evu_start_time),
+            'EVU first end time': _evu_time_text(self._first_evu_end_time),
+            'EVU second start time': _evu_time_text(self._second_evu_start_time),
+            'EVU second end time': _evu_time_text(self._second_evu_end_time),
+            'EVU minutes until next event': '' if evu_event_minutes is None else str(evu_event_minutes),
+        }
 
-    def _build_status_text(self) -> str:
-        status_time = self._get_sensor_attr(
-            f"sensor.{DOMAIN}_status_time", ATTR_STATUS_TEXT
-        )
-        line_1 = self._get_sensor_value(f"sensor.{DOMAIN}_status_line_1")
-        line_2 = self._get_sensor_value(f"sensor.{DOMAIN}_status_line_2")
-        if (
-            status_time is None
-            or status_time == STATE_UNAVAILABLE
-            or line_1 is None
-            or line_1 == STATE_UNAVAILABLE
-            or line_2 is None
-            or line_2 == STATE_UNAVAILABLE
-        ):
+    def _build_status_text(self, value, evu_event_minutes: int | None) -> str:
+        status_time = _status_time_text(self._luxtronik.get_value(LUX_SENSOR_STATUS_TIME))
+        line_1 = _status1_value(self._luxtronik, self._luxtronik.get_value(LUX_SENSOR_STATUS1))
+        line_2 = self._luxtronik.get_value(LUX_SENSOR_STATUS2)
+        if status_time is None or line_1 is None or line_2 is None:
             return ""
         lang = self.hass.config.language
         line_1 = get_sensor_value_text(lang, f"{DOMAIN}__status_line_1", line_1)
         line_2 = get_sensor_value_text(lang, f"{DOMAIN}__status_line_2", line_2)
         # Show evu end time if available
-        evu_event_minutes = self._calc_next_evu_event_minutes()
         if evu_event_minutes is None:
             pass
-        elif self.native_value == LUX_STATUS_EVU:
+        elif value == LUX_STATUS_EVU:
             evu_until = get_sensor_text(lang, 'evu_until').format(evu_time=evu_event_minutes)
             return f"{evu_until} {line_1} {line_2} {status_time}."
         elif evu_event_minutes <= 30:
@@ -1105,21 +1198,15 @@ class LuxtronikStatusSensor(LuxtronikSensor, RestoreEntity):
             return f"{line_1} {line_2} {status_time}. {evu_in}"
         return f"{line_1} {line_2} {status_time}."
 
-    def _calc_next_evu_event_minutes_text(self) -> str:
-        minutes = self._calc_next_evu_event_minutes()
-        return '' if minutes is None else str(minutes)
-
-    def _calc_next_evu_event_minutes(self) -> int:
-        evu_time = self._get_next_evu_event_time()
-        time_now = time(datetime.now().hour, datetime.now().minute)
+    def _calc_next_evu_event_minutes(self, time_now: time) -> int:
+        evu_time = self._get_next_evu_event_time(time_now)
         if evu_time is None:
             return None
         evu_hours = (24 if evu_time < time_now else 0) + evu_time.hour
         return (evu_hours - time_now.hour) * 60 + evu_time.minute - time_now.minute
 
-    def _get_next_evu_event_time(self) -> time:
+    def _get_next_evu_event_time(self, time_now: time) -> time:
         event: time = None
-        time_now = time(datetime.now().hour, datetime.now().minute)
         for evu_time in [self._first_evu_start_time, self._first_evu_end_time, self._second_evu_start_time, self._second_evu_end_time]:
             if evu_time is None:
                 continue
@@ -1133,19 +1220,13 @@ class LuxtronikStatusSensor(LuxtronikSensor, RestoreEntity):
                     event = evu_time
         return event
 
-    @property
-    def extra_state_attributes(self) -> dict[str, str]:
-        """Return the state attributes of the device."""
-        return {
-            ATTR_STATUS_TEXT: self._build_status_text(),
-            ATTR_EXTRA_STATE_ATTRIBUTE_LUXTRONIK_KEY: self._sensor_key,
-            'status raw': self._luxtronik.get_value(self._sensor_key),
-            'EVU first start time': '' if self._first_evu_start_time is None else self._first_evu_start_time.strftime('%H:%M'),
-            'EVU first end time': '' if self._first_evu_end_time is None else self._first_evu_end_time.strftime('%H:%M'),
-            'EVU second start time': '' if self._second_evu_start_time is None else self._second_evu_start_time.strftime('%H:%M'),
-            'EVU second end time': '' if self._second_evu_end_time is None else self._second_evu_end_time.strftime('%H:%M'),
-            'EVU minutes until next event': self._calc_next_evu_event_minutes_text(),
-        }
+    @callback
+    def _async_minute_tick(self, now: datetime) -> None:
+        """Count the minutes until the next EVU event down."""
+        if self._get_next_evu_event_time(_time_now()) is None:
+            return
+        self._update_attributes(self.native_value, _time_now())
+        self.async_write_ha_state()
 
     def _restore_value(self, value: str) -> time:
         if value is None or ':' not in value:
@@ -1156,6 +1237,9 @@ class LuxtronikStatusSensor(LuxtronikSensor, RestoreEntity):
     async def async_added_to_hass(self) -> None:
         """Handle entity which will be added."""
         await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_change(self.hass, self._async_minute_tick, second=0)
+        )
         state = await self.async_get_last_state()
         if not state:
             return
@@ -1166,15 +1250,7 @@ class LuxtronikStatusSensor(LuxtronikSensor, RestoreEntity):
             self._first_evu_end_time = self._restore_value(state.attributes['EVU first end time'])
             self._second_evu_start_time = self._restore_value(state.attributes['EVU second start time'])
             self._second_evu_end_time = self._restore_value(state.attributes['EVU second end time'])
-
-        DATA_UPDATED = f"{DOMAIN}_data_updated"
-        async_dispatcher_connect(
-            self.hass, DATA_UPDATED, self._schedule_immediate_update
-        )
-
-    @callback
-    def _schedule_immediate_update(self):
-        self.async_schedule_update_ha_state(True)
+            self._update_attributes(self.native_value, _time_now())
 
 
 def add_sensor_if_active(luxtronik, entities, check_key: str, sensor: LuxtronikSensor):
@@ -1187,3 +1263,88 @@ def add_sensor_if_active(luxtronik, entities, check_key: str, sensor: LuxtronikS
 def add_sensor_if_min_minor_version(luxtronik, entities, min_minor: int, sensor: LuxtronikSensor):
     if luxtronik.firmware_version_minor >= min_minor:
         entities += [sensor]
+
+
+class LuxtronikMetricSensor(CoordinatorEntity[LuxtronikCoordinator], SensorEntity):
+    """Diagnostic sensor with the rolling mean of a communication metric."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        coordinator: LuxtronikCoordinator,
+        device_info: DeviceInfo,
+        metric: str,
+        name: str,
+        unit_of_measurement: str = UnitOfTime.MILLISECONDS,
+        factor: float = 1000,
+        icon: str = "mdi:timer-outline",
+    ) -> None:
+        """Initialize the sensor, factor converts the recorded samples."""
+        super().__init__(coordinator)
+        self._histogram = coordinator.luxtronik.metrics.histograms[metric]
+        self._factor = factor
+        self.entity_id = ENTITY_ID_FORMAT.format(f"{coordinator.entity_prefix}_metric_{metric}")
+        self._attr_unique_id = self.entity_id
+        self._attr_device_info = device_info
+        self._attr_name = name
+        self._attr_icon = icon
+        self._attr_native_unit_of_measurement = unit_of_measurement
+
+    def _summary(self) -> dict:
+        return {
+            key: value if key == "count" else round(value * self._factor, 2)
+            for key, value in self._histogram.as_dict().items()
+        }
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the mean of the recent samples."""
+        return self._summary().get("mean")
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return count, last, min, percentiles and max of the recent samples."""
+        return self._summary()
+
+
+class LuxtronikThermalSensor(CoordinatorEntity[LuxtronikCoordinator], SensorEntity):
+    """Sensor with the mean thermal power or the COP of a window of the history."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        coordinator: LuxtronikCoordinator,
+        device_info: DeviceInfo,
+        window: str,
+        quantity: str,
+        name: str,
+        device_class: SensorDeviceClass | None = None,
+        unit_of_measurement: str | None = None,
+        icon: str | None = None,
+    ) -> None:
+        """Initialize the sensor, quantity is a field of ThermalSummary."""
+        super().__init__(coordinator)
+        self._window = window
+        self._quantity = quantity
+        self.entity_id = ENTITY_ID_FORMAT.format(
+            f"{coordinator.entity_prefix}_{quantity}_{window}"
+        )
+        self._attr_unique_id = self.entity_id
+        self._attr_device_info = device_info
+        self._attr_name = name
+        self._attr_icon = icon
+        self._attr_device_class = device_class
+        self._attr_native_unit_of_measurement = unit_of_measurement
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the value computed on the last poll."""
+        summary = self.coordinator.thermal.get(self._window)
+        if summary is None:
+            return None
+        value = getattr(summary, self._quantity)
+        return None if value is None else round(value, 2)
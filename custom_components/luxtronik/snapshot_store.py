@@ -0,0 +1,114 @@
+"""Persist the last raw values of a Luxtronik heatpump for a fast start."""
+# region Imports
+import os
+import struct
+import tempfile
+import time
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import STORAGE_DIR
+
+from .const import DOMAIN, LOGGER, LuxGroup
+
+# endregion Imports
+
+SNAPSHOT_MAGIC = b"LUXS"
+SNAPSHOT_VERSION = 1
+# Magic, version, number of groups, save time.
+_HEADER = struct.Struct(">4sBBd")
+# Group, frame length in bytes, followed by the big-endian frame as read.
+_GROUP_HEADER = struct.Struct(">BI")
+
+
+class LuxtronikSnapshotStore:
+    """Binary file with the raw frames of all tables of a heatpump.
+
+    The frames are stored exactly as the heatpump sent them, so loading a
+    snapshot takes the same path as a read.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store of a config entry."""
+        self._hass = hass
+        self.path = hass.config.path(STORAGE_DIR, f"{DOMAIN}.{entry_id}.snapshot")
+
+    async def async_load(self) -> dict[LuxGroup, bytes] | None:
+        """Return the frames of the snapshot, None if there is no valid one."""
+        return await self._hass.async_add_executor_job(self._load)
+
+    async def async_save(self, frames: dict[LuxGroup, bytes]) -> None:
+        """Replace the snapshot with the frames."""
+        if frames:
+            await self._hass.async_add_executor_job(self._save, frames)
+
+    async def async_remove(self) -> None:
+        """Delete the snapshot."""
+        await self._hass.async_add_executor_job(self._remove)
+
+    def _load(self) -> dict[LuxGroup, bytes] | None:
+        try:
+            with open(self.path, "rb") as file:
+                content = file.read()
+        except FileNotFoundError:
+            return None
+        except OSError as err:
+            LOGGER.warning("Couldn't read luxtronik snapshot %s: %s", self.path, err)
+            return None
+        try:
+            return decode_snapshot(content)
+        except (ValueError, struct.error) as err:
+            LOGGER.warning("Ignoring invalid luxtronik snapshot %s: %s", self.path, err)
+            return None
+
+    def _save(self, frames: dict[LuxGroup, bytes]) -> None:
+        directory = os.path.dirname(self.path)
+        # Write a temporary file and rename it, a crash never leaves half a snapshot.
+        temp_path = None
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=directory, delete=False) as file:
+                temp_path = file.name
+                file.write(encode_snapshot(frames))
+            os.replace(temp_path, self.path)
+        except OSError as err:
+            LOGGER.warning("Couldn't write luxtronik snapshot %s: %s", self.path, err)
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _remove(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def encode_snapshot(frames: dict[LuxGroup, bytes], timestamp: float | None = None) -> bytes:
+    """Return the binary snapshot of the frames."""
+    parts = [
+        _HEADER.pack(
+            SNAPSHOT_MAGIC,
+            SNAPSHOT_VERSION,
+            len(frames),
+            time.time() if timestamp is None else timestamp,
+        )
+    ]
+    for group, frame in frames.items():
+        parts += [_GROUP_HEADER.pack(group, len(frame)), frame]
+    return b"".join(parts)
+
+
+def decode_snapshot(content: bytes) -> dict[LuxGroup, bytes]:
+    """Return the frames of a binary snapshot, raise ValueError if it is invalid."""
+    magic, version, count, _ = _HEADER.unpack_from(content)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        raise ValueError(f"unknown format {magic!r} version {version}")
+    offset = _HEADER.size
+    frames = {}
+    for _ in range(count):
+        group, length = _GROUP_HEADER.unpack_from(content, offset)
+        offset += _GROUP_HEADER.size
+        if offset + length > len(content):
+            raise ValueError("truncated frame")
+        frames[LuxGroup(group)] = content[offset:offset + length]
+        offset += length
+    return frames
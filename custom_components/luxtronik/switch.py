@@ -6,17 +6,19 @@ from homeassistant.components.binary_sensor import BinarySensorDeviceClass
 from homeassistant.components.sensor import ENTITY_ID_FORMAT
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from . import LuxtronikDevice
-from .const import (ATTR_EXTRA_STATE_ATTRIBUTE_LUXTRONIK_KEY, DOMAIN, LOGGER,
+from . import get_entry_data
+from .const import (ATTR_EXTRA_STATE_ATTRIBUTE_LUXTRONIK_KEY, LOGGER,
                     LUX_SENSOR_EFFICIENCY_PUMP, LUX_SENSOR_HEATING_THRESHOLD,
                     LUX_SENSOR_MODE_COOLING, LUX_SENSOR_MODE_DOMESTIC_WATER,
                     LUX_SENSOR_MODE_HEATING, LUX_SENSOR_PUMP_OPTIMIZATION,
                     LUX_SENSOR_REMOTE_MAINTENANCE, LuxMode)
+from .coordinator import LuxtronikCoordinator
 from .helpers.helper import get_sensor_text
 
 # endregion Imports
@@ -35,70 +37,71 @@ async def async_setup_entry(
     """Set up a Luxtronik sensor from ConfigEntry."""
     LOGGER.info(
         "luxtronik2.switch.async_setup_entry ConfigType: %s", config_entry)
-    luxtronik: LuxtronikDevice = hass.data.get(DOMAIN)
-    if not luxtronik:
+    entry_data = get_entry_data(hass, config_entry.entry_id)
+    if not entry_data:
         LOGGER.warning("switch.async_setup_entry no luxtronik!")
         return False
+    coordinator = entry_data.coordinator
 
     # Build Sensor names with local language:
     lang = hass.config.language
     entities = []
 
-    device_info = hass.data[f"{DOMAIN}_DeviceInfo"]
+    device_info = entry_data.device_info
     text_remote_maintenance = get_sensor_text(lang, 'remote_maintenance')
     text_pump_optimization = get_sensor_text(lang, 'pump_optimization')
     text_efficiency_pump = get_sensor_text(lang, 'efficiency_pump')
     text_pump_heat_control = get_sensor_text(lang, 'pump_heat_control')
     entities += [
         LuxtronikSwitch(
-            hass=hass, luxtronik=luxtronik, device_info=device_info,
+            hass=hass, coordinator=coordinator, device_info=device_info,
             sensor_key=LUX_SENSOR_REMOTE_MAINTENANCE, unique_id='remote_maintenance',
             name=f"{text_remote_maintenance}", icon='mdi:remote-desktop',
             device_class=BinarySensorDeviceClass.HEAT, entity_category=EntityCategory.CONFIG),
         LuxtronikSwitch(
-            hass=hass, luxtronik=luxtronik, device_info=device_info,
+            hass=hass, coordinator=coordinator, device_info=device_info,
             sensor_key=LUX_SENSOR_EFFICIENCY_PUMP, unique_id='efficiency_pump',
             name=f"{text_efficiency_pump}", icon='mdi:leaf-circle',
             device_class=BinarySensorDeviceClass.HEAT, entity_category=EntityCategory.CONFIG),
         LuxtronikSwitch(
-            hass=hass, luxtronik=luxtronik, device_info=device_info,
+            hass=hass, coordinator=coordinator, device_info=device_info,
             sensor_key='parameters.ID_Einst_P155_PumpHeatCtrl', unique_id='pump_heat_control',
             name=text_pump_heat_control, icon='mdi:pump',
             device_class=BinarySensorDeviceClass.HEAT, entity_category=EntityCategory.CONFIG,
             entity_registry_enabled_default=False),
     ]
 
-    deviceInfoHeating = hass.data[f"{DOMAIN}_DeviceInfo_Heating"]
+    deviceInfoHeating = entry_data.device_info_heating
     if deviceInfoHeating is not None:
         text_heating_mode = get_sensor_text(lang, 'heating_mode_auto')
         text_heating_threshold = get_sensor_text(lang, 'heating_threshold')
         entities += [
             LuxtronikSwitch(
-                hass=hass, luxtronik=luxtronik, device_info=deviceInfoHeating,
+                hass=hass, coordinator=coordinator, device_info=deviceInfoHeating,
                 sensor_key=LUX_SENSOR_PUMP_OPTIMIZATION, unique_id='pump_optimization',
                 name=text_pump_optimization, icon='mdi:tune',
                 device_class=BinarySensorDeviceClass.HEAT, entity_category=EntityCategory.CONFIG),
             LuxtronikSwitch(
                 on_state=LuxMode.automatic.value, off_state=LuxMode.off.value,
-                hass=hass, luxtronik=luxtronik, device_info=deviceInfoHeating,
+                hass=hass, coordinator=coordinator, device_info=deviceInfoHeating,
                 sensor_key=LUX_SENSOR_MODE_HEATING, unique_id='heating',
                 name=text_heating_mode, icon='mdi:radiator', icon_off='mdi:radiator-off',
                 device_class=BinarySensorDeviceClass.HEAT),
             LuxtronikSwitch(
-                hass=hass, luxtronik=luxtronik, device_info=deviceInfoHeating,
+                hass=hass, coordinator=coordinator, device_info=deviceInfoHeating,
                 sensor_key=LUX_SENSOR_HEATING_THRESHOLD, unique_id='heating_threshold',
                 name=f"{text_heating_threshold}", icon='mdi:download-outline',
                 device_class=BinarySensorDeviceClass.HEAT, entity_category=EntityCategory.CONFIG)
         ]
 
-    deviceInfoDomesticWater = hass.data[f"{DOMAIN}_DeviceInfo_Domestic_Water"]
+    deviceInfoDomesticWater = entry_data.device_info_domestic_water
     if deviceInfoDomesticWater is not None:
         text_domestic_water_mode_auto = get_sensor_text(
             lang, 'domestic_water_mode_auto')
         entities += [
             LuxtronikSwitch(
                 on_state=LuxMode.automatic.value, off_state=LuxMode.off.value,
-                hass=hass, luxtronik=luxtronik,
+                hass=hass, coordinator=coordinator,
                 device_info=deviceInfoDomesticWater,
                 sensor_key=LUX_SENSOR_MODE_DOMESTIC_WATER,
                 unique_id='domestic_water',
@@ -106,14 +109,14 @@ async def async_setup_entry(
                 device_class=BinarySensorDeviceClass.HEAT),
         ]
 
-    deviceInfoCooling = hass.data[f"{DOMAIN}_DeviceInfo_Cooling"]
+    deviceInfoCooling = entry_data.device_info_cooling
     if deviceInfoCooling is not None:
         text_cooling_mode_auto = get_sensor_text(
             lang, 'cooling_mode_auto')
         entities += [
             LuxtronikSwitch(
                 on_state=LuxMode.automatic.value, off_state=LuxMode.off.value,
-                hass=hass, luxtronik=luxtronik,
+                hass=hass, coordinator=coordinator,
                 device_info=deviceInfoCooling,
                 sensor_key=LUX_SENSOR_MODE_COOLING,
                 unique_id='cooling',
@@ -125,12 +128,12 @@ async def async_setup_entry(
 # endregion Setup
 
 
-class LuxtronikSwitch(SwitchEntity, RestoreEntity):
+class LuxtronikSwitch(CoordinatorEntity[LuxtronikCoordinator], SwitchEntity, RestoreEntity):
     """Representation of a Luxtronik switch."""
 
     def __init__(
         self,
-        luxtronik: LuxtronikDevice,
+        coordinator: LuxtronikCoordinator,
         device_info: DeviceInfo,
         sensor_key: str,
         unique_id: str,
@@ -145,9 +148,11 @@ class LuxtronikSwitch(SwitchEntity, RestoreEntity):
         **kwargs: Any,
     ) -> None:
         """Initialize a new Luxtronik switch."""
-        self._luxtronik = luxtronik
+        super().__init__(coordinator)
+        self._luxtronik = coordinator.luxtronik
         self._sensor_key = sensor_key
-        self.entity_id = ENTITY_ID_FORMAT.format(f"{DOMAIN}_{unique_id}")
+        self._sensor_handle = self._luxtronik.register_key(sensor_key)
+        self.entity_id = ENTITY_ID_FORMAT.format(f"{coordinator.entity_prefix}_{unique_id}")
         self._attr_unique_id = self.entity_id
         self._attr_device_info = device_info
         self._attr_name = name
@@ -159,24 +164,30 @@ class LuxtronikSwitch(SwitchEntity, RestoreEntity):
         self._off_state = off_state
         self._attr_extra_state_attributes = {ATTR_EXTRA_STATE_ATTRIBUTE_LUXTRONIK_KEY: sensor_key}
 
-    def turn_on(self, **kwargs: Any) -> None:
+    async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
-        self._luxtronik.write(self._sensor_key.split(
+        await self.coordinator.async_write(self._sensor_key.split(
             '.')[1], self._on_state, use_debounce=False,
             update_immediately_after_write=True)
-        self.schedule_update_ha_state(force_refresh=True)
+        self.async_write_ha_state()
 
-    def turn_off(self, **kwargs: Any) -> None:
+    async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the switch off."""
-        self._luxtronik.write(self._sensor_key.split(
+        await self.coordinator.async_write(self._sensor_key.split(
             '.')[1], self._off_state, use_debounce=False,
             update_immediately_after_write=True)
-        self.schedule_update_ha_state(force_refresh=True)
+        self.async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if self.coordinator.has_changed([self._sensor_handle]):
+            super()._handle_coordinator_update()
 
     @property
     def is_on(self):
         """Return true if binary sensor is on."""
-        value = self._luxtronik.get_value(self._sensor_key) == self._on_state
+        value = self._luxtronik.get_value(self._sensor_handle) == self._on_state
         return value
 
     @property
@@ -187,7 +198,3 @@ class LuxtronikSwitch(SwitchEntity, RestoreEntity):
         if self._attr_icon is None:
             super().icon
         return self._attr_icon
-
-    def update(self):
-        """Get the latest status and use it to update our sensor state."""
-        self._luxtronik.update()
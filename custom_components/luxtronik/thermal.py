@@ -0,0 +1,139 @@
+"""Thermal power and COP of a Luxtronik heatpump over its history."""
+# region Imports
+from collections.abc import Mapping
+from datetime import timedelta
+import time
+from typing import Final, NamedTuple
+
+import numpy as np
+
+from .const import (
+    COP_MIN_ELECTRICAL_POWER,
+    HEAT_CAPACITY_WATER,
+    LUX_SENSOR_FLOW_HEAT_SOURCE,
+    LUX_SENSOR_FLOW_HEATING,
+    LUX_SENSOR_FLOW_TEMPERATURE,
+    LUX_SENSOR_HEAT_OUTPUT,
+    LUX_SENSOR_HEAT_SOURCE_INPUT,
+    LUX_SENSOR_HEAT_SOURCE_OUTPUT,
+    LUX_SENSOR_RETURN_TEMPERATURE,
+    THERMAL_KEYS,
+)
+from .history import LuxtronikHistory
+
+# endregion Imports
+
+ELECTRICAL_POWER: Final = "electrical_power"
+
+
+class ThermalSummary(NamedTuple):
+    """Mean powers in W and the COP of a window, None without valid samples."""
+
+    thermal_power: float | None
+    source_power: float | None
+    electrical_power: float | None
+    cop: float | None
+
+
+class LuxtronikThermalEngine:
+    """Compute thermal power and COP over several windows of the history at once.
+
+    The thermal power is flow x heat capacity x (flow - return temperature),
+    Heat_Output is used where the heatpump has no heat meter flow. The
+    electrical power comes from an external meter history if there is one,
+    else from the energy balance thermal power - heat source power.
+    Every sample holds until the next one, the last one until now.
+    """
+
+    def __init__(
+        self, history: LuxtronikHistory, electrical_power: LuxtronikHistory | None = None
+    ) -> None:
+        """Initialize the engine, electrical_power has the key ELECTRICAL_POWER."""
+        self._history = history
+        self._electrical_power = electrical_power
+
+    def compute(
+        self, windows: Mapping[str, timedelta], now: float | None = None
+    ) -> dict[str, ThermalSummary]:
+        """Return the summary of every window."""
+        now = time.time() if now is None else now
+        duration = max(windows.values())
+        starts = np.array([now - window.total_seconds() for window in windows.values()])
+
+        times, columns = self._columns(duration, now)
+        if times.size == 0:
+            return {name: ThermalSummary(None, None, None, None) for name in windows}
+        weights = _weights(times, starts, now)
+        thermal = np.where(
+            np.isnan(columns[LUX_SENSOR_FLOW_HEATING]),
+            columns[LUX_SENSOR_HEAT_OUTPUT],
+            _power(
+                columns[LUX_SENSOR_FLOW_HEATING],
+                columns[LUX_SENSOR_FLOW_TEMPERATURE] - columns[LUX_SENSOR_RETURN_TEMPERATURE],
+            ),
+        )
+        source = _power(
+            columns[LUX_SENSOR_FLOW_HEAT_SOURCE],
+            columns[LUX_SENSOR_HEAT_SOURCE_INPUT] - columns[LUX_SENSOR_HEAT_SOURCE_OUTPUT],
+        )
+        thermal_mean = _mean(weights, thermal)
+        source_mean = _mean(weights, source)
+        if self._electrical_power is None:
+            electrical_mean = _mean(weights, thermal - source)
+        else:
+            meter_times, meter_values = map(
+                np.frombuffer, self._electrical_power.window(ELECTRICAL_POWER, duration, now)
+            )
+            electrical_mean = (
+                _mean(_weights(meter_times, starts, now), meter_values)
+                if meter_times.size
+                else np.full(starts.size, np.nan)
+            )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cop = np.where(
+                electrical_mean >= COP_MIN_ELECTRICAL_POWER, thermal_mean / electrical_mean, np.nan
+            )
+        return {
+            name: ThermalSummary(
+                _value(thermal_mean[index]),
+                _value(source_mean[index]),
+                _value(electrical_mean[index]),
+                _value(cop[index]),
+            )
+            for index, name in enumerate(windows)
+        }
+
+    def _columns(
+        self, duration: timedelta, now: float
+    ) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+        """Return the timestamps and the values of the thermal keys inside the window."""
+        # The windows are copies already, frombuffer only wraps them.
+        times = np.frombuffer(self._history.window(THERMAL_KEYS[0], duration, now)[0])
+        columns = {
+            key: np.frombuffer(self._history.window(key, duration, now)[1])
+            for key in THERMAL_KEYS
+        }
+        return times, columns
+
+
+def _power(flow: np.ndarray, spread: np.ndarray) -> np.ndarray:
+    """Return the power in W of a water flow in l/h with a temperature spread in K."""
+    return flow / 3600 * HEAT_CAPACITY_WATER * spread
+
+
+def _weights(times: np.ndarray, starts: np.ndarray, now: float) -> np.ndarray:
+    """Return the seconds every sample holds inside every window, windows x samples."""
+    ends = np.append(times[1:], now)
+    return np.clip(ends - np.maximum(times, starts[:, np.newaxis]), 0, None)
+
+
+def _mean(weights: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Return the time weighted mean per window, skipping NaN samples."""
+    valid = ~np.isnan(values)
+    seconds = weights @ valid
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(seconds > 0, (weights @ np.where(valid, values, 0)) / seconds, np.nan)
+
+
+def _value(value: float) -> float | None:
+    return None if np.isnan(value) else float(value)
@@ -17,7 +17,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import LuxtronikDevice, LuxtronikEntityDescription
+from . import LuxtronikDevice, LuxtronikEntityDescription, get_entry_data
 from .const import (DOMAIN, DOWNLOAD_PORTAL_URL, LOGGER,
                     LUX_MODELS_AlphaInnotec, LUX_MODELS_Novelan,
                     LUX_MODELS_Other)
@@ -40,8 +40,8 @@ async def async_setup_entry(
     """Set up Luxtronik update platform."""
 
     LOGGER.debug("Setting up Luxtronik update entity")
-    luxtronik_device: LuxtronikDevice = hass.data.get(DOMAIN)
-    luxtronik_device.read()
+    entry_data = get_entry_data(hass, config_entry.entry_id)
+    luxtronik_device: LuxtronikDevice = entry_data.luxtronik
 
     description = LuxtronikUpdateEntityDescription(
         luxtronik_key="calculations.ID_WEB_SoftStand",
@@ -49,7 +49,8 @@ async def async_setup_entry(
         entity_category=EntityCategory.CONFIG,
     )
     update_entity = LuxtronikUpdateEntity(
-        entry=config_entry, luxtronik_device=luxtronik_device, description=description, device_info=hass.data[f"{DOMAIN}_DeviceInfo"]
+        entry=config_entry, luxtronik_device=luxtronik_device, description=description, device_info=entry_data.device_info,
+        entity_prefix=entry_data.coordinator.entity_prefix,
     )
     entities = [update_entity]
 
@@ -69,7 +70,8 @@ class LuxtronikUpdateEntity(UpdateEntity):
         entry: ConfigEntry,
         luxtronik_device: LuxtronikDevice,
         description: LuxtronikUpdateEntityDescription,
-        device_info
+        device_info,
+        entity_prefix: str = DOMAIN,
     ) -> None:
         """Initialize the Luxtronik."""
         super().__init__()
@@ -81,11 +83,9 @@ class LuxtronikUpdateEntity(UpdateEntity):
         self.luxtronik_key = description.luxtronik_key
 
         self._attr_name = "Luxtronik Firmware"
-        luxtronik_device.read()
         # self._attr_state = luxtronik_device.get_value(description.luxtronik_key)
-        prefix = DOMAIN
         self.entity_id = ENTITY_ID_FORMAT.format(
-            f"{prefix}_{description.key}"
+            f"{entity_prefix}_{description.key}"
         )
         self._attr_unique_id = self.entity_id
         self._request_available_firmware_version()
@@ -0,0 +1,122 @@
+"""Debounced asyncio write queue for Luxtronik parameters."""
+# region Imports
+import asyncio
+from datetime import datetime
+from functools import partial
+from typing import Any, Awaitable, Callable
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import LOGGER, WRITE_CONFIRM_DELAY, WRITE_DEBOUNCE_DELAY, LuxGroup
+from .luxtronik_device import LuxtronikDevice
+
+# endregion Imports
+
+
+class LuxtronikWriteQueue:
+    """Debounce writes per parameter.
+
+    Every parameter is sent once it was not changed for a while, independent
+    of the other queued parameters.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        luxtronik: LuxtronikDevice,
+        async_read_back: Callable[[], Awaitable[None]],
+        async_notify: Callable[[set[tuple[LuxGroup, int]]], None],
+    ) -> None:
+        """Initialize the write queue.
+
+        async_read_back reads back written values, async_notify updates the
+        listeners of values shown differently after a failed write.
+        """
+        self._hass = hass
+        self._luxtronik = luxtronik
+        self._async_read_back = async_read_back
+        self._async_notify = async_notify
+        self._pending: dict[str, Any] = {}
+        self._timers: dict[str, CALLBACK_TYPE] = {}
+        self._confirm_read: set[str] = set()
+        self._cancel_confirm_read: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_queue(
+        self, parameter: str, value: Any, update_immediately_after_write: bool = False
+    ) -> None:
+        """Queue a write, it is sent when the parameter was not changed for a while."""
+        self._pending[parameter] = value
+        if update_immediately_after_write:
+            self._confirm_read.add(parameter)
+        self._cancel_timer(parameter)
+        self._timers[parameter] = async_call_later(
+            self._hass,
+            WRITE_DEBOUNCE_DELAY,
+            partial(self._async_debounce_elapsed, parameter),
+        )
+
+    async def async_write(
+        self, parameters: dict[str, Any], update_immediately_after_write: bool = False
+    ) -> None:
+        """Write parameters now in one batch, their queued writes are superseded."""
+        confirm_read = update_immediately_after_write
+        for parameter in parameters:
+            self._cancel_timer(parameter)
+            self._pending.pop(parameter, None)
+            if parameter in self._confirm_read:
+                self._confirm_read.discard(parameter)
+                confirm_read = True
+        await self._async_send(parameters, confirm_read)
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Drop pending writes and cancel all timers."""
+        for cancel in self._timers.values():
+            cancel()
+        self._timers.clear()
+        self._pending.clear()
+        self._confirm_read.clear()
+        if self._cancel_confirm_read is not None:
+            self._cancel_confirm_read()
+            self._cancel_confirm_read = None
+
+    def _cancel_timer(self, parameter: str) -> None:
+        if (cancel := self._timers.pop(parameter, None)) is not None:
+            cancel()
+
+    async def _async_send(self, parameters: dict[str, Any], confirm_read: bool) -> None:
+        if not parameters:
+            return
+        try:
+            await self._luxtronik.async_write_batch(parameters)
+        except BaseException:
+            # Show the read values again instead of the rejected ones.
+            self._async_notify(self._luxtronik.discard_optimistic(parameters))
+            raise
+        if confirm_read:
+            self._schedule_confirm_read()
+
+    async def _async_debounce_elapsed(self, parameter: str, _now: datetime) -> None:
+        self._timers.pop(parameter, None)
+        value = self._pending.pop(parameter)
+        confirm_read = parameter in self._confirm_read
+        self._confirm_read.discard(parameter)
+        try:
+            await self._async_send({parameter: value}, confirm_read)
+        except (OSError, asyncio.IncompleteReadError, TimeoutError) as err:
+            LOGGER.warning("Couldn't write luxtronik parameter %s: %s", parameter, err)
+
+    @callback
+    def _schedule_confirm_read(self) -> None:
+        # Give the heatpump time to apply the values before reading them back.
+        if self._cancel_confirm_read is not None:
+            self._cancel_confirm_read()
+        self._cancel_confirm_read = async_call_later(
+            self._hass, WRITE_CONFIRM_DELAY, self._async_confirm_read
+        )
+
+    async def _async_confirm_read(self, _now: datetime) -> None:
+        self._cancel_confirm_read = None
+        await self._async_read_back()
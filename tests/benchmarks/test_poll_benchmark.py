@@ -0,0 +1,177 @@
+"""Benchmarks for the poll-to-state path of all platforms.
+
+Run against the controller simulator with:
+    pytest tests/benchmarks --benchmark-autosave
+and compare a change against the stored baseline in .benchmarks with:
+    pytest tests/benchmarks --benchmark-compare --benchmark-compare-fail=mean:25%
+
+Executor time and allocations per cycle are stored in extra_info of the
+saved results.
+"""
+# region Imports
+import time
+import tracemalloc
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import async_get_platforms
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.luxtronik import get_entry_data
+from custom_components.luxtronik.const import (
+    CONF_CONTROL_MODE_HOME_ASSISTANT,
+    CONF_HA_SENSOR_INDOOR_TEMPERATURE,
+    CONF_LOCK_TIMEOUT,
+    CONF_SAFE,
+    CONF_UPDATE_IMMEDIATELY_AFTER_WRITE,
+    DOMAIN,
+)
+
+from ..luxtronik_simulator import LuxtronikSimulator
+
+# endregion Imports
+
+ROUNDS = 50
+
+
+@pytest.fixture
+def simulator(socket_enabled):
+    """Run a simulator with some realistic values."""
+    simulator = LuxtronikSimulator()
+    simulator.set_value("calculations", "ID_WEB_Temperatur_TVL", 35.0)
+    simulator.set_value("calculations", "ID_WEB_Temperatur_TRL", 30.0)
+    simulator.set_value("calculations", "ID_WEB_Temperatur_TA", 5.0)
+    simulator.set_value("calculations", "ID_WEB_Temperatur_TBW", 48.0)
+    simulator.start_in_thread()
+    yield simulator
+    simulator.stop_thread()
+
+
+@pytest.fixture
+def entry(hass: HomeAssistant, simulator: LuxtronikSimulator):
+    """Set up the integration against the simulator."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=2,
+        data={
+            "host": simulator.host,
+            "port": simulator.port,
+            CONF_SAFE: False,
+            CONF_LOCK_TIMEOUT: 30,
+            CONF_UPDATE_IMMEDIATELY_AFTER_WRITE: True,
+            CONF_CONTROL_MODE_HOME_ASSISTANT: False,
+            CONF_HA_SENSOR_INDOOR_TEMPERATURE: "sensor.indoor_temperature",
+        },
+    )
+    entry.add_to_hass(hass)
+    hass.loop.run_until_complete(_async_setup(hass, entry))
+    yield entry
+    hass.loop.run_until_complete(_async_unload(hass, entry))
+
+
+async def _async_setup(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def _async_unload(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+def _evaluate_entities(hass: HomeAssistant) -> int:
+    """Evaluate the state of every entity like the state machine does."""
+    count = 0
+    for platform in async_get_platforms(hass, DOMAIN):
+        for entity in platform.entities.values():
+            entity.state
+            entity.state_attributes
+            entity.extra_state_attributes
+            entity.icon
+            count += 1
+    return count
+
+
+class ExecutorTimer:
+    """Measure the time spent in executor jobs."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Wrap hass.async_add_executor_job."""
+        self.seconds = 0.0
+        self.jobs = 0
+        self._async_add_executor_job = hass.async_add_executor_job
+        hass.async_add_executor_job = self._timed_job
+
+    def _timed_job(self, target, *args):
+        def run():
+            start = time.perf_counter()
+            try:
+                return target(*args)
+            finally:
+                self.seconds += time.perf_counter() - start
+
+        self.jobs += 1
+        return self._async_add_executor_job(run)
+
+
+def _poll_cycle(hass: HomeAssistant, simulator: LuxtronikSimulator, step: list[int]):
+    """Change a value on the controller, poll and render all entities."""
+    step[0] += 1
+    simulator.set_value("calculations", "ID_WEB_Temperatur_TVL", 35.0 + step[0] % 10)
+    coordinator = get_entry_data(hass).coordinator
+
+    async def cycle():
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    hass.loop.run_until_complete(cycle())
+    return _evaluate_entities(hass)
+
+
+def test_poll_cycle(benchmark, hass: HomeAssistant, simulator, entry):
+    """Benchmark one poll cycle including the state of all entities."""
+    timer = ExecutorTimer(hass)
+    step = [0]
+    entity_count = benchmark.pedantic(
+        _poll_cycle, args=(hass, simulator, step), rounds=ROUNDS, warmup_rounds=2
+    )
+    assert entity_count > 50
+    benchmark.extra_info["entities"] = entity_count
+    benchmark.extra_info["executor_jobs_per_cycle"] = timer.jobs / (ROUNDS + 2)
+    benchmark.extra_info["executor_seconds_per_cycle"] = timer.seconds / (ROUNDS + 2)
+
+
+def test_poll_cycle_allocations(benchmark, hass: HomeAssistant, simulator, entry):
+    """Record the allocations of one poll cycle."""
+    step = [0]
+    _poll_cycle(hass, simulator, step)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        benchmark.pedantic(_poll_cycle, args=(hass, simulator, step), rounds=1)
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    benchmark.extra_info["allocated_blocks"] = sum(
+        stat.count_diff for stat in stats if stat.count_diff > 0
+    )
+    benchmark.extra_info["peak_bytes"] = peak
+
+
+def test_render_entities(benchmark, hass: HomeAssistant, entry):
+    """Benchmark the native_value / is_on / attribute evaluation of all entities."""
+    entity_count = benchmark(_evaluate_entities, hass)
+    assert entity_count > 50
+
+
+def test_async_read(benchmark, hass: HomeAssistant, entry):
+    """Benchmark reading and decoding the tables from the controller."""
+    luxtronik = get_entry_data(hass, entry.entry_id).luxtronik
+
+    def read():
+        hass.loop.run_until_complete(luxtronik.async_read())
+
+    benchmark(read)
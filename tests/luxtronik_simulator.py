@@ -0,0 +1,259 @@
+"""Offline Luxtronik 2.x controller simulator for tests and benchmarks.
+
+Serves the parameter, calculation and visibility tables over the binary
+protocol on port 8889, accepts parameter writes and can add latency and
+packet loss. Tables can be filled from a diagnostics dump, see
+custom_components/luxtronik/diagnostics.py.
+
+Run standalone with:
+    python -m tests.luxtronik_simulator --dump diagnostics.json
+"""
+# region Imports
+import argparse
+import asyncio
+import datetime
+import json
+import random
+import struct
+import threading
+from typing import Any
+
+from luxtronik.calculations import Calculations
+from luxtronik.datatypes import Timestamp, Version
+from luxtronik.parameters import Parameters
+from luxtronik.visibilities import Visibilities
+
+# endregion Imports
+
+# region Constants
+DEFAULT_PORT = 8889
+
+CMD_WRITE_PARAMETER = 3002
+CMD_READ_PARAMETERS = 3003
+CMD_READ_CALCULATIONS = 3004
+CMD_READ_VISIBILITIES = 3005
+
+TABLES = {
+    "parameters": Parameters.parameters,
+    "calculations": Calculations.calculations,
+    "visibilities": Visibilities.visibilities,
+}
+VERSION_LENGTH = 9
+# endregion Constants
+
+
+class LuxtronikSimulator:
+    """Emulate a Luxtronik 2.x heatpump controller."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        loss: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize the simulator, port 0 picks a free port on start.
+
+        latency is added before every response in seconds, loss is the
+        probability that a request is dropped and the connection closed.
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.loss = loss
+        self.tables: dict[str, list[int]] = {
+            group: [0] * (max(items) + 1) for group, items in TABLES.items()
+        }
+        self.writes: list[tuple[int, int]] = []
+        self.requests = 0
+        self.connections = 0
+        self._random = random.Random(seed)
+        self._server: asyncio.Server | None = None
+        self._handlers: set[asyncio.Task] = set()
+        self.set_value("calculations", "ID_WEB_SoftStand", "V3.88.1")
+
+    # region Tables
+    def set_value(self, group: str, name: str | int, value: Any) -> None:
+        """Set a value in heatpump units converted by the luxtronik datatype."""
+        index, datatype = _lookup(group, name)
+        if isinstance(datatype, Version):
+            chars = [ord(char) for char in str(value)][:VERSION_LENGTH]
+            chars += [0] * (VERSION_LENGTH - len(chars))
+            self.tables[group][index:index + VERSION_LENGTH] = chars
+            return
+        self.tables[group][index] = _to_raw(datatype, value)
+
+    def set_raw(self, group: str, index: int, raw: int) -> None:
+        """Set a raw value, indexes beyond the table make it longer."""
+        table = self.tables[group]
+        if index >= len(table):
+            table.extend([0] * (index + 1 - len(table)))
+        table[index] = raw
+
+    def get_raw(self, group: str, index: int) -> int:
+        """Return a raw value."""
+        return self.tables[group][index]
+
+    def load_dump(self, dump: dict) -> None:
+        """Fill the tables from a diagnostics dump (the dict or the HA download)."""
+        if "data" in dump and "parameters" in dump["data"]:
+            dump = dump["data"]
+        for group in TABLES:
+            for key, text in dump.get(group, {}).items():
+                index = int(key.split()[0])
+                datatype = TABLES[group].get(index)
+                if datatype is None:
+                    continue
+                if index >= len(self.tables[group]):
+                    self.tables[group].extend([0] * (index + 1 - len(self.tables[group])))
+                self.set_value(group, index, _parse_dump_value(datatype, text))
+    # endregion Tables
+
+    # region Server
+    async def async_start(self) -> None:
+        """Start listening."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def async_stop(self) -> None:
+        """Stop listening and close all connections."""
+        if self._server is None:
+            return
+        self._server.close()
+        handlers = list(self._handlers)
+        for handler in handlers:
+            handler.cancel()
+        await asyncio.gather(*handlers)
+        await self._server.wait_closed()
+        self._server = None
+
+    def start_in_thread(self) -> None:
+        """Run the simulator on its own event loop, e.g. for blocking clients."""
+        started = threading.Event()
+        self._loop = asyncio.new_event_loop()
+
+        def run() -> None:
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.async_start())
+            started.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self.async_stop())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="luxtronik-simulator", daemon=True)
+        self._thread.start()
+        started.wait()
+
+    def stop_thread(self) -> None:
+        """Stop a simulator started with start_in_thread."""
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        self._handlers.add(asyncio.current_task())
+        try:
+            while True:
+                try:
+                    cmd, arg = struct.unpack(">ii", await reader.readexactly(8))
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                value = None
+                if cmd == CMD_WRITE_PARAMETER:
+                    (value,) = struct.unpack(">i", await reader.readexactly(4))
+                self.requests += 1
+                if self.loss and self._random.random() < self.loss:
+                    return
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                writer.write(self._response(cmd, arg, value))
+                await writer.drain()
+        except asyncio.CancelledError:
+            # Cancelled by async_stop.
+            return
+        finally:
+            self._handlers.discard(asyncio.current_task())
+            writer.close()
+
+    def _response(self, cmd: int, arg: int, value: int | None) -> bytes:
+        if cmd == CMD_WRITE_PARAMETER:
+            self.tables["parameters"][arg] = value
+            self.writes.append((arg, value))
+            return struct.pack(">ii", cmd, arg)
+        if cmd == CMD_READ_PARAMETERS:
+            values = self.tables["parameters"]
+            return struct.pack(f">ii{len(values)}i", cmd, len(values), *values)
+        if cmd == CMD_READ_CALCULATIONS:
+            values = self.tables["calculations"]
+            return struct.pack(f">iii{len(values)}i", cmd, 0, len(values), *values)
+        if cmd == CMD_READ_VISIBILITIES:
+            values = self.tables["visibilities"]
+            return struct.pack(f">ii{len(values)}b", cmd, len(values), *values)
+        return struct.pack(">i", 0)
+    # endregion Server
+
+
+def _lookup(group: str, name: str | int):
+    items = TABLES[group]
+    if isinstance(name, int):
+        return name, items.get(name)
+    for index, datatype in items.items():
+        if datatype.name == name:
+            return index, datatype
+    raise KeyError(f"{group}.{name}")
+
+
+def _parse_dump_value(datatype, text: str) -> Any:
+    if isinstance(datatype, Version):
+        return text
+    if isinstance(datatype, Timestamp):
+        return datetime.datetime.fromisoformat(text)
+    if text == "None":
+        return None
+    if text in ("True", "False"):
+        return text == "True"
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def _to_raw(datatype, value: Any) -> int:
+    if value is None:
+        return 0
+    raw = None
+    if datatype is not None:
+        try:
+            raw = datatype.to_heatpump(value)
+        except (TypeError, ValueError):
+            raw = None
+    try:
+        return int(float(value if raw is None else raw))
+    except (TypeError, ValueError):
+        return 0
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    simulator = LuxtronikSimulator(args.host, args.port, args.latency, args.loss)
+    if args.dump:
+        with open(args.dump, encoding="utf-8") as dump:
+            simulator.load_dump(json.load(dump))
+    await simulator.async_start()
+    print(f"Luxtronik simulator listening on {simulator.host}:{simulator.port}")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per response")
+    parser.add_argument("--loss", type=float, default=0.0, help="probability to drop a request")
+    parser.add_argument("--dump", help="diagnostics dump to replay")
+    try:
+        asyncio.run(_async_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,259 @@
+"""Test the coordinator only updates entities of changed values."""
+import struct
+from datetime import time, timedelta
+from unittest.mock import call, patch
+
+import pytest
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.luxtronik import get_entry_data
+from custom_components.luxtronik.const import (
+    CONF_CONTROL_MODE_HOME_ASSISTANT,
+    CONF_HA_SENSOR_INDOOR_TEMPERATURE,
+    CONF_LOCK_TIMEOUT,
+    CONF_PARAMETERS,
+    CONF_RETRIES,
+    CONF_SAFE,
+    CONF_UPDATE_IMMEDIATELY_AFTER_WRITE,
+    DOMAIN,
+    WRITE_CONFIRM_DELAY,
+    WRITE_DEBOUNCE_DELAY,
+)
+from custom_components.luxtronik.coordinator import LuxtronikCoordinator
+from custom_components.luxtronik.luxtronik_client import (
+    BREAKER_FAILURE_THRESHOLD,
+    LuxtronikCircuitBreaker,
+    LuxtronikUnavailableError,
+)
+from custom_components.luxtronik.luxtronik_device import LuxtronikDevice
+
+from .luxtronik_simulator import LuxtronikSimulator
+
+STATUS = f"sensor.{DOMAIN}_status"
+WATER_TARGET = f"number.{DOMAIN}_domestic_water_target_temperature"
+FLOW_IN_SENSOR = f"sensor.{DOMAIN}_flow_in_temperature"
+FLOW_IN = "calculations.ID_WEB_Temperatur_TVL"
+OUTDOOR = "calculations.ID_WEB_Temperatur_TA"
+
+
+@pytest.fixture
+def calculations() -> list[int]:
+    """Return the raw calculations the heatpump answers with."""
+    calculations = [0] * 20
+    calculations[10] = 350
+    calculations[15] = 50
+    return calculations
+
+
+@pytest.fixture
+async def coordinator(hass, calculations):
+    """Return a coordinator of a device whose reads answer with calculations."""
+    device = LuxtronikDevice("127.0.0.1", 8889, False, 5)
+
+    async def async_read(groups):
+        frames = {
+            "parameters": struct.pack(">4i", 0, 0, 0, 0),
+            "calculations": struct.pack(f">{len(calculations)}i", *calculations),
+            "visibilities": struct.pack(">4b", 0, 0, 0, 0),
+        }
+        return {group: frames[group] for group in groups}
+
+    with patch.object(device._client, "async_read", side_effect=async_read):
+        coordinator = LuxtronikCoordinator(hass, device)
+        yield coordinator
+        await coordinator.async_shutdown()
+
+
+@pytest.fixture
+async def entry_coordinator(hass, socket_enabled):
+    """Set up a heatpump served by the simulator and return its coordinator."""
+    simulator = LuxtronikSimulator()
+    await simulator.async_start()
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=2,
+        data={
+            CONF_HOST: simulator.host,
+            CONF_PORT: simulator.port,
+            CONF_SAFE: False,
+            CONF_LOCK_TIMEOUT: 30,
+            CONF_RETRIES: 0,
+            CONF_UPDATE_IMMEDIATELY_AFTER_WRITE: True,
+            CONF_CONTROL_MODE_HOME_ASSISTANT: False,
+            CONF_HA_SENSOR_INDOOR_TEMPERATURE: "sensor.indoor_temperature",
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = get_entry_data(hass, entry.entry_id).coordinator
+    coordinator.simulator = simulator
+    yield coordinator
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    await simulator.async_stop()
+
+
+async def test_unchanged_values(coordinator, calculations):
+    """Test only the keys of changed values are reported as changed."""
+    flow_in = coordinator.luxtronik.register_key(FLOW_IN)
+    outdoor = coordinator.luxtronik.register_key(OUTDOOR)
+    await coordinator.async_refresh()
+    # Everything changed on the first read.
+    assert coordinator.data is None
+    assert coordinator.has_changed([outdoor])
+
+    calculations[10] = 405
+    await coordinator.async_refresh()
+    assert coordinator.has_changed([flow_in])
+    assert not coordinator.has_changed([outdoor])
+    assert coordinator.luxtronik.get_value(FLOW_IN) == 40.5
+
+    await coordinator.async_refresh()
+    assert not coordinator.has_changed([flow_in, None])
+
+
+async def test_availability_change(coordinator):
+    """Test all entities update when the heatpump goes and comes back."""
+    outdoor = coordinator.luxtronik.register_key(OUTDOOR)
+    notified = []
+    coordinator.async_add_listener(lambda: notified.append(coordinator.data))
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+    assert notified == [None, set()]
+
+    with patch.object(coordinator.luxtronik._client, "async_read", side_effect=OSError):
+        await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    assert notified[-1] is None
+
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert notified[-1] is None
+    assert coordinator.has_changed([outdoor])
+
+
+async def test_status_minute_tick(hass, entry_coordinator):
+    """Test the status sensor counts down to the next EVU event without restored state."""
+    # Stop polling, only the minute tick may update the status.
+    await entry_coordinator.async_shutdown()
+    status = hass.data["entity_components"]["sensor"].get_entity(STATUS)
+    status._first_evu_start_time = time(23, 59)
+    assert hass.states.get(STATUS).attributes["EVU first start time"] == ""
+
+    next_minute = (dt_util.utcnow() + timedelta(minutes=1)).replace(second=0, microsecond=0)
+    async_fire_time_changed(hass, next_minute)
+    await hass.async_block_till_done()
+    assert hass.states.get(STATUS).attributes["EVU first start time"] == "23:59"
+
+
+async def test_failed_write_shows_read_value(hass, entry_coordinator):
+    """Test the entities show the read value again at once when a write fails."""
+    read_state = hass.states.get(WATER_TARGET).state
+    client = entry_coordinator.luxtronik._client
+    with patch.object(client, "async_write", side_effect=OSError):
+        with pytest.raises(OSError):
+            await entry_coordinator.async_write("ID_Einst_BWS_akt", 55.0, use_debounce=False)
+        assert hass.states.get(WATER_TARGET).state == read_state
+
+        await hass.services.async_call(
+            "number", "set_value", {"entity_id": WATER_TARGET, "value": 55.0}, blocking=True
+        )
+        assert hass.states.get(WATER_TARGET).state == "55.0"
+        async_fire_time_changed(hass, dt_util.utcnow() + WRITE_DEBOUNCE_DELAY + timedelta(seconds=1))
+        await hass.async_block_till_done()
+    assert hass.states.get(WATER_TARGET).state == read_state
+
+
+async def test_write_notifies_once(hass, entry_coordinator):
+    """Test a direct write updates the listeners once for the shown value."""
+    notified = []
+    entry_coordinator.async_add_listener(lambda: notified.append(entry_coordinator.data))
+    await entry_coordinator.async_write("ID_Einst_BWS_akt", 55.0, use_debounce=False)
+    assert len(notified) == 1
+    assert hass.states.get(WATER_TARGET).state == "55.0"
+
+
+async def test_number_write_read_back(hass, entry_coordinator):
+    """Test a debounced number write reads back the parameters once it is sent."""
+    luxtronik = entry_coordinator.luxtronik
+    with patch.object(luxtronik, "async_read", wraps=luxtronik.async_read) as read:
+        await hass.services.async_call(
+            "number", "set_value", {"entity_id": WATER_TARGET, "value": 55.0}, blocking=True
+        )
+        sent = dt_util.utcnow() + WRITE_DEBOUNCE_DELAY + timedelta(seconds=1)
+        async_fire_time_changed(hass, sent)
+        await hass.async_block_till_done()
+        async_fire_time_changed(hass, sent + WRITE_CONFIRM_DELAY + timedelta(seconds=1))
+        await hass.async_block_till_done()
+    assert call([CONF_PARAMETERS]) in read.call_args_list
+    assert entry_coordinator.simulator.get_raw("parameters", 2) == 550
+
+
+async def test_write_while_idle_polls_soon(hass, entry_coordinator):
+    """Test a write brings the next poll forward to the min interval."""
+    poll_interval = entry_coordinator.poll_interval
+    entry_coordinator.update_interval = poll_interval.max_interval
+    entry_coordinator._schedule_refresh()
+    luxtronik = entry_coordinator.luxtronik
+    with patch.object(luxtronik, "async_read", wraps=luxtronik.async_read) as read:
+        await entry_coordinator.async_write("ID_Einst_BWS_akt", 55.0, use_debounce=False)
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + poll_interval.min_interval + timedelta(seconds=1)
+        )
+        await hass.async_block_till_done()
+    assert call() in read.call_args_list
+    assert entry_coordinator.update_interval == poll_interval.min_interval
+
+
+async def test_one_poll_for_all_platforms(hass, entry_coordinator):
+    """Test a refresh reads the heatpump once for the entities of all platforms."""
+    platforms = {state.domain for state in hass.states.async_all()}
+    assert {"sensor", "binary_sensor", "number", "switch", "climate"} <= platforms
+    luxtronik = entry_coordinator.luxtronik
+    with patch.object(luxtronik, "async_read", wraps=luxtronik.async_read) as read:
+        await entry_coordinator.async_refresh()
+    read.assert_awaited_once_with()
+
+
+async def test_failed_poll_backs_off(coordinator):
+    """Test failed polls wait for the circuit breaker before polling again."""
+    client = coordinator.luxtronik._client
+    poll_interval = coordinator.poll_interval
+    with patch.object(client, "async_read", side_effect=OSError):
+        await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    assert coordinator.update_interval == poll_interval.default_interval
+
+    client.breaker = LuxtronikCircuitBreaker(open_min_sec=600)
+    for _ in range(BREAKER_FAILURE_THRESHOLD):
+        client.breaker.record_failure()
+    with patch.object(client, "async_read", side_effect=LuxtronikUnavailableError):
+        await coordinator.async_refresh()
+    assert coordinator.update_interval > poll_interval.max_interval
+
+    client.breaker.record_success()
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.update_interval <= poll_interval.max_interval
+
+
+async def test_entities_refresh_from_coordinator_only(hass, entry_coordinator):
+    """Test no entity reads or refreshes on its own, the poll updates them all."""
+    luxtronik = entry_coordinator.luxtronik
+    with patch.object(luxtronik, "async_read", wraps=luxtronik.async_read) as read:
+        async_dispatcher_send(hass, f"{DOMAIN}_data_updated")
+        await hass.async_block_till_done()
+        read.assert_not_awaited()
+
+        entry_coordinator.simulator.set_value("calculations", "ID_WEB_Temperatur_TVL", 40.5)
+        await entry_coordinator.async_refresh()
+        await hass.async_block_till_done()
+    read.assert_awaited_once_with()
+    assert hass.states.get(FLOW_IN_SENSOR).state == "40.5"
@@ -0,0 +1,75 @@
+"""Test the translation and discovery helpers."""
+import asyncio
+from datetime import timedelta
+import socket
+from unittest.mock import patch
+
+from custom_components.luxtronik.const import DISCOVERY_REQUEST, DOMAIN
+from custom_components.luxtronik.helpers.helper import (
+    async_load_translations,
+    get_sensor_text,
+    get_sensor_value_text,
+)
+from custom_components.luxtronik.helpers.lux_helper import (
+    _DiscoveryProtocol,
+    async_discover,
+    get_discovered,
+)
+
+DISCOVERY_WAIT = timedelta(milliseconds=200)
+
+
+async def test_translations(hass):
+    """Test texts per language with the default language as fallback."""
+    await async_load_translations(hass)
+    assert get_sensor_text("de-DE", "outdoor") == "Aussen"
+    assert get_sensor_text("fr", "outdoor") == get_sensor_text("en", "outdoor")
+    assert get_sensor_text("de", "not_translated") == "Not Translated"
+    assert (
+        get_sensor_value_text("en", f"{DOMAIN}__status", "no request")
+        == "Idle (no request)"
+    )
+
+
+def test_discovery_answers():
+    """Test all heatpumps answering the discovery broadcast are collected."""
+    responders = {}
+    protocol = _DiscoveryProtocol(responders)
+    protocol.datagram_received(DISCOVERY_REQUEST, ("192.168.1.2", 4444))
+    protocol.datagram_received(b"2500;111;8889;", ("192.168.1.10", 4444))
+    protocol.datagram_received(b"2500;111;", ("192.168.1.11", 47808))
+    protocol.datagram_received(b"2500;111;8888;", ("192.168.1.11", 4444))
+    protocol.datagram_received(b"garbage", ("192.168.1.12", 4444))
+    assert responders == {"192.168.1.10": 8889, "192.168.1.11": 8888}
+
+
+async def _async_answer(port: int, answer: bytes) -> None:
+    """Answer the discovery broadcast like a heatpump on the local host."""
+    await asyncio.sleep(DISCOVERY_WAIT.total_seconds() / 4)
+    loop = asyncio.get_running_loop()
+    transport, _ = await loop.create_datagram_endpoint(
+        asyncio.DatagramProtocol, remote_addr=("127.0.0.1", port)
+    )
+    transport.sendto(answer)
+    transport.close()
+
+
+async def test_discover(socket_enabled):
+    """Test answers are collected and cached, no answer is not cached."""
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    with patch(
+        "custom_components.luxtronik.helpers.lux_helper.LUX_DISCOVERY_PORTS", (port,)
+    ), patch("custom_components.luxtronik.helpers.lux_helper.__discovered__", None):
+        assert await async_discover(DISCOVERY_WAIT) == []
+        assert get_discovered() == []
+        # Let the closed socket release the port.
+        await asyncio.sleep(0)
+
+        answer = asyncio.create_task(_async_answer(port, b"2500;111;8889;"))
+        assert await async_discover(DISCOVERY_WAIT) == [("127.0.0.1", 8889)]
+        await answer
+        # The answer is cached, no heatpump has to answer again.
+        assert await async_discover(DISCOVERY_WAIT) == [("127.0.0.1", 8889)]
+        assert get_discovered() == [("127.0.0.1", 8889)]
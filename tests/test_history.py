@@ -0,0 +1,23 @@
+"""Test the rolling history."""
+from datetime import timedelta
+import math
+
+from custom_components.luxtronik.history import LuxtronikHistory
+
+
+def test_windowed_queries():
+    """Test mean, min/max, slope and on time over a window."""
+    history = LuxtronikHistory(["temp", "on"], size=4)
+    for second, temp, on in [(0, 20.0, 0), (10, None, 1), (20, 22.0, 1), (30, 23.0, 0), (40, 24.0, 1)]:
+        history.record(float(second), [temp, on])
+
+    # The oldest snapshot was overwritten.
+    times, _ = history.window("temp")
+    assert list(times) == [10.0, 20.0, 30.0, 40.0]
+    assert len(history) == 4
+    assert history.mean("temp") == 23.0
+    assert history.min("temp") == 22.0
+    assert history.max("temp", timedelta(seconds=15), now=40.0) == 24.0
+    assert math.isclose(history.slope("temp"), 360.0)
+    assert history.on_time("on") == timedelta(seconds=20)
+    assert history.mean("temp", timedelta(seconds=5), now=100.0) is None
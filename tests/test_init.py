@@ -1,8 +1,200 @@
 """Test component setup."""
+from datetime import timedelta
+import os
+from unittest.mock import call, patch
+
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.storage import STORAGE_DIR
 from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.luxtronik import get_entry_data
+from custom_components.luxtronik.diagnostics import async_get_config_entry_diagnostics
+from custom_components.luxtronik.const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_PARAMETERS,
+    CONF_CONTROL_MODE_HOME_ASSISTANT,
+    CONF_ENTITY_PREFIX,
+    CONF_HA_SENSOR_INDOOR_TEMPERATURE,
+    CONF_LOCK_TIMEOUT,
+    CONF_PARAMETERS,
+    CONF_SAFE,
+    CONF_SCHEDULER,
+    CONF_UPDATE_IMMEDIATELY_AFTER_WRITE,
+    DOMAIN,
+    SERVICE_WRITE_MANY,
+    SNAPSHOT_SAVE_INTERVAL,
+    WRITE_CONFIRM_DELAY,
+)
+from custom_components.luxtronik.snapshot_store import LuxtronikSnapshotStore
+
+from .luxtronik_simulator import LuxtronikSimulator
+
+
+async def _async_setup_entry(hass, simulator: LuxtronikSimulator, **data) -> MockConfigEntry:
+    """Set up a config entry of a heatpump served by the simulator."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=2,
+        data={
+            CONF_HOST: simulator.host,
+            CONF_PORT: simulator.port,
+            CONF_SAFE: False,
+            CONF_LOCK_TIMEOUT: 30,
+            CONF_UPDATE_IMMEDIATELY_AFTER_WRITE: True,
+            CONF_CONTROL_MODE_HOME_ASSISTANT: False,
+            CONF_HA_SENSOR_INDOOR_TEMPERATURE: "sensor.indoor_temperature",
+            **data,
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
 
-from custom_components.luxtronik.const import DOMAIN
 
 async def test_async_setup(hass):
     """Test the component gets setup."""
-    assert await async_setup_component(hass, DOMAIN, {}) is True
\ No newline at end of file
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+
+
+async def test_two_heatpumps(hass, socket_enabled):
+    """Test two heatpumps are set up side by side and share one scheduler."""
+    simulators = [LuxtronikSimulator(), LuxtronikSimulator()]
+    simulators[1].set_value("parameters", "ID_WP_SerienNummer_HEX", 2)
+    entries = []
+    for simulator, entity_prefix in zip(simulators, [DOMAIN, f"{DOMAIN}_second"]):
+        await simulator.async_start()
+        entries.append(
+            await _async_setup_entry(hass, simulator, **{CONF_ENTITY_PREFIX: entity_prefix})
+        )
+
+    assert hass.states.get(f"sensor.{DOMAIN}_status") is not None
+    assert hass.states.get(f"sensor.{DOMAIN}_second_status") is not None
+    assert get_entry_data(hass, entries[0].entry_id).luxtronik.host == simulators[0].host
+    assert hass.data[f"{DOMAIN}_{CONF_SCHEDULER}"].devices == 2
+
+    for entry in entries:
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+    assert f"{DOMAIN}_{CONF_SCHEDULER}" not in hass.data
+    for simulator in simulators:
+        await simulator.async_stop()
+
+
+async def test_warm_start(hass, socket_enabled):
+    """Test a heatpump comes up from its snapshot while it is unreachable."""
+    simulator = LuxtronikSimulator()
+    await simulator.async_start()
+    entry = await _async_setup_entry(hass, simulator)
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    await simulator.async_stop()
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert hass.states.get(f"sensor.{DOMAIN}_status") is not None
+    luxtronik = get_entry_data(hass, entry.entry_id).luxtronik
+    assert luxtronik.get_value("parameters.ID_WP_SerienNummer_HEX") is not None
+
+    assert await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+    assert not os.path.exists(hass.config.path(STORAGE_DIR, f"{DOMAIN}.{entry.entry_id}.snapshot"))
+
+
+async def test_reload(hass, socket_enabled):
+    """Test changing the options replaces the heatpump and its snapshot timer."""
+    simulator = LuxtronikSimulator()
+    await simulator.async_start()
+    entry = await _async_setup_entry(hass, simulator)
+    luxtronik = get_entry_data(hass, entry.entry_id).luxtronik
+
+    hass.config_entries.async_update_entry(entry, options={CONF_LOCK_TIMEOUT: 15})
+    await hass.async_block_till_done()
+    reloaded = get_entry_data(hass, entry.entry_id).luxtronik
+    assert reloaded is not luxtronik
+    assert hass.states.get(f"sensor.{DOMAIN}_status") is not None
+
+    with patch.object(LuxtronikSnapshotStore, "async_save") as save:
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + SNAPSHOT_SAVE_INTERVAL + timedelta(seconds=1)
+        )
+        await hass.async_block_till_done()
+    save.assert_called_once()
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    await simulator.async_stop()
+
+
+async def test_write_many(hass, socket_enabled):
+    """Test write_many writes one batch to the chosen heatpump and reads it back once."""
+    simulators = [LuxtronikSimulator(), LuxtronikSimulator()]
+    simulators[1].set_value("parameters", "ID_WP_SerienNummer_HEX", 2)
+    entries = []
+    for simulator, entity_prefix in zip(simulators, [DOMAIN, f"{DOMAIN}_second"]):
+        await simulator.async_start()
+        entries.append(
+            await _async_setup_entry(hass, simulator, **{CONF_ENTITY_PREFIX: entity_prefix})
+        )
+    luxtronik = get_entry_data(hass, entries[1].entry_id).luxtronik
+
+    with patch.object(
+        luxtronik, "async_write_batch", wraps=luxtronik.async_write_batch
+    ) as write_batch, patch.object(luxtronik, "async_read", wraps=luxtronik.async_read) as read:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_WRITE_MANY,
+            {
+                ATTR_CONFIG_ENTRY_ID: entries[1].entry_id,
+                ATTR_PARAMETERS: {"ID_Einst_WK_akt": 2.0, "ID_Einst_BWS_akt": 50.0},
+            },
+            blocking=True,
+        )
+        write_batch.assert_awaited_once_with({"ID_Einst_WK_akt": 2.0, "ID_Einst_BWS_akt": 50.0})
+        async_fire_time_changed(hass, dt_util.utcnow() + WRITE_CONFIRM_DELAY + timedelta(seconds=1))
+        await hass.async_block_till_done()
+        # The write brings the next poll forward, it may have run meanwhile.
+        assert read.await_args_list.count(call([CONF_PARAMETERS])) == 1
+
+    assert simulators[0].writes == []
+    assert simulators[1].writes == [(1, 20), (2, 500)]
+    assert luxtronik.get_value("parameters.ID_Einst_BWS_akt") == 50.0
+
+    for entry in entries:
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+    for simulator in simulators:
+        await simulator.async_stop()
+
+
+async def test_metrics_and_diagnostics(hass, socket_enabled):
+    """Test the metric sensors and the diagnostics of the values read last."""
+    simulator = LuxtronikSimulator()
+    simulator.set_raw("parameters", 1136, 12345)
+    await simulator.async_start()
+    entry = await _async_setup_entry(hass, simulator)
+    registry_entry = er.async_get(hass).async_get(f"sensor.{DOMAIN}_metric_read_time")
+    assert registry_entry.original_name == "Poll read time"
+
+    requests = simulator.requests
+    with patch(
+        "custom_components.luxtronik.diagnostics.get_mac_address",
+        return_value="00:0e:8c:01:02:03",
+    ):
+        diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    # The values come from the last poll, the heatpump isn't read again.
+    assert simulator.requests == requests
+    assert diagnostics["entry"]["data"]["mac"] == "00:0e:8c:*"
+    assert diagnostics["parameters"][f"{1136:<4d} {'Unknown_Parameter_1136':<60}"] == "12345"
+    assert diagnostics["calculations"][f"{81:<4d} {'ID_WEB_SoftStand':<60}"] == "V3.88.1"
+    assert diagnostics["metrics"]["read_time"]["count"] >= 1
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    await simulator.async_stop()
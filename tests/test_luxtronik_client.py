@@ -0,0 +1,177 @@
+"""Test the asyncio Luxtronik client against the controller simulator."""
+import asyncio
+import struct
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.luxtronik.luxtronik_client import (
+    BREAKER_FAILURE_THRESHOLD,
+    LUX_CMD_READ_PARAMETERS,
+    LuxtronikAsyncClient,
+    LuxtronikCircuitBreaker,
+    LuxtronikRequestPolicy,
+    LuxtronikUnavailableError,
+)
+
+from .luxtronik_simulator import LuxtronikSimulator
+
+
+@pytest.fixture
+async def simulator(socket_enabled):
+    """Run a simulator on the test loop."""
+    simulator = LuxtronikSimulator()
+    await simulator.async_start()
+    yield simulator
+    await simulator.async_stop()
+
+
+async def _async_serve(response: bytes) -> asyncio.Server:
+    """Start a controller that answers every request with response and hangs up."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await reader.readexactly(8)
+        writer.write(response)
+        await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+async def test_read_frames(simulator):
+    """Test the frames of all groups are read as sent by the controller."""
+    simulator.set_raw("parameters", 1, -15)
+    simulator.set_raw("calculations", 10, 352)
+    simulator.set_raw("visibilities", 2, 1)
+    client = LuxtronikAsyncClient(simulator.host, simulator.port)
+
+    frames = await client.async_read()
+    assert list(frames) == ["parameters", "calculations", "visibilities"]
+    assert len(frames["parameters"]) == 4 * len(simulator.tables["parameters"])
+    assert len(frames["calculations"]) == 4 * len(simulator.tables["calculations"])
+    assert len(frames["visibilities"]) == len(simulator.tables["visibilities"])
+    assert struct.unpack_from(">i", frames["parameters"], 4) == (-15,)
+    assert struct.unpack_from(">i", frames["calculations"], 40) == (352,)
+    assert frames["visibilities"][2] == 1
+
+    frames = await client.async_read(["calculations"])
+    assert list(frames) == ["calculations"]
+    # All requests went over the one pooled connection.
+    assert simulator.connections == 1
+    await client.async_disconnect()
+
+
+async def test_write(simulator):
+    """Test queued parameters are written one command each, invalid ones skipped."""
+    client = LuxtronikAsyncClient(simulator.host, simulator.port)
+    await client.async_write({1: 20, "ID_Einst_BWS_akt": 500, 2: 500})
+    assert simulator.writes == [(1, 20), (2, 500)]
+    assert simulator.get_raw("parameters", 2) == 500
+    await client.async_disconnect()
+
+
+async def test_unexpected_response(socket_enabled):
+    """Test a response to another command is rejected."""
+    server = await _async_serve(struct.pack(">i", LUX_CMD_READ_PARAMETERS + 1))
+    port = server.sockets[0].getsockname()[1]
+    client = LuxtronikAsyncClient("127.0.0.1", port, LuxtronikRequestPolicy(retries=0))
+    with pytest.raises(ConnectionError, match="Unexpected Luxtronik response"):
+        await client.async_read(["parameters"])
+    await client.async_disconnect()
+    server.close()
+    await server.wait_closed()
+
+
+async def test_truncated_frame(socket_enabled):
+    """Test a frame shorter than its announced length fails the read."""
+    server = await _async_serve(struct.pack(">iiii", LUX_CMD_READ_PARAMETERS, 10, 1, 2))
+    port = server.sockets[0].getsockname()[1]
+    client = LuxtronikAsyncClient("127.0.0.1", port, LuxtronikRequestPolicy(retries=0))
+    with pytest.raises(asyncio.IncompleteReadError):
+        await client.async_read(["parameters"])
+    await client.async_disconnect()
+    server.close()
+    await server.wait_closed()
+
+
+async def test_read_timeout(simulator):
+    """Test a slow controller times out and the request is retried once."""
+    simulator.latency = 0.5
+    client = LuxtronikAsyncClient(
+        simulator.host, simulator.port, LuxtronikRequestPolicy(read_timeout=0.05, retries=1)
+    )
+    with pytest.raises(TimeoutError):
+        await client.async_read(["parameters"])
+    assert simulator.requests == 2
+    # The timed out connection was replaced, its late response can't be mixed up.
+    assert simulator.connections == 2
+    await client.async_disconnect()
+
+
+def test_circuit_breaker_open_time():
+    """Test every failed probe doubles the open time up to the max."""
+    breaker = LuxtronikCircuitBreaker(open_min_sec=10, open_max_sec=30)
+    with patch(
+        "custom_components.luxtronik.luxtronik_client.time.monotonic", return_value=1000.0
+    ) as monotonic, patch(
+        "custom_components.luxtronik.luxtronik_client._jitter", side_effect=lambda sec: sec
+    ):
+        for _ in range(BREAKER_FAILURE_THRESHOLD):
+            assert not breaker.check()
+            breaker.record_failure()
+        assert breaker.retry_in == 10
+        for retry_in in (20, 30, 30):
+            monotonic.return_value += breaker.retry_in
+            assert breaker.check()
+            breaker.record_failure()
+            assert breaker.retry_in == retry_in
+
+        monotonic.return_value += breaker.retry_in
+        assert breaker.check()
+        breaker.record_success()
+        assert breaker.retry_in == 0
+        assert not breaker.check()
+
+
+async def test_circuit_breaker_half_open(simulator):
+    """Test a half open breaker lets one probe through, the others fail fast."""
+    client = LuxtronikAsyncClient(simulator.host, simulator.port)
+    client.breaker = LuxtronikCircuitBreaker(open_min_sec=0.05)
+    for _ in range(BREAKER_FAILURE_THRESHOLD):
+        client.breaker.record_failure()
+    with pytest.raises(LuxtronikUnavailableError):
+        await client.async_read(["parameters"])
+    await asyncio.sleep(0.1)
+
+    simulator.latency = 0.1
+    probe, other = await asyncio.gather(
+        client.async_read(["parameters"]),
+        client.async_read(["parameters"]),
+        return_exceptions=True,
+    )
+    assert list(probe) == ["parameters"]
+    assert isinstance(other, LuxtronikUnavailableError)
+    assert simulator.requests == 1
+    # The successful probe closed the breaker.
+    await client.async_read(["parameters"])
+    assert simulator.requests == 2
+    await client.async_disconnect()
+
+
+async def test_circuit_breaker_cancelled_probe(simulator):
+    """Test a cancelled probe lets the next request probe."""
+    client = LuxtronikAsyncClient(simulator.host, simulator.port)
+    client.breaker = LuxtronikCircuitBreaker(open_min_sec=0.01)
+    for _ in range(BREAKER_FAILURE_THRESHOLD):
+        client.breaker.record_failure()
+    await asyncio.sleep(0.05)
+
+    simulator.latency = 0.5
+    probe = asyncio.create_task(client.async_read(["parameters"]))
+    await asyncio.sleep(0.05)
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+    simulator.latency = 0.0
+    await client.async_read(["parameters"])
+    await client.async_disconnect()
@@ -0,0 +1,238 @@
+"""Test LuxtronikDevice against the controller simulator."""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.luxtronik.const import DEFAULT_RETRIES
+from custom_components.luxtronik.luxtronik_client import (
+    BREAKER_FAILURE_THRESHOLD,
+    LuxtronikRequestPolicy,
+    LuxtronikUnavailableError,
+)
+from custom_components.luxtronik.luxtronik_device import LuxtronikDevice
+
+from .luxtronik_simulator import LuxtronikSimulator
+
+
+@pytest.fixture
+def simulator(socket_enabled):
+    """Run a simulator on its own thread."""
+    simulator = LuxtronikSimulator()
+    simulator.set_value("calculations", "ID_WEB_Temperatur_TVL", 35.0)
+    simulator.set_value("parameters", "ID_Einst_WK_akt", 1.5)
+    simulator.start_in_thread()
+    yield simulator
+    simulator.stop_thread()
+
+
+@pytest.fixture
+async def device(simulator):
+    """Return a device connected to the simulator."""
+    device = LuxtronikDevice(simulator.host, simulator.port, False, 5)
+    device.register_key("calculations.ID_WEB_Temperatur_TVL")
+    yield device
+    await device.async_disconnect()
+
+
+async def test_async_read(simulator, device):
+    """Test values are read and converted."""
+    connections = simulator.connections
+    await device.async_read()
+    assert device.get_value("calculations.ID_WEB_Temperatur_TVL") == 35.0
+    assert device.get_value("parameters.ID_Einst_WK_akt") == 1.5
+    assert device.firmware_version == "V3.88.1"
+
+    simulator.set_value("calculations", "ID_WEB_Temperatur_TVL", 40.5)
+    await device.async_read()
+    assert device.get_value("calculations.ID_WEB_Temperatur_TVL") == 40.5
+    # The connection is kept open between reads.
+    assert simulator.connections == connections + 1
+
+
+async def test_async_connect(simulator):
+    """Test nothing is read on creation and async_connect reads once."""
+    device = LuxtronikDevice(simulator.host, simulator.port, False, 5)
+    assert simulator.requests == 0
+    await device.async_disconnect()
+
+    device = await LuxtronikDevice.async_connect(simulator.host, simulator.port)
+    assert simulator.requests == 3
+    assert device.firmware_version == "V3.88.1"
+
+
+async def test_async_write_batch(simulator, device):
+    """Test several parameters are written in one batch."""
+    await device.async_write_batch({"ID_Einst_WK_akt": 2.0, "ID_Einst_BWS_akt": 50.0})
+    assert len(simulator.writes) == 2
+    await device.async_read()
+    assert device.get_value("parameters.ID_Einst_WK_akt") == 2.0
+    assert device.get_value("parameters.ID_Einst_BWS_akt") == 50.0
+
+
+async def test_optimistic_write(simulator, device):
+    """Test written values show at once and are confirmed or rolled back."""
+    await device.async_read()
+    device.pop_changes()
+    changes = device.set_optimistic({"ID_Einst_WK_akt": 2.0, "ID_Einst_BWS_akt": 50.0})
+    assert len(changes) == 2
+    assert device.get_value("parameters.ID_Einst_WK_akt") == 2.0
+
+    await device.async_write_batch({"ID_Einst_WK_akt": 2.0, "ID_Einst_BWS_akt": 50.0})
+    # The controller did not accept one of the values.
+    simulator.set_value("parameters", "ID_Einst_BWS_akt", 48.0)
+    await device.async_read(["parameters"])
+    assert device.get_value("parameters.ID_Einst_WK_akt") == 2.0
+    assert device.get_value("parameters.ID_Einst_BWS_akt") == 48.0
+    assert device.pop_write_mismatches() == [("ID_Einst_BWS_akt", 50.0, 48.0)]
+    assert changes <= device.pop_changes()
+
+
+async def test_write_during_read(simulator):
+    """Test a read started before a write finished doesn't confirm that write."""
+    device = LuxtronikDevice(simulator.host, simulator.port, False, 5, pool_size=2)
+    await device.async_read()
+    read_done = asyncio.Event()
+    release = asyncio.Event()
+    client_read = device._client.async_read
+
+    async def stale_read(groups):
+        frames = await client_read(groups)
+        read_done.set()
+        await release.wait()
+        return frames
+
+    with patch.object(device._client, "async_read", stale_read):
+        read = asyncio.create_task(device.async_read(["parameters"]))
+        await read_done.wait()
+    device.set_optimistic({"ID_Einst_WK_akt": 2.0})
+    await device.async_write_batch({"ID_Einst_WK_akt": 2.0})
+    release.set()
+    await read
+    assert device.pop_write_mismatches() == []
+    assert device.get_value("parameters.ID_Einst_WK_akt") == 2.0
+
+    await device.async_read(["parameters"])
+    assert device.pop_write_mismatches() == []
+    assert device.get_value("parameters.ID_Einst_WK_akt") == 2.0
+    await device.async_disconnect()
+
+
+async def test_reconnect_after_loss(simulator, device):
+    """Test a dropped connection is replaced by the retries and the next read."""
+    await device.async_read()
+    connections = simulator.connections
+    simulator.loss = 1.0
+    with pytest.raises((OSError, asyncio.IncompleteReadError)):
+        await device.async_read()
+    simulator.loss = 0.0
+    await device.async_read()
+    assert device.get_value("calculations.ID_WEB_Temperatur_TVL") == 35.0
+    assert simulator.connections == connections + DEFAULT_RETRIES + 1
+
+
+async def test_circuit_breaker(simulator):
+    """Test requests fail fast while the heatpump is down."""
+    device = LuxtronikDevice(
+        simulator.host, simulator.port, False, 5, policy=LuxtronikRequestPolicy(retries=0)
+    )
+    simulator.loss = 1.0
+    for _ in range(BREAKER_FAILURE_THRESHOLD):
+        with pytest.raises((OSError, asyncio.IncompleteReadError)):
+            await device.async_read()
+    requests = simulator.requests
+    assert device.circuit_breaker.retry_in > 0
+    with pytest.raises(LuxtronikUnavailableError):
+        await device.async_read()
+    assert simulator.requests == requests
+
+    simulator.loss = 0.0
+    device.circuit_breaker.record_success()
+    await device.async_read()
+    assert device.circuit_breaker.retry_in == 0
+    await device.async_disconnect()
+
+
+def test_load_dump():
+    """Test a diagnostics dump is replayed as raw values."""
+    simulator = LuxtronikSimulator()
+    simulator.load_dump(
+        {
+            "parameters": {f"{1:<4d} {'ID_Einst_WK_akt':<60}": "-1.5"},
+            "calculations": {
+                f"{10:<4d} {'ID_WEB_Temperatur_TVL':<60}": "35.2",
+                f"{81:<4d} {'ID_WEB_SoftStand':<60}": "V3.90.2",
+                f"{80:<4d} {'ID_WEB_WP_BZ_akt':<60}": "heating",
+            },
+            "visibilities": {f"{0:<4d} {'ID_Visi_NieAnzeigen':<60}": "True"},
+        }
+    )
+    assert simulator.get_raw("parameters", 1) == -15
+    assert simulator.get_raw("calculations", 10) == 352
+    assert simulator.get_raw("calculations", 80) == 0
+    assert bytes(simulator.tables["calculations"][81:88]).decode() == "V3.90.2"
+    assert simulator.get_raw("visibilities", 0) == 1
+
+
+async def test_capabilities(simulator, device):
+    """Test the capabilities are only detected again after parameters changed."""
+    await device.async_read()
+    capabilities = device.capabilities
+    assert capabilities.firmware_version_minor == 88
+    assert not device.detect_cooling_present()
+
+    simulator.set_value("calculations", "ID_WEB_Temperatur_TVL", 40.5)
+    await device.async_read()
+    assert device.capabilities is capabilities
+
+    await device.async_write_batch({"ID_Einst_MK1Typ_akt": 3})
+    await device.async_read()
+    assert device.capabilities is not capabilities
+    assert device.detect_cooling_present()
+
+
+async def test_read_lock_timeout(simulator):
+    """Test a read waiting too long for another one fails instead of passing silently."""
+    device = LuxtronikDevice(simulator.host, simulator.port, False, 0.05)
+    await device._async_lock.acquire()
+    with pytest.raises(TimeoutError):
+        await device.async_read()
+    assert simulator.requests == 0
+    device._async_lock.release()
+    await device.async_read()
+    await device.async_disconnect()
+
+
+def test_resolve_key():
+    """Test resolved keys are reused and unknown ones are not remembered."""
+    device = LuxtronikDevice("127.0.0.1", 8889, False, 5)
+    key = device.resolve_key("calculations.ID_WEB_Temperatur_TVL")
+    assert key.index == 10
+    assert device.resolve_key("calculations.ID_WEB_Temperatur_TVL") is key
+    assert device.resolve_key("calculations.ID_WEB_Temperatur_Typo") is None
+    assert "calculations.ID_WEB_Temperatur_Typo" not in device._keys
+
+
+async def test_unknown_parameters(simulator, device):
+    """Test values without a name in the library are read once the frame is long enough."""
+    heat_energy = device.register_key("parameters.Unknown_Parameter_1136")
+    assert heat_energy.index == 1136
+    await device.async_read()
+    assert device.get_value(heat_energy) is None
+
+    simulator.set_raw("parameters", 1136, 12345)
+    simulator.set_raw("parameters", 1137, 678)
+    await device.async_read(["parameters"])
+    assert device.get_value(heat_energy) == 12345
+    assert device.get_value("parameters.Unknown_Parameter_1137") == 678
+
+
+async def test_devices_keep_own_values(simulator, device):
+    """Test two devices don't share the values of the library datatypes."""
+    await device.async_read()
+    other = LuxtronikDevice(simulator.host, simulator.port, False, 5)
+    simulator.set_value("calculations", "ID_WEB_Temperatur_TVL", 40.5)
+    await other.async_read()
+    assert other.get_value("calculations.ID_WEB_Temperatur_TVL") == 40.5
+    assert device.get_value("calculations.ID_WEB_Temperatur_TVL") == 35.0
+    await other.async_disconnect()
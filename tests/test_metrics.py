@@ -0,0 +1,62 @@
+"""Test the communication metrics."""
+import pytest
+
+from custom_components.luxtronik.helpers.metrics import (
+    METRIC_BYTES_RECEIVED,
+    METRIC_READ_TIME,
+    RollingHistogram,
+)
+from custom_components.luxtronik.luxtronik_client import (
+    RETRY_DELAY_SEC,
+    RETRY_JITTER,
+    LuxtronikAsyncClient,
+)
+
+from .luxtronik_simulator import LuxtronikSimulator
+
+
+@pytest.fixture
+async def simulator(socket_enabled):
+    """Run a simulator on the test loop."""
+    simulator = LuxtronikSimulator()
+    await simulator.async_start()
+    yield simulator
+    await simulator.async_stop()
+
+
+def test_rolling_histogram():
+    """Test the summary covers the last samples only."""
+    histogram = RollingHistogram(size=10)
+    assert histogram.as_dict() == {"count": 0}
+    for value in range(20):
+        histogram.record(value)
+    summary = histogram.as_dict()
+    assert summary["count"] == 20
+    assert summary["last"] == 19
+    assert summary["min"] == 10
+    assert summary["max"] == 19
+    assert summary["p50"] == 15
+    assert summary["mean"] == 14.5
+
+
+async def test_read_time_without_retries(simulator):
+    """Test the read time covers the successful attempt, not the failed one and the delay."""
+    client = LuxtronikAsyncClient(simulator.host, simulator.port)
+    failures = [OSError("dropped")]
+    read_groups = client._read_groups
+
+    async def flaky_read_groups(connection, groups):
+        if failures:
+            raise failures.pop()
+        return await read_groups(connection, groups)
+
+    client._read_groups = flaky_read_groups
+    frames = await client.async_read()
+
+    read_time = client.metrics.histograms[METRIC_READ_TIME]
+    assert read_time.count == 1
+    assert read_time.last < RETRY_DELAY_SEC * (1 - RETRY_JITTER)
+    assert client.metrics.histograms[METRIC_BYTES_RECEIVED].last == sum(
+        len(frame) for frame in frames.values()
+    )
+    await client.async_disconnect()
@@ -0,0 +1,72 @@
+"""Test which tables are read on a poll."""
+import pytest
+
+from custom_components.luxtronik import read_planner
+from custom_components.luxtronik.const import (
+    READ_INTERVAL_PARAMETERS,
+    READ_INTERVAL_UNSUBSCRIBED,
+)
+from custom_components.luxtronik.read_planner import LuxtronikReadPlanner
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Return a settable monotonic clock for the planner."""
+    now = [1000.0]
+    monkeypatch.setattr(read_planner.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def planner(clock):
+    """Return a planner with all groups read once."""
+    planner = LuxtronikReadPlanner()
+    for key in [
+        "parameters.ID_Einst_WK_akt",
+        "calculations.ID_WEB_Temperatur_TVL",
+        "visibilities.ID_Visi_Heizung",
+    ]:
+        planner.register_key(key)
+    groups = planner.plan()
+    assert groups == ["parameters", "calculations", "visibilities"]
+    planner.mark_read(groups)
+    return planner
+
+
+def test_intervals(clock, planner):
+    """Test every group is read when its interval elapsed."""
+    clock[0] += 1
+    assert planner.plan() == ["calculations"]
+    clock[0] += READ_INTERVAL_PARAMETERS.total_seconds()
+    assert planner.plan() == ["parameters", "calculations"]
+    planner.mark_read(["parameters", "calculations"])
+    clock[0] += 1
+    assert planner.plan() == ["calculations"]
+
+
+def test_unsubscribed(clock):
+    """Test groups no entity uses are read rarely."""
+    planner = LuxtronikReadPlanner()
+    planner.register_key("calculations.ID_WEB_Temperatur_TVL")
+    planner.mark_read(planner.plan())
+    clock[0] += READ_INTERVAL_PARAMETERS.total_seconds()
+    assert planner.plan() == ["calculations"]
+    clock[0] += READ_INTERVAL_UNSUBSCRIBED.total_seconds()
+    assert planner.plan() == planner.groups
+
+
+def test_mark_dirty(clock, planner):
+    """Test a dirty group is read once on the next poll."""
+    planner.mark_dirty("parameters")
+    groups = planner.plan()
+    assert groups == ["parameters", "calculations"]
+    planner.mark_read(groups)
+    assert planner.plan() == ["calculations"]
+
+
+def test_mark_failed(clock, planner):
+    """Test groups of a failed read are read again on the next poll."""
+    planner.mark_dirty("parameters")
+    groups = planner.plan()
+    planner.mark_failed(groups)
+    assert planner.plan() == ["parameters", "calculations"]
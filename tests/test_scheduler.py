@@ -0,0 +1,81 @@
+"""Test the poll scheduling."""
+import asyncio
+from datetime import timedelta
+
+from custom_components.luxtronik.const import (
+    LUX_STATUS_DEFROST,
+    LUX_STATUS_HEATING,
+    LUX_STATUS_NO_REQUEST,
+    MAX_CONCURRENT_POLLS,
+    POLL_STAGGER,
+)
+from custom_components.luxtronik.scheduler import (
+    LuxtronikPollInterval,
+    LuxtronikPollScheduler,
+)
+
+MIN = timedelta(seconds=5)
+MAX = timedelta(seconds=60)
+
+
+def test_poll_interval():
+    """Test the interval follows the operating state."""
+    interval = LuxtronikPollInterval(MIN, MAX)
+    assert interval.next_interval(LUX_STATUS_NO_REQUEST, False) == MAX
+    assert interval.next_interval(LUX_STATUS_DEFROST, True) == MIN
+    # The compressor start keeps polling fast.
+    assert interval.next_interval(LUX_STATUS_HEATING, True) == MIN
+
+    interval = LuxtronikPollInterval(MIN, MAX)
+    assert interval.next_interval(LUX_STATUS_HEATING, True) == timedelta(seconds=10)
+    interval.fast_poll()
+    assert interval.next_interval(LUX_STATUS_NO_REQUEST, False) == MIN
+
+
+def test_poll_interval_bounds():
+    """Test the default interval is kept within the configured bounds."""
+    interval = LuxtronikPollInterval(timedelta(seconds=20), timedelta(seconds=15))
+    assert interval.max_interval == interval.default_interval == timedelta(seconds=20)
+
+
+async def _async_poll(
+    scheduler: LuxtronikPollScheduler, started: list[float], done: asyncio.Event
+) -> None:
+    async with scheduler.async_poll_slot():
+        started.append(asyncio.get_running_loop().time())
+        await done.wait()
+
+
+async def test_max_concurrent_polls():
+    """Test at most MAX_CONCURRENT_POLLS heatpumps are polled at the same time."""
+    scheduler = LuxtronikPollScheduler(stagger=timedelta(0))
+    for _ in range(MAX_CONCURRENT_POLLS + 1):
+        scheduler.register()
+    started: list[float] = []
+    done = asyncio.Event()
+    polls = [
+        asyncio.create_task(_async_poll(scheduler, started, done))
+        for _ in range(MAX_CONCURRENT_POLLS + 1)
+    ]
+    await asyncio.sleep(0.05)
+    assert len(started) == MAX_CONCURRENT_POLLS
+    done.set()
+    await asyncio.gather(*polls)
+    assert len(started) == MAX_CONCURRENT_POLLS + 1
+
+
+async def test_poll_stagger():
+    """Test polls due together start a stagger apart, a single heatpump never waits."""
+    scheduler = LuxtronikPollScheduler()
+    scheduler.register()
+    started: list[float] = []
+    done = asyncio.Event()
+    done.set()
+    await asyncio.gather(*(_async_poll(scheduler, started, done) for _ in range(2)))
+    assert started[1] - started[0] < POLL_STAGGER.total_seconds() / 2
+
+    scheduler.register()
+    started.clear()
+    await asyncio.gather(*(_async_poll(scheduler, started, done) for _ in range(2)))
+    assert started[1] - started[0] >= POLL_STAGGER.total_seconds() * 0.9
+    assert scheduler.unregister() == 1
@@ -0,0 +1,64 @@
+"""Test the thermal power and COP computation."""
+from datetime import timedelta
+import math
+
+from custom_components.luxtronik.const import (
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    HISTORY_KEYS,
+    THERMAL_WINDOWS,
+)
+from custom_components.luxtronik.history import LuxtronikHistory, history_size
+from custom_components.luxtronik.thermal import ELECTRICAL_POWER, LuxtronikThermalEngine
+
+WINDOWS = {"short": timedelta(seconds=15), "long": timedelta(seconds=60)}
+
+
+def _snapshot(tvl, trl, flow, flow_source, twe, twa, heat_output=None):
+    return [tvl, trl, flow, flow_source, twe, twa, heat_output, 1]
+
+
+def test_energy_balance():
+    """Test the COP from the heat source power and the Heat_Output fallback."""
+    history = LuxtronikHistory(HISTORY_KEYS)
+    # 3600 l/h with a spread of 5 K is 20930 W, the heat source gives 15697.5 W.
+    history.record(0.0, _snapshot(35.0, 30.0, 3600.0, 3600.0, 10.0, 6.25))
+    # No heat meter, Heat_Output is used.
+    history.record(30.0, _snapshot(35.0, 30.0, None, None, None, None, 6000.0))
+
+    summary = LuxtronikThermalEngine(history).compute(WINDOWS, now=60.0)
+    assert math.isclose(summary["long"].thermal_power, (20930.0 + 6000.0) / 2)
+    assert math.isclose(summary["long"].source_power, 15697.5)
+    assert math.isclose(summary["long"].electrical_power, 20930.0 - 15697.5)
+    assert math.isclose(summary["long"].cop, 13465.0 / 5232.5)
+    assert summary["short"].thermal_power == 6000.0
+    assert summary["short"].cop is None
+
+
+def test_electrical_meter():
+    """Test the COP from an external meter sampled at other times."""
+    history = LuxtronikHistory(HISTORY_KEYS)
+    history.record(0.0, _snapshot(35.0, 30.0, 3600.0, None, None, None))
+    meter = LuxtronikHistory([ELECTRICAL_POWER])
+    meter.record(10.0, [5000.0])
+    meter.record(40.0, [50.0])
+
+    summary = LuxtronikThermalEngine(history, meter).compute(WINDOWS, now=60.0)
+    assert math.isclose(summary["long"].electrical_power, (5000.0 * 30 + 50.0 * 20) / 50)
+    assert math.isclose(summary["long"].cop, 20930.0 / summary["long"].electrical_power)
+    # Below the min electrical power there is no COP.
+    assert summary["short"].cop is None
+    assert LuxtronikThermalEngine(LuxtronikHistory(HISTORY_KEYS)).compute(WINDOWS).get("long").cop is None
+
+
+def test_longest_window_at_fast_poll():
+    """Test the history covers the longest window when polling at the min interval."""
+    history = LuxtronikHistory(HISTORY_KEYS)
+    hour = THERMAL_WINDOWS["1h"].total_seconds()
+    for second in range(0, int(hour) + 1, DEFAULT_MIN_UPDATE_INTERVAL):
+        # 1 K for the first half hour, 3 K for the second half.
+        spread = 1.0 if second < hour / 2 else 3.0
+        history.record(float(second), _snapshot(30.0 + spread, 30.0, 3600.0, None, None, None))
+
+    summary = LuxtronikThermalEngine(history).compute(THERMAL_WINDOWS, now=hour)
+    assert math.isclose(summary["1h"].thermal_power, 4186.0 * 2, rel_tol=1e-3)
+    assert history_size(timedelta(seconds=1)) == 3601
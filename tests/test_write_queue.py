@@ -0,0 +1,105 @@
+"""Test the debounced write queue."""
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock
+
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.luxtronik.const import WRITE_CONFIRM_DELAY, WRITE_DEBOUNCE_DELAY
+from custom_components.luxtronik.write_queue import LuxtronikWriteQueue
+
+SECOND = timedelta(seconds=1)
+
+
+@pytest.fixture
+def device():
+    """Return a device which records its batch writes."""
+    device = Mock()
+    device.async_write_batch = AsyncMock()
+    return device
+
+
+async def _async_time_changed(hass, when) -> None:
+    async_fire_time_changed(hass, when)
+    await hass.async_block_till_done()
+
+
+async def test_debounce_per_parameter(hass, device, freezer):
+    """Test every parameter is written once its own debounce elapsed."""
+    queue = LuxtronikWriteQueue(hass, device, AsyncMock(), Mock())
+    queue.async_queue("ID_Einst_WK_akt", 2.0)
+    freezer.tick(2 * SECOND)
+    queue.async_queue("ID_Einst_BWS_akt", 50.0)
+    queue.async_queue("ID_Einst_BWS_akt", 51.0)
+    device.async_write_batch.assert_not_awaited()
+
+    freezer.tick(WRITE_DEBOUNCE_DELAY - SECOND)
+    await _async_time_changed(hass, dt_util.utcnow())
+    # The parameter changed later waits for its own debounce.
+    device.async_write_batch.assert_awaited_once_with({"ID_Einst_WK_akt": 2.0})
+
+    freezer.tick(2 * SECOND)
+    await _async_time_changed(hass, dt_util.utcnow())
+    device.async_write_batch.assert_awaited_with({"ID_Einst_BWS_akt": 51.0})
+    assert device.async_write_batch.await_count == 2
+
+
+async def test_write_supersedes_queued(hass, device):
+    """Test a direct write replaces the queued write of its parameter only."""
+    queue = LuxtronikWriteQueue(hass, device, AsyncMock(), Mock())
+    queue.async_queue("ID_Einst_WK_akt", 2.0)
+    queue.async_queue("ID_Einst_BWS_akt", 48.0)
+    await queue.async_write({"ID_Einst_BWS_akt": 50.0})
+    device.async_write_batch.assert_awaited_once_with({"ID_Einst_BWS_akt": 50.0})
+
+    await _async_time_changed(hass, dt_util.utcnow() + WRITE_DEBOUNCE_DELAY + SECOND)
+    device.async_write_batch.assert_awaited_with({"ID_Einst_WK_akt": 2.0})
+    assert device.async_write_batch.await_count == 2
+
+
+async def test_confirm_read(hass, device):
+    """Test the values are read back once, a while after the last one was written."""
+    read_back = AsyncMock()
+    queue = LuxtronikWriteQueue(hass, device, read_back, Mock())
+    start = dt_util.utcnow()
+    queue.async_queue("ID_Einst_WK_akt", 2.0, update_immediately_after_write=True)
+    queue.async_queue("ID_Einst_BWS_akt", 50.0, update_immediately_after_write=True)
+
+    await _async_time_changed(hass, start + WRITE_DEBOUNCE_DELAY + SECOND)
+    assert device.async_write_batch.await_count == 2
+    read_back.assert_not_awaited()
+
+    await _async_time_changed(hass, start + WRITE_DEBOUNCE_DELAY + WRITE_CONFIRM_DELAY + 2 * SECOND)
+    read_back.assert_awaited_once()
+
+
+async def test_failed_write(hass, device):
+    """Test a failed debounced write rolls back the shown value and doesn't read back."""
+    device.async_write_batch.side_effect = OSError
+    device.discard_optimistic.return_value = {("parameters", 1)}
+    read_back = AsyncMock()
+    notify = Mock()
+    queue = LuxtronikWriteQueue(hass, device, read_back, notify)
+    start = dt_util.utcnow()
+    queue.async_queue("ID_Einst_WK_akt", 2.0, update_immediately_after_write=True)
+
+    await _async_time_changed(hass, start + WRITE_DEBOUNCE_DELAY + SECOND)
+    device.async_write_batch.assert_awaited_once()
+    # The listeners show the read value again.
+    device.discard_optimistic.assert_called_once_with({"ID_Einst_WK_akt": 2.0})
+    notify.assert_called_once_with({("parameters", 1)})
+    await _async_time_changed(hass, start + WRITE_DEBOUNCE_DELAY + WRITE_CONFIRM_DELAY + 2 * SECOND)
+    read_back.assert_not_awaited()
+
+
+async def test_shutdown(hass, device):
+    """Test pending writes and read backs are dropped on shutdown."""
+    read_back = AsyncMock()
+    queue = LuxtronikWriteQueue(hass, device, read_back, Mock())
+    queue.async_queue("ID_Einst_WK_akt", 2.0, update_immediately_after_write=True)
+    queue.async_shutdown()
+
+    await _async_time_changed(hass, dt_util.utcnow() + WRITE_DEBOUNCE_DELAY + WRITE_CONFIRM_DELAY)
+    device.async_write_batch.assert_not_awaited()
+    read_back.assert_not_awaited()